@@ -2,6 +2,17 @@
 
 set -e
 
+# multi-process Prometheus metrics must start from an empty directory
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+# any other command (e.g. the Celery worker) runs after the same setup
+if [ "$#" -gt 0 ]; then
+    exec "$@"
+fi
+
 python manage.py migrate
 
 python manage.py collectstatic --noinput
@@ -3,6 +3,7 @@ import os
 import pytest
 import pytest_asyncio
 import stamina
+from django.core.cache import caches
 from django_celery_beat.models import IntervalSchedule, PeriodicTask
 from ninja.testing import TestAsyncClient
 
@@ -10,6 +11,7 @@ from weather_alert.api.app import api
 from weather_alert.apps.alerts.models import Alert, AlertConfig
 from weather_alert.apps.location.models import Location
 from weather_alert.apps.temperature.models import TemperatureLog
+from weather_alert.integrations.circuit_breaker import reset_circuit_breakers
 
 
 def pytest_generate_tests(metafunc):
@@ -21,6 +23,17 @@ def deactivate_retries():
     stamina.set_active(False)
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for alias in ('default', 'local'):
+        caches[alias].clear()
+
+
+@pytest.fixture(autouse=True)
+def close_circuits():
+    reset_circuit_breakers()
+
+
 @pytest.fixture
 def api_client():
     api.urls_namespace = 'test'
@@ -81,8 +94,8 @@ async def create_schedule():
 async def create_periodic_task(create_alert_config, create_schedule):
     task = await PeriodicTask.objects.acreate(
         interval=create_schedule,
-        name=f'Check Temperature for Config {create_alert_config.id}',
-        task='weather_alert.apps.alerts.tasks.check_temperature',
-        args='[1]',
+        name=f'Check Temperature for Location {create_alert_config.location_id}',
+        task='weather_alert.apps.alerts.tasks.check_location_temperature',
+        args=f'[{create_alert_config.location_id}]',
     )
     return task
@@ -1,12 +1,18 @@
 import json
+from datetime import timedelta
 
 import pytest
 import respx
 from django.conf import settings
+from django.utils import timezone
 from httpx import Response
 
+from weather_alert.apps.alerts.models import AlertConfig, NotificationOutbox
 from weather_alert.apps.alerts.services.alert_service import (
+    advance_alert_state,
     create_alert_and_notify,
+    dispatch_pending_notifications,
+    partition_alert_configs,
 )
 
 
@@ -32,15 +38,14 @@ def test_create_alert_and_notify_fake_webhook(
 
 @pytest.mark.django_db
 @respx.mock
-def test_create_alert_and_notify_success(
+def test_create_alert_and_notify_writes_outbox(
     monkeypatch, create_location, create_alert_config
 ):
     # Desativa o FAKE_WEBHOOK
     monkeypatch.setenv('FAKE_WEBHOOK', 'false')
     settings.FAKE_WEBHOOK = False
 
-    url = settings.N8N_WEBHOOK_URL
-    respx.post(url).mock(return_value=Response(200))
+    route = respx.post(settings.N8N_WEBHOOK_URL)
 
     alert = create_alert_and_notify(
         location=create_location,
@@ -52,7 +57,34 @@ def test_create_alert_and_notify_success(
     assert alert.temperature == 35.0
     assert alert.threshold == create_alert_config.temperature_threshold
     assert alert.notified is False
+    assert not route.called
+
+    outbox = NotificationOutbox.objects.get(alert=alert)
+    assert outbox.status == NotificationOutbox.Status.PENDING
+    assert outbox.payload['alert_id'] == alert.id
+    assert outbox.payload['location'] == create_location.name
+    assert outbox.payload['temperature'] == 35.0
 
+
+@pytest.mark.django_db
+@respx.mock
+def test_dispatch_pending_notifications_success(
+    monkeypatch, create_location, create_alert_config
+):
+    monkeypatch.setenv('FAKE_WEBHOOK', 'false')
+    settings.FAKE_WEBHOOK = False
+
+    url = settings.N8N_WEBHOOK_URL
+    respx.post(url).mock(return_value=Response(200))
+
+    alert = create_alert_and_notify(
+        location=create_location,
+        temperature=35.0,
+        alert_config=create_alert_config,
+    )
+    result = dispatch_pending_notifications()
+
+    assert result == {'sent': 1, 'retried': 0, 'failed': 0}
     assert respx.calls.call_count == 1
     request = respx.calls[0].request
     assert (
@@ -62,10 +94,16 @@ def test_create_alert_and_notify_success(
     assert request_body['location'] == create_location.name
     assert request_body['temperature'] == 35.0
 
+    alert.refresh_from_db()
+    assert alert.notified is True
+    outbox = NotificationOutbox.objects.get(alert=alert)
+    assert outbox.status == NotificationOutbox.Status.SENT
+    assert outbox.attempts == 1
+
 
 @pytest.mark.django_db
 @respx.mock
-def test_create_alert_and_notify_failure(
+def test_dispatch_pending_notifications_failure(
     monkeypatch, create_location, create_alert_config
 ):
     monkeypatch.setenv('FAKE_WEBHOOK', 'false')
@@ -81,9 +119,108 @@ def test_create_alert_and_notify_failure(
         temperature=35.0,
         alert_config=create_alert_config,
     )
+    result = dispatch_pending_notifications()
 
-    assert alert.location == create_location
-    assert alert.temperature == 35.0
-    assert alert.threshold == create_alert_config.temperature_threshold
-    assert alert.notified is False
+    assert result == {'sent': 0, 'retried': 1, 'failed': 0}
     assert respx.calls.call_count == 1
+
+    alert.refresh_from_db()
+    assert alert.notified is False
+    outbox = NotificationOutbox.objects.get(alert=alert)
+    assert outbox.status == NotificationOutbox.Status.PENDING
+    assert outbox.attempts == 1
+    assert outbox.next_attempt_at > timezone.now()
+    assert '500' in outbox.last_error
+
+    # a entrada reagendada não é reenviada antes do backoff
+    assert dispatch_pending_notifications() == {
+        'sent': 0,
+        'retried': 0,
+        'failed': 0,
+    }
+
+
+@pytest.mark.django_db
+@respx.mock
+def test_dispatch_pending_notifications_gives_up(
+    monkeypatch, create_location, create_alert_config
+):
+    monkeypatch.setenv('FAKE_WEBHOOK', 'false')
+    settings.FAKE_WEBHOOK = False
+
+    respx.post(settings.N8N_WEBHOOK_URL).mock(return_value=Response(503))
+
+    alert = create_alert_and_notify(
+        location=create_location,
+        temperature=35.0,
+        alert_config=create_alert_config,
+    )
+    NotificationOutbox.objects.filter(alert=alert).update(
+        attempts=settings.N8N_OUTBOX_MAX_ATTEMPTS - 1
+    )
+
+    result = dispatch_pending_notifications()
+
+    assert result == {'sent': 0, 'retried': 0, 'failed': 1}
+    outbox = NotificationOutbox.objects.get(alert=alert)
+    assert outbox.status == NotificationOutbox.Status.FAILED
+
+
+@pytest.mark.django_db
+def test_advance_alert_state_with_hysteresis(settings, create_alert_config):
+    settings.ALERT_HYSTERESIS = 2.0
+    settings.ALERT_RENOTIFY_MINUTES = 0
+    threshold = create_alert_config.temperature_threshold
+
+    assert advance_alert_state(create_alert_config, threshold + 1) == 'fired'
+    assert advance_alert_state(create_alert_config, threshold + 3) is None
+    # abaixo do limite, mas dentro da histerese: continua em alerta
+    assert advance_alert_state(create_alert_config, threshold - 1) is None
+    assert advance_alert_state(create_alert_config, threshold + 1) is None
+    assert advance_alert_state(create_alert_config, threshold - 2) == (
+        'resolved'
+    )
+    assert advance_alert_state(create_alert_config, threshold + 1) == 'fired'
+
+    create_alert_config.refresh_from_db()
+    assert create_alert_config.state == AlertConfig.State.FIRING
+
+
+@pytest.mark.django_db
+def test_advance_alert_state_renotify(settings, create_alert_config):
+    settings.ALERT_RENOTIFY_MINUTES = 30
+    hot = create_alert_config.temperature_threshold + 1
+    now = timezone.now()
+
+    assert advance_alert_state(create_alert_config, hot, now) == 'fired'
+    assert (
+        advance_alert_state(
+            create_alert_config, hot, now + timedelta(minutes=10)
+        )
+        is None
+    )
+    assert (
+        advance_alert_state(
+            create_alert_config, hot, now + timedelta(minutes=30)
+        )
+        == 'renotify'
+    )
+    assert (
+        advance_alert_state(
+            create_alert_config, hot, now + timedelta(minutes=40)
+        )
+        is None
+    )
+
+
+def test_partition_alert_configs(settings):
+    settings.ALERT_HYSTERESIS = 1.0
+    configs = [
+        AlertConfig(temperature_threshold=t)
+        for t in (20.0, 25.0, 30.0, 30.5, 31.0, 35.0)
+    ]
+
+    exceeded, cleared = partition_alert_configs(configs, 30.0)
+
+    assert [c.temperature_threshold for c in exceeded] == [20.0, 25.0]
+    assert [c.temperature_threshold for c in cleared] == [31.0, 35.0]
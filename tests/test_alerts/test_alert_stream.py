@@ -0,0 +1,101 @@
+import json
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.test import RequestFactory
+
+from weather_alert.apps.alerts.services.alert_service import (
+    create_alert_and_notify,
+)
+from weather_alert.apps.alerts.services.alert_stream import (
+    event_stream,
+    publish_alert,
+    subscribe,
+)
+from weather_alert.apps.alerts.views import stream_alerts
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_publish_alert_reaches_subscriber(create_alert):
+    stream = subscribe(heartbeat=1)
+    assert await anext(stream) is None
+
+    # published from another thread, as by a sync task
+    await sync_to_async(publish_alert)(create_alert)
+
+    message = json.loads(await anext(stream))
+    assert message['id'] == create_alert.id
+    assert message['location_name'] == create_alert.location.name
+    assert message['temperature'] == 35.0
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_subscribe_heartbeat():
+    stream = subscribe(heartbeat=0.01)
+    assert await anext(stream) is None
+    assert await anext(stream) is None
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_event_stream_replays_missed_alerts(settings, create_alert):
+    settings.ALERT_STREAM_HEARTBEAT_SECONDS = 0.05
+
+    events = event_stream(last_event_id=create_alert.id - 1)
+    assert await anext(events) == ': connected\n\n'
+
+    replayed = await anext(events)
+    assert replayed.startswith(f'id: {create_alert.id}\nevent: alert\n')
+
+    # an alert already replayed is not sent again
+    await sync_to_async(publish_alert)(create_alert)
+    assert await anext(events) == ': keep-alive\n\n'
+    await events.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_stream_alerts_view(create_alert):
+    request = RequestFactory().get(
+        '/api/alerts/stream/',
+        headers={'Last-Event-ID': str(create_alert.id - 1)},
+    )
+
+    response = await stream_alerts(request)
+    assert response['Content-Type'] == 'text/event-stream'
+    assert response['Cache-Control'] == 'no-cache'
+
+    events = aiter(response.streaming_content)
+    assert await anext(events) == b': connected\n\n'
+    assert (await anext(events)).startswith(
+        f'id: {create_alert.id}\n'.encode()
+    )
+    await events.aclose()
+
+
+@pytest.mark.django_db
+def test_create_alert_and_notify_publishes_after_commit(
+    mocker,
+    django_capture_on_commit_callbacks,
+    create_location,
+    create_alert_config,
+):
+    mock_publish = mocker.patch(
+        'weather_alert.apps.alerts.services.alert_service.publish_alert'
+    )
+    mocker.patch(
+        'weather_alert.apps.alerts.services.alert_service._trigger_dispatch'
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        alert = create_alert_and_notify(
+            location=create_location,
+            temperature=35.0,
+            alert_config=create_alert_config,
+        )
+        assert not mock_publish.called
+
+    mock_publish.assert_called_once_with(alert)
@@ -1,14 +1,24 @@
 import json
+from datetime import timedelta
 
 import pytest
+from django.utils import timezone
 from django_celery_beat.models import IntervalSchedule, PeriodicTask
 
 from weather_alert.apps.alerts.models import AlertConfig
 from weather_alert.apps.alerts.services.alert_config_service import (
     AlertConfigService,
+    location_task_name,
+    reconcile_schedules,
 )
 
 
+async def _location_task(location_id):
+    return await PeriodicTask.objects.select_related('interval').aget(
+        name=location_task_name(location_id)
+    )
+
+
 @pytest.mark.asyncio
 @pytest.mark.django_db
 async def test_create_alert_config_and_schedule_task(create_location):
@@ -24,27 +34,33 @@ async def test_create_alert_config_and_schedule_task(create_location):
     assert alert_config.temperature_threshold == 30.5
     assert alert_config.check_interval_minutes == 20
 
-    periodic_task = await PeriodicTask.objects.aget(
-        name=f'Check Temperature for Config {alert_config.id}'
+    periodic_task = await _location_task(create_location.id)
+    assert (
+        periodic_task.task
+        == 'weather_alert.apps.alerts.tasks.check_location_temperature'
+    )
+    assert periodic_task.interval.every == 20
+    assert json.loads(periodic_task.args) == [create_location.id]
+
+    # a second config with a shorter interval reschedules the location
+    await AlertConfigService.create_alert_config_and_schedule_task(
+        location=create_location,
+        temperature_threshold=35.0,
+        check_interval_minutes=5,
+    )
+    periodic_task = await _location_task(create_location.id)
+    assert periodic_task.interval.every == 5
+    assert (
+        await PeriodicTask.objects.filter(
+            name__startswith='Check Temperature for'
+        ).acount()
+        == 1
     )
-    assert periodic_task is not None
-    assert json.loads(periodic_task.args) == [alert_config.id]
 
 
 @pytest.mark.asyncio
 @pytest.mark.django_db
 async def test_update_alert_config_and_schedule_task(create_alert_config):
-    schedule, _ = await IntervalSchedule.objects.aget_or_create(
-        every=create_alert_config.check_interval_minutes,
-        period=IntervalSchedule.MINUTES,
-    )
-    await PeriodicTask.objects.acreate(
-        interval=schedule,
-        name=f'Check Temperature for Config {create_alert_config.id}',
-        task='weather_alert.apps.alerts.tasks.check_temperature',
-        args=json.dumps([create_alert_config.id]),
-    )
-
     updated_config = (
         await AlertConfigService.update_alert_config_and_schedule_task(
             alert_config=create_alert_config,
@@ -56,34 +72,203 @@ async def test_update_alert_config_and_schedule_task(create_alert_config):
     assert updated_config.temperature_threshold == 29.0
     assert updated_config.check_interval_minutes == 10
 
-    periodic_task = await PeriodicTask.objects.select_related('interval').aget(
-        name=f'Check Temperature for Config {updated_config.id}'
-    )
+    periodic_task = await _location_task(updated_config.location_id)
     assert periodic_task.interval.every == 10
-    assert json.loads(periodic_task.args) == [updated_config.id]
+    assert json.loads(periodic_task.args) == [updated_config.location_id]
 
 
 @pytest.mark.asyncio
 @pytest.mark.django_db
-async def test_delete_alert_config_and_schedule_task(create_alert_config):
-    schedule, _ = await IntervalSchedule.objects.aget_or_create(
-        every=create_alert_config.check_interval_minutes,
-        period=IntervalSchedule.MINUTES,
+async def test_delete_alert_config_and_schedule_task(create_location):
+    kept = await AlertConfigService.create_alert_config_and_schedule_task(
+        location=create_location,
+        temperature_threshold=30.0,
+        check_interval_minutes=30,
     )
-    periodic_task = await PeriodicTask.objects.acreate(
-        interval=schedule,
-        name=f'Check Temperature for Config {create_alert_config.id}',
-        task='weather_alert.apps.alerts.tasks.check_temperature',
-        args=json.dumps([create_alert_config.id]),
+    create_alert_config = (
+        await AlertConfigService.create_alert_config_and_schedule_task(
+            location=create_location,
+            temperature_threshold=35.0,
+            check_interval_minutes=10,
+        )
     )
+    periodic_task = await _location_task(create_location.id)
 
     await AlertConfigService.delete_alert_config_and_schedule_task(
         create_alert_config
     )
 
+    assert not await AlertConfig.objects.filter(
+        id=create_alert_config.id
+    ).aexists()
+    assert (await _location_task(create_location.id)).interval.every == 30
+
+    # the last config of the location takes its task along
+    await AlertConfigService.delete_alert_config_and_schedule_task(kept)
     with pytest.raises(PeriodicTask.DoesNotExist):
         await PeriodicTask.objects.aget(id=periodic_task.id)
 
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_create_alert_config_sweep_mode(settings, create_location):
+    settings.ALERT_SCHEDULER_MODE = 'sweep'
+    before = timezone.now()
+
+    alert_config = (
+        await AlertConfigService.create_alert_config_and_schedule_task(
+            location=create_location,
+            temperature_threshold=30.5,
+            check_interval_minutes=20,
+        )
+    )
+
+    assert alert_config.next_check_at >= before
+    assert not await PeriodicTask.objects.filter(
+        name=location_task_name(create_location.id)
+    ).aexists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_update_alert_config_sweep_mode(settings, create_alert_config):
+    settings.ALERT_SCHEDULER_MODE = 'sweep'
+    before = timezone.now()
+
+    updated_config = (
+        await AlertConfigService.update_alert_config_and_schedule_task(
+            alert_config=create_alert_config,
+            check_interval_minutes=10,
+        )
+    )
+
+    await updated_config.arefresh_from_db()
+    assert updated_config.check_interval_minutes == 10
+    assert updated_config.next_check_at >= before + timedelta(minutes=10)
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_delete_alert_config_sweep_mode(settings, create_alert_config):
+    settings.ALERT_SCHEDULER_MODE = 'sweep'
+
+    await AlertConfigService.delete_alert_config_and_schedule_task(
+        create_alert_config
+    )
+
     assert not await AlertConfig.objects.filter(
         id=create_alert_config.id
     ).aexists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_bulk_create_alert_configs_and_schedule_tasks(create_location):
+    items = [
+        {
+            'location': create_location.id,
+            'temperature_threshold': 30.0,
+            'check_interval_minutes': 15,
+        },
+        {
+            'location': 99999,
+            'temperature_threshold': 31.0,
+            'check_interval_minutes': 15,
+        },
+        {
+            'location': create_location.id,
+            'temperature_threshold': 32.0,
+            'check_interval_minutes': 0,
+        },
+        {
+            'location': create_location.id,
+            'temperature_threshold': 33.0,
+            'check_interval_minutes': 15,
+        },
+    ]
+
+    (
+        alert_configs,
+        errors,
+    ) = await AlertConfigService.bulk_create_alert_configs_and_schedule_tasks(
+        items
+    )
+
+    assert [c.temperature_threshold for c in alert_configs] == [30.0, 33.0]
+    assert [e['index'] for e in errors] == [1, 2]
+
+    periodic_task = await _location_task(create_location.id)
+    assert periodic_task.interval.every == 15
+    assert json.loads(periodic_task.args) == [create_location.id]
+
+    assert (
+        await IntervalSchedule.objects.filter(
+            every=15, period=IntervalSchedule.MINUTES
+        ).acount()
+        == 1
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_bulk_create_alert_configs_sweep_mode(settings, create_location):
+    settings.ALERT_SCHEDULER_MODE = 'sweep'
+
+    (
+        alert_configs,
+        errors,
+    ) = await AlertConfigService.bulk_create_alert_configs_and_schedule_tasks(
+        [
+            {
+                'location': create_location.id,
+                'temperature_threshold': 30.0,
+                'check_interval_minutes': 15,
+            }
+        ]
+    )
+
+    assert errors == []
+    assert alert_configs[0].next_check_at is not None
+    assert not await PeriodicTask.objects.filter(
+        name=location_task_name(create_location.id)
+    ).aexists()
+
+
+@pytest.mark.django_db
+def test_reconcile_schedules_sweep_mode_removes_location_tasks(
+    settings, create_alert_config
+):
+    reconcile_schedules()
+    assert PeriodicTask.objects.filter(
+        name=location_task_name(create_alert_config.location_id)
+    ).exists()
+
+    settings.ALERT_SCHEDULER_MODE = 'sweep'
+
+    assert reconcile_schedules() == 0
+    assert not PeriodicTask.objects.filter(
+        task='weather_alert.apps.alerts.tasks.check_location_temperature'
+    ).exists()
+
+
+@pytest.mark.django_db
+def test_reconcile_schedules_periodic_mode_recreates_location_tasks(
+    settings, create_location
+):
+    settings.ALERT_SCHEDULER_MODE = 'sweep'
+    AlertConfig.objects.create(
+        location=create_location,
+        temperature_threshold=30.0,
+        check_interval_minutes=20,
+    )
+    assert not PeriodicTask.objects.filter(
+        name=location_task_name(create_location.id)
+    ).exists()
+
+    settings.ALERT_SCHEDULER_MODE = 'periodic_task'
+
+    assert reconcile_schedules() >= 1
+    periodic_task = PeriodicTask.objects.get(
+        name=location_task_name(create_location.id)
+    )
+    assert periodic_task.interval.every == 20
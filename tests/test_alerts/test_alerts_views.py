@@ -1,8 +1,10 @@
 import pytest
 from django.conf import settings
+from django.test import Client
 from ninja.testing import TestAsyncClient
 
 from weather_alert.apps.alerts.models import Alert, AlertConfig
+from weather_alert.apps.location.models import Location
 
 
 @pytest.mark.asyncio
@@ -50,6 +52,90 @@ async def test_create_alert_config_location_not_found(
     assert response.json()['message'] == 'Localidade não encontrada'
 
 
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_bulk_create_alert_configs(
+    api_client: TestAsyncClient, create_location
+):
+    payload = [
+        {
+            'location': create_location.id,
+            'temperature_threshold': 30.5,
+            'check_interval_minutes': 15,
+        },
+        {
+            'location': 99999,
+            'temperature_threshold': 30.5,
+            'check_interval_minutes': 15,
+        },
+    ]
+
+    response = await api_client.post('/alert-configs/bulk/', json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data['created']) == 1
+    assert data['created'][0]['location'] == create_location.id
+    assert data['errors'] == [
+        {'index': 1, 'message': 'Localidade não encontrada'}
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_bulk_create_alert_configs_invalid_item(
+    api_client: TestAsyncClient, create_location
+):
+    payload = [
+        {
+            'location': create_location.id,
+            'temperature_threshold': 'quente',
+            'check_interval_minutes': 15,
+        },
+        {
+            'location': 'Recife',
+            'temperature_threshold': 30.5,
+            'check_interval_minutes': 15,
+        },
+        {
+            'location': 99999,
+            'temperature_threshold': 30.5,
+            'check_interval_minutes': 15,
+        },
+        {
+            'location': create_location.id,
+            'temperature_threshold': 30.5,
+            'check_interval_minutes': 15,
+        },
+    ]
+
+    response = await api_client.post('/alert-configs/bulk/', json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data['created']) == 1
+    assert [error['index'] for error in data['errors']] == [0, 1, 2]
+    assert data['errors'][0]['message'].startswith('temperature_threshold:')
+    assert data['errors'][1]['message'].startswith('location:')
+    assert data['errors'][2]['message'] == 'Localidade não encontrada'
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_bulk_create_alert_configs_too_large(
+    api_client: TestAsyncClient, settings, create_location
+):
+    settings.API_BULK_MAX_ITEMS = 1
+    payload = [
+        {
+            'location': create_location.id,
+            'temperature_threshold': 30.5,
+            'check_interval_minutes': 15,
+        }
+    ] * 2
+
+    response = await api_client.post('/alert-configs/bulk/', json=payload)
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 @pytest.mark.django_db
 async def test_list_alert_configs(
@@ -65,6 +151,36 @@ async def test_list_alert_configs(
     )
 
 
+@pytest.mark.django_db
+def test_list_alert_configs_expanded(
+    django_assert_num_queries, create_location
+):
+    other = Location.objects.create(
+        name='Olinda', latitude=-8.01, longitude=-34.85
+    )
+    AlertConfig.objects.bulk_create(
+        [
+            AlertConfig(location=location, temperature_threshold=30.0)
+            for location in (create_location, other, other)
+        ]
+    )
+
+    with django_assert_num_queries(1):
+        response = Client().get('/api/alert-configs/expanded/')
+
+    assert response.status_code == 200
+    data = [
+        config
+        for config in response.json()
+        if config['location_id'] in (create_location.id, other.id)
+    ]
+    assert len(data) == 3
+    assert data[0]['location_name'] == 'Recife Antigo'
+    assert data[0]['latitude'] == create_location.latitude
+    assert data[0]['longitude'] == create_location.longitude
+    assert {config['location_name'] for config in data[1:]} == {'Olinda'}
+
+
 @pytest.mark.asyncio
 @pytest.mark.django_db
 async def test_get_alert_config(
@@ -150,6 +266,30 @@ async def test_list_alerts_filtered(api_client: TestAsyncClient, create_alert):
     assert any(alert['id'] == create_alert.id for alert in data)
 
 
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_list_alerts_cursor_pagination(
+    api_client: TestAsyncClient, create_location
+):
+    created = [
+        await Alert.objects.acreate(
+            location=create_location, temperature=35.0 + i, threshold=30.5
+        )
+        for i in range(3)
+    ]
+
+    url = f'/alerts/?location_id={create_location.id}&limit=2'
+    first = await api_client.get(url)
+    cursor = first['X-Next-Cursor']
+    second = await api_client.get(f'{url}&cursor={cursor}')
+
+    assert [a['id'] for a in first.json()] == [created[2].id, created[1].id]
+    assert first['Link'].endswith(f'&cursor={cursor}>; rel="next"')
+    assert [a['id'] for a in second.json()] == [created[0].id]
+    assert not second.has_header('X-Next-Cursor')
+    assert not second.has_header('Link')
+
+
 @pytest.mark.asyncio
 @pytest.mark.django_db
 async def test_get_alert(api_client: TestAsyncClient, create_alert):
@@ -0,0 +1,145 @@
+import pytest
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.test import AsyncClient
+
+from weather_alert.api.etags import ALERTS, LOCATIONS, get_versions
+from weather_alert.apps.alerts.models import Alert
+from weather_alert.apps.location.models import Location
+
+
+aget_versions = sync_to_async(lambda: get_versions((LOCATIONS, ALERTS)))
+
+
+@pytest.fixture(autouse=True)
+def etags_enabled(settings):
+    settings.API_ETAGS_ENABLED = True
+
+
+@pytest.fixture
+def client():
+    return AsyncClient()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_list_locations_not_modified(client, create_location):
+    response = await client.get('/api/locations/')
+    etag = response['ETag']
+
+    assert response.status_code == 200
+    assert response['Cache-Control'] == 'no-cache'
+
+    response = await client.get(
+        '/api/locations/', headers={'If-None-Match': etag}
+    )
+
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+    assert response.content == b''
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_write_invalidates_etag(client, create_location):
+    etag = (await client.get('/api/locations/'))['ETag']
+
+    await client.post(
+        '/api/locations/',
+        {'name': 'Olinda', 'latitude': -8.01, 'longitude': -34.85},
+        content_type='application/json',
+    )
+    response = await client.get(
+        '/api/locations/', headers={'If-None-Match': etag}
+    )
+
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+    assert 'Olinda' in response.content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_etag_depends_on_query_string(client):
+    first = await client.get('/api/alerts/?limit=1')
+    second = await client.get('/api/alerts/?limit=2')
+
+    assert first['ETag'] != second['ETag']
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_location_delete_bumps_alerts(client, create_alert):
+    versions = await aget_versions()
+
+    await client.delete(f'/api/locations/{create_alert.location_id}/')
+
+    new_versions = await aget_versions()
+    assert new_versions[0] != versions[0]
+    assert new_versions[1] != versions[1]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_cached_body_served_without_view(client, settings, mocker):
+    settings.API_ETAG_BODY_CACHE_TTL = 60
+    first = await client.get('/api/locations/')
+    spy = mocker.patch.object(Location.objects, 'all')
+
+    second = await client.get('/api/locations/')
+
+    spy.assert_not_called()
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second['ETag'] == first['ETag']
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_cached_body_keeps_next_page_headers(
+    client, settings, create_alert
+):
+    settings.API_ETAG_BODY_CACHE_TTL = 60
+    await Alert.objects.acreate(
+        location=create_alert.location, temperature=36.0, threshold=30.5
+    )
+    url = f'/api/alerts/?location_id={create_alert.location.id}&limit=1'
+    first = await client.get(url)
+    cursor = first['X-Next-Cursor']
+
+    second = await client.get(url)
+
+    assert first['Link'] == f'<{url}&cursor={cursor}>; rel="next"'
+    assert second.content == first.content
+    assert second['X-Next-Cursor'] == first['X-Next-Cursor']
+    assert second['Link'] == first['Link']
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_etags_disabled(client, settings):
+    settings.API_ETAGS_ENABLED = False
+
+    response = await client.get('/api/locations/')
+
+    assert response.status_code == 200
+    assert 'ETag' not in response
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_cache_failure_serves_view_without_etag(
+    client, settings, mocker
+):
+    settings.API_ETAG_BODY_CACHE_TTL = 60
+    etag = (await client.get('/api/locations/'))['ETag']
+    mocker.patch.object(
+        caches['default'], 'get_many', side_effect=ConnectionError
+    )
+
+    response = await client.get(
+        '/api/locations/', headers={'If-None-Match': etag}
+    )
+
+    assert response.status_code == 200
+    assert 'ETag' not in response
@@ -0,0 +1,72 @@
+import re
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import AsyncClient, Client
+
+from weather_alert.api.profiling import install_query_recorder
+
+MIDDLEWARE = 'weather_alert.api.profiling.profiling_middleware'
+
+
+@pytest.fixture
+def profiling(settings):
+    settings.MIDDLEWARE = [MIDDLEWARE, *settings.MIDDLEWARE]
+    settings.API_PROFILING_SAMPLE_RATE = 1.0
+    settings.API_PROFILING_SLOW_MS = 10_000
+    return settings
+
+
+def parse_server_timing(header):
+    return {
+        name: (float(duration), desc)
+        for name, duration, desc in re.findall(
+            r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?', header
+        )
+    }
+
+
+@pytest.mark.django_db
+def test_server_timing_sync(profiling, create_location):
+    response = Client().get('/api/locations/')
+
+    assert response.status_code == 200
+    timings = parse_server_timing(response['Server-Timing'])
+    assert set(timings) == {'db', 'serialize', 'view', 'total'}
+    assert timings['db'][1] != '0 queries'
+    assert timings['total'][0] >= timings['db'][0]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_server_timing_async(profiling, create_location):
+    # the ORM thread's connection was opened by the fixture, before the
+    # middleware connected its connection_created receiver
+    await sync_to_async(install_query_recorder)(None, connection)
+
+    response = await AsyncClient().get(f'/api/locations/{create_location.id}/')
+
+    assert response.status_code == 200
+    timings = parse_server_timing(response['Server-Timing'])
+    assert timings['db'][1] == '1 queries'
+
+
+@pytest.mark.django_db
+def test_not_sampled(profiling):
+    profiling.API_PROFILING_SAMPLE_RATE = 0.0
+
+    response = Client().get('/api/locations/')
+
+    assert 'Server-Timing' not in response
+
+
+@pytest.mark.django_db
+def test_slow_request_is_logged(profiling, mocker):
+    profiling.API_PROFILING_SLOW_MS = 0
+    warning = mocker.patch('weather_alert.api.profiling.logger.warning')
+
+    Client().get('/api/locations/')
+
+    warning.assert_called_once()
+    assert 'GET /api/locations/' in warning.call_args.args[0]
@@ -0,0 +1,70 @@
+import json
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from django.test import Client
+
+from weather_alert.api.renderers import ORJSONRenderer
+
+
+def render(data):
+    return json.loads(ORJSONRenderer().render(None, data, response_status=200))
+
+
+def test_render_datetimes():
+    data = render(
+        {
+            'utc': datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+            'offset': datetime(
+                2025, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=-3))
+            ),
+        }
+    )
+
+    assert data['utc'] == '2025-01-02T03:04:05.123456Z'
+    assert data['offset'] == '2025-01-02T03:04:05-03:00'
+
+
+def test_render_floats_and_fallback_types():
+    data = render(
+        {
+            'temperature': 30.0,
+            'nan': float('nan'),
+            'inf': float('inf'),
+            'decimal': Decimal('1.10'),
+            1: 'int key',
+        }
+    )
+
+    assert data == {
+        'temperature': 30.0,
+        'nan': None,
+        'inf': None,
+        'decimal': '1.10',
+        '1': 'int key',
+    }
+
+
+@pytest.mark.django_db
+def test_api_uses_orjson(create_temperature_log):
+    response = Client().get('/api/temperature-logs/')
+
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/json; charset=utf-8'
+    item = next(
+        item
+        for item in response.json()
+        if item['id'] == create_temperature_log.id
+    )
+    expected = create_temperature_log.timestamp.isoformat()
+    assert item['timestamp'] == expected.replace('+00:00', 'Z')
+
+
+@pytest.mark.django_db
+def test_invalid_body_is_rejected():
+    response = Client().post(
+        '/api/locations/', data='{"name": ', content_type='application/json'
+    )
+
+    assert response.status_code == 400
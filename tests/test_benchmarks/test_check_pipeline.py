@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from weather_alert.apps.location.models import Location
+from weather_alert.integrations.temperature_cache import get_coalescing_stats
+from weather_alert.benchmarks.check_pipeline import (
+    run_check_pipeline_benchmark,
+    summarize,
+)
+
+SCENARIOS = (
+    'check_location_temperature',
+    'check_temperature_batch',
+    'create_alert_and_notify',
+    'dispatch_notifications',
+)
+
+
+def test_summarize_percentiles():
+    result = summarize([i / 1000 for i in range(1, 101)], 2.0, 100, 50)
+
+    assert result['throughput_per_second'] == 50.0
+    assert result['latency_ms']['p50'] == pytest.approx(50.5)
+    assert result['latency_ms']['p99'] == pytest.approx(99.01)
+    assert result['queries_per_operation'] == 0.5
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_check_pipeline_benchmark():
+    record = run_check_pipeline_benchmark(
+        locations=4, configs_per_location=2, batch_size=3, temperature=50.0
+    )
+
+    assert record['benchmark'] == 'check_pipeline'
+    assert set(SCENARIOS) <= record['results'].keys()
+    assert record['results']['check_location_temperature']['operations'] == 8
+    assert record['results']['check_location_temperature']['calls'] == 4
+    assert record['results']['check_temperature_batch']['calls'] == 3
+    assert record['results']['dispatch_notifications']['operations'] == 24
+    assert record['results']['upstream_requests']['n8n'] == 24
+    assert not Location.objects.filter(name__startswith='Benchmark').exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_check_pipeline_benchmark_leaves_caches_untouched():
+    before = get_coalescing_stats()
+
+    run_check_pipeline_benchmark(locations=3, use_cache=True)
+
+    assert get_coalescing_stats() == before
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_checks_command_appends_results(tmp_path, capsys):
+    output = tmp_path / 'results.jsonl'
+
+    call_command('benchmark_checks', locations=2, output=str(output))
+    call_command('benchmark_checks', locations=2, output=str(output))
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(records) == 2
+    assert 'Comparado com a execução' in capsys.readouterr().out
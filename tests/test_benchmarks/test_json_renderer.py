@@ -0,0 +1,27 @@
+import json
+
+from django.core.management import call_command
+
+from weather_alert.benchmarks.json_renderer import run_json_renderer_benchmark
+
+
+def test_run_json_renderer_benchmark():
+    record = run_json_renderer_benchmark(items=20, repeat=3)
+
+    assert record['benchmark'] == 'json_renderer'
+    assert set(record['results']) == {'list_temperature_logs', 'list_alerts'}
+    for result in record['results'].values():
+        assert result['json']['operations'] == 60
+        assert result['orjson']['calls'] == 3
+        assert result['orjson']['bytes'] > 0
+        assert result['speedup'] > 0
+
+
+def test_benchmark_renderers_command_appends_results(tmp_path, capsys):
+    output = tmp_path / 'results.jsonl'
+
+    call_command('benchmark_renderers', items=10, repeat=2, output=str(output))
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(records) == 1
+    assert 'ganho' in capsys.readouterr().out
@@ -1,18 +1,28 @@
+from datetime import timedelta
+
 import pytest
+import respx
+from django.utils import timezone
+from httpx import HTTPStatusError, Response
 
 from weather_alert.apps.alerts.models import Alert, AlertConfig
-from weather_alert.apps.alerts.tasks import check_temperature
+from weather_alert.apps.alerts.tasks import (
+    check_location_temperature,
+    check_temperature_batch,
+    sweep_due_alert_configs,
+)
+from weather_alert.apps.location.models import Location
 from weather_alert.apps.temperature.models import TemperatureLog
 
 
 @pytest.mark.django_db
-def test_check_temperature_creates_alert(mocker, create_alert_config):
+def test_check_location_temperature_creates_alert(mocker, create_alert_config):
     mock_get_temp = mocker.patch(
         'weather_alert.apps.alerts.tasks.get_current_temperature',
         return_value=35.0,
     )
 
-    check_temperature(create_alert_config.id)
+    check_location_temperature(create_alert_config.location_id)
 
     mock_get_temp.assert_called_once_with(
         create_alert_config.location.latitude,
@@ -26,13 +36,15 @@ def test_check_temperature_creates_alert(mocker, create_alert_config):
 
 
 @pytest.mark.django_db
-def test_check_temperature_below_threshold(mocker, create_alert_config):
+def test_check_location_temperature_below_threshold(
+    mocker, create_alert_config
+):
     mock_get_temp = mocker.patch(
         'weather_alert.apps.alerts.tasks.get_current_temperature',
         return_value=25.0,
     )
 
-    check_temperature(create_alert_config.id)
+    check_location_temperature(create_alert_config.location_id)
 
     mock_get_temp.assert_called_once()
 
@@ -45,8 +57,267 @@ def test_check_temperature_below_threshold(mocker, create_alert_config):
 
 
 @pytest.mark.django_db
-def test_check_temperature_config_not_found():
+def test_check_location_temperature_location_not_found():
     with pytest.raises(Exception) as exc_info:
-        check_temperature(99999)
+        check_location_temperature(99999)
+
+    assert 'Não foi encontrada nenhuma localidade com id' in str(
+        exc_info.value
+    )
+
+
+@pytest.mark.django_db
+def test_sweep_due_alert_configs(mocker, settings, create_location):
+    settings.ALERT_SWEEP_BATCH_SIZE = 2
+    now = timezone.now()
+    # isola a varredura de configurações criadas por outros testes
+    AlertConfig.objects.update(next_check_at=now + timedelta(days=1))
+    due = [
+        AlertConfig.objects.create(
+            location=create_location,
+            temperature_threshold=30.0,
+            check_interval_minutes=interval,
+            next_check_at=now - timedelta(minutes=1),
+        )
+        for interval in (5, 5, 15)
+    ]
+    not_due = AlertConfig.objects.create(
+        location=create_location,
+        temperature_threshold=30.0,
+        next_check_at=now + timedelta(minutes=10),
+    )
+    mock_delay = mocker.patch.object(check_temperature_batch, 'delay')
+
+    dispatched = sweep_due_alert_configs()
+
+    assert dispatched == 3
+    batches = [call.args[0] for call in mock_delay.call_args_list]
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert sorted(sum(batches, [])) == sorted(config.id for config in due)
+
+    for config in due:
+        config.refresh_from_db()
+        assert config.next_check_at >= now + timedelta(
+            minutes=config.check_interval_minutes
+        )
+    not_due.refresh_from_db()
+    assert not_due.next_check_at == now + timedelta(minutes=10)
+
+
+@pytest.mark.django_db
+def test_sweep_due_alert_configs_nothing_due(mocker, create_alert_config):
+    AlertConfig.objects.update(
+        next_check_at=timezone.now() + timedelta(hours=1)
+    )
+    mock_delay = mocker.patch.object(check_temperature_batch, 'delay')
+
+    assert sweep_due_alert_configs() == 0
+    mock_delay.assert_not_called()
+
+
+@pytest.mark.django_db
+@respx.mock
+def test_check_temperature_batch(mocker, create_location):
+    other_location = Location.objects.create(
+        name='Olinda', latitude=-8.0089, longitude=-34.8553
+    )
+    hot = AlertConfig.objects.create(
+        location=create_location, temperature_threshold=30.0
+    )
+    same_location = AlertConfig.objects.create(
+        location=create_location, temperature_threshold=40.0
+    )
+    cold = AlertConfig.objects.create(
+        location=other_location, temperature_threshold=30.0
+    )
+    temperatures = {
+        str(create_location.latitude): 35.0,
+        str(other_location.latitude): 25.0,
+    }
+    route = respx.get('https://api.open-meteo.com/v1/forecast').mock(
+        side_effect=lambda request: Response(
+            200,
+            json={
+                'current_weather': {
+                    'temperature': temperatures[request.url.params['latitude']]
+                }
+            },
+        )
+    )
+    mock_notify = mocker.patch(
+        'weather_alert.apps.alerts.tasks.create_alert_and_notify'
+    )
+
+    checked = check_temperature_batch(
+        [hot.id, same_location.id, cold.id, 99999]
+    )
+
+    assert checked == 3
+    assert route.call_count == 2
+    assert TemperatureLog.objects.filter(location=create_location).count() == 1
+    assert TemperatureLog.objects.filter(location=other_location).count() == 1
+    mock_notify.assert_called_once()
+    assert mock_notify.call_args.kwargs['alert_config'] == hot
+
+
+@pytest.mark.django_db
+@respx.mock
+def test_check_temperature_batch_skips_failed_fetch(
+    mocker, create_alert_config
+):
+    respx.get('https://api.open-meteo.com/v1/forecast').mock(
+        return_value=Response(500)
+    )
+    mock_notify = mocker.patch(
+        'weather_alert.apps.alerts.tasks.create_alert_and_notify'
+    )
+
+    checked = check_temperature_batch([create_alert_config.id])
+
+    assert checked == 0
+    assert not TemperatureLog.objects.filter(
+        location=create_alert_config.location
+    ).exists()
+    mock_notify.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_check_location_temperature_alerts_only_on_transition(
+    mocker, settings, create_alert_config
+):
+    settings.ALERT_HYSTERESIS = 1.0
+    settings.ALERT_RENOTIFY_MINUTES = 0
+    threshold = create_alert_config.temperature_threshold
+    readings = [threshold + 2, threshold + 3, threshold - 0.5, threshold - 1.5]
+    readings += [threshold + 1]
+    mocker.patch(
+        'weather_alert.apps.alerts.tasks.get_current_temperature',
+        side_effect=readings,
+    )
+
+    for _ in readings:
+        # each run is due, as if the interval had elapsed
+        AlertConfig.objects.filter(id=create_alert_config.id).update(
+            next_check_at=timezone.now()
+        )
+        check_location_temperature(create_alert_config.location_id)
+
+    alerts = Alert.objects.filter(location=create_alert_config.location)
+    assert sorted(alerts.values_list('temperature', flat=True)) == [
+        threshold + 1,
+        threshold + 2,
+    ]
+
+
+@pytest.mark.django_db
+def test_check_location_temperature(mocker, settings, create_location):
+    settings.ALERT_HYSTERESIS = 1.0
+    configs = AlertConfig.objects.bulk_create(
+        [
+            AlertConfig(location=create_location, temperature_threshold=t)
+            for t in (40.0, 25.0, 30.0)
+        ]
+    )
+    AlertConfig.objects.filter(id=configs[0].id).update(
+        state=AlertConfig.State.FIRING
+    )
+    mock_get_temp = mocker.patch(
+        'weather_alert.apps.alerts.tasks.get_current_temperature',
+        return_value=35.0,
+    )
+
+    assert check_location_temperature(create_location.id) == 3
+
+    mock_get_temp.assert_called_once()
+    assert TemperatureLog.objects.filter(location=create_location).count() == 1
+    assert sorted(
+        Alert.objects.filter(location=create_location).values_list(
+            'threshold', flat=True
+        )
+    ) == [25.0, 30.0]
+    assert dict(
+        AlertConfig.objects.filter(location=create_location).values_list(
+            'temperature_threshold', 'state'
+        )
+    ) == {25.0: 'firing', 30.0: 'firing', 40.0: 'ok'}
+
+
+@pytest.mark.django_db
+def test_check_location_temperature_honours_config_intervals(
+    mocker, create_location
+):
+    now = timezone.now()
+    fast, slow = AlertConfig.objects.bulk_create(
+        [
+            AlertConfig(
+                location=create_location,
+                temperature_threshold=30.0,
+                check_interval_minutes=5,
+                next_check_at=now - timedelta(seconds=10),
+            ),
+            AlertConfig(
+                location=create_location,
+                temperature_threshold=40.0,
+                check_interval_minutes=30,
+                next_check_at=now + timedelta(minutes=20),
+            ),
+        ]
+    )
+    mocker.patch(
+        'weather_alert.apps.alerts.tasks.get_current_temperature',
+        return_value=25.0,
+    )
+
+    assert check_location_temperature(create_location.id) == 1
+
+    fast.refresh_from_db()
+    slow.refresh_from_db()
+    assert fast.next_check_at > now + timedelta(minutes=4)
+    assert slow.next_check_at == now + timedelta(minutes=20)
+
+    # within half a tick of being due counts as due
+    AlertConfig.objects.filter(id=slow.id).update(
+        next_check_at=now + timedelta(minutes=2)
+    )
+    assert check_location_temperature(create_location.id) == 1
+    slow.refresh_from_db()
+    assert slow.next_check_at > now + timedelta(minutes=29)
+
+
+@pytest.mark.django_db
+@respx.mock
+def test_check_location_temperature_uses_stale_reading(
+    settings, mocker, create_alert_config
+):
+    settings.OPENMETEO_CACHE_TTL = 0
+    settings.OPENMETEO_STALE_MAX_AGE = 3600
+    location = create_alert_config.location
+    route = respx.get('https://api.open-meteo.com/v1/forecast')
+    route.side_effect = [
+        Response(200, json={'current_weather': {'temperature': 25.0}}),
+        Response(503),
+    ]
+    mocker.patch('weather_alert.apps.alerts.tasks.create_alert_and_notify')
+
+    check_location_temperature(location.id)
+    AlertConfig.objects.filter(id=create_alert_config.id).update(
+        next_check_at=timezone.now()
+    )
+    check_location_temperature(location.id)
+
+    assert route.call_count == 2
+    assert TemperatureLog.objects.filter(location=location).count() == 1
+
+
+@pytest.mark.django_db
+@respx.mock
+def test_check_location_temperature_without_stale_reading_raises(
+    settings, create_alert_config
+):
+    settings.OPENMETEO_STALE_MAX_AGE = 3600
+    respx.get('https://api.open-meteo.com/v1/forecast').mock(
+        return_value=Response(503)
+    )
 
-    assert 'Não foi encontrado nenhum alerta com id' in str(exc_info.value)
+    with pytest.raises(HTTPStatusError):
+        check_location_temperature(create_alert_config.location_id)
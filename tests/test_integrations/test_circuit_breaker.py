@@ -0,0 +1,148 @@
+import pytest
+import respx
+from httpx import HTTPStatusError, Response
+from prometheus_client import REGISTRY
+
+from weather_alert.integrations.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpen,
+)
+from weather_alert.integrations.openmeteo import (
+    get_current_temperature,
+    get_stale_temperature,
+)
+
+URL = 'https://api.open-meteo.com/v1/forecast'
+
+
+@pytest.fixture
+def breaker_settings(settings):
+    settings.OPENMETEO_CIRCUIT_FAILURE_THRESHOLD = 2
+    settings.OPENMETEO_CIRCUIT_RESET_SECONDS = 30.0
+    return settings
+
+
+@pytest.fixture
+def clock(mocker):
+    now = [1000.0]
+    mocker.patch(
+        'weather_alert.integrations.circuit_breaker.time.monotonic',
+        side_effect=lambda: now[0],
+    )
+    return now
+
+
+def fail(breaker, status=500):
+    with pytest.raises(HTTPStatusError):
+        with breaker:
+            raise HTTPStatusError(
+                'erro', request=None, response=Response(status)
+            )
+
+
+def test_opens_after_threshold(breaker_settings, clock):
+    breaker = CircuitBreaker('openmeteo')
+
+    fail(breaker)
+    assert breaker.state == CircuitBreaker.CLOSED
+    fail(breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpen):
+        with breaker:
+            pass
+
+    assert breaker.stats() == {
+        'state': 'open',
+        'failures': 2,
+        'opened': 1,
+        'rejected': 1,
+    }
+
+
+def _sample(name):
+    return REGISTRY.get_sample_value(name, {'integration': 'openmeteo'}) or 0.0
+
+
+def test_exports_metrics(breaker_settings, clock):
+    names = (
+        'weather_alert_circuit_failures_total',
+        'weather_alert_circuit_opened_total',
+        'weather_alert_circuit_rejected_total',
+    )
+    before = [_sample(name) for name in names]
+    breaker = CircuitBreaker('openmeteo')
+
+    fail(breaker)
+    fail(breaker)
+    with pytest.raises(CircuitOpen):
+        with breaker:
+            pass
+
+    assert [_sample(name) - b for name, b in zip(names, before)] == [2, 1, 1]
+    assert _sample('weather_alert_circuit_state') == 2
+
+    breaker.reset()
+    assert _sample('weather_alert_circuit_state') == 0
+
+
+def test_client_errors_do_not_count(breaker_settings, clock):
+    breaker = CircuitBreaker('openmeteo')
+
+    for _ in range(3):
+        fail(breaker, status=404)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+
+
+def test_half_open_probe(breaker_settings, clock):
+    breaker = CircuitBreaker('openmeteo')
+    fail(breaker)
+    fail(breaker)
+
+    clock[0] += 30
+    fail(breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock[0] += 30
+    with breaker:
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        # only one probe at a time
+        with pytest.raises(CircuitOpen):
+            with breaker:
+                pass
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+
+
+@respx.mock
+def test_get_current_temperature_fails_fast(breaker_settings):
+    route = respx.get(URL).mock(return_value=Response(503))
+
+    for _ in range(2):
+        with pytest.raises(HTTPStatusError):
+            get_current_temperature(-8.0628, -34.8711)
+    with pytest.raises(CircuitOpen):
+        get_current_temperature(-8.0628, -34.8711)
+
+    assert route.call_count == 2
+
+
+@respx.mock
+def test_get_stale_temperature(settings):
+    settings.OPENMETEO_CACHE_TTL = 0
+    settings.OPENMETEO_STALE_MAX_AGE = 3600
+    respx.get(URL).mock(
+        return_value=Response(
+            200, json={'current_weather': {'temperature': 27.0}}
+        )
+    )
+
+    assert get_stale_temperature(-8.0628, -34.8711) is None
+    get_current_temperature(-8.0628, -34.8711)
+
+    temperature, age = get_stale_temperature(-8.0628, -34.8711)
+    assert temperature == 27.0
+    assert 0 <= age < 60
@@ -0,0 +1,77 @@
+import pytest
+
+from weather_alert.integrations.http_client import (
+    aclose_async_clients,
+    close_clients,
+    close_event_loop,
+    get_async_client,
+    get_client,
+    run_async,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_clients():
+    close_clients()
+    yield
+    close_clients()
+
+
+def test_get_client_reuses_pool_per_name():
+    client = get_client('openmeteo')
+
+    assert get_client('openmeteo') is client
+    assert get_client('n8n') is not client
+
+
+def test_get_client_uses_configured_limits(settings):
+    settings.HTTP_CLIENT_TIMEOUT = 3.0
+    settings.HTTP_CLIENT_CONNECT_TIMEOUT = 1.0
+
+    client = get_client('openmeteo')
+
+    assert client.timeout.read == 3.0
+    assert client.timeout.connect == 1.0
+
+
+def test_close_clients_recreates_on_next_use():
+    client = get_client('openmeteo')
+
+    close_clients()
+
+    assert client.is_closed
+    assert get_client('openmeteo') is not client
+
+
+@pytest.mark.asyncio
+async def test_get_async_client_reuses_pool_per_loop():
+    client = get_async_client('openmeteo')
+
+    assert get_async_client('openmeteo') is client
+
+    await aclose_async_clients()
+
+    assert client.is_closed
+    assert get_async_client('openmeteo') is not client
+    await aclose_async_clients()
+
+
+def test_get_async_client_requires_running_loop():
+    with pytest.raises(RuntimeError):
+        get_async_client('openmeteo')
+
+
+def test_run_async_keeps_async_clients_between_calls():
+    async def client():
+        return get_async_client('openmeteo')
+
+    first = run_async(client())
+
+    assert run_async(client()) is first
+    assert not first.is_closed
+
+    close_event_loop()
+
+    assert first.is_closed
+    assert run_async(client()) is not first
+    close_event_loop()
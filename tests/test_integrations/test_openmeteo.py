@@ -1,8 +1,20 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
 import pytest
 import respx
+import stamina
 from httpx import HTTPStatusError, Request, Response
 
-from weather_alert.integrations.openmeteo import get_current_temperature
+from weather_alert.integrations.openmeteo import (
+    aget_current_temperatures,
+    get_current_temperature,
+    get_current_temperatures,
+    snap_coordinate,
+)
+from weather_alert.integrations.temperature_cache import get_coalescing_stats
 
 
 @respx.mock
@@ -37,3 +49,176 @@ def test_get_current_temperature_http_error():
 
     with pytest.raises(HTTPStatusError):
         get_current_temperature(latitude, longitude)
+
+
+@pytest.fixture
+def openmeteo_server(settings):
+    """
+    Servidor HTTP local que simula a consulta multi-localização do Open-Meteo.
+
+    A temperatura devolvida é `latitude + longitude`, o que permite conferir
+    o mapeamento de cada leitura para a coordenada correta.
+    """
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            latitudes = query['latitude'][0].split(',')
+            longitudes = query['longitude'][0].split(',')
+            requests.append(list(zip(latitudes, longitudes)))
+
+            results = [
+                {
+                    'latitude': float(lat),
+                    'longitude': float(lon),
+                    'current_weather': {
+                        'temperature': round(float(lat) + float(lon), 4)
+                    },
+                }
+                for lat, lon in zip(latitudes, longitudes)
+            ]
+            body = json.dumps(
+                results[0] if len(results) == 1 else results
+            ).encode()
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.OPENMETEO_URL = (
+        f'http://127.0.0.1:{server.server_port}/v1/forecast'
+    )
+
+    yield requests
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_current_temperatures_single_request(openmeteo_server):
+    coordinates = [(-8.0628, -34.8711), (-23.5505, -46.6333), (52.52, 13.41)]
+
+    temperatures = get_current_temperatures(coordinates)
+
+    assert len(openmeteo_server) == 1
+    assert temperatures == {
+        (lat, lon): round(lat + lon, 4) for lat, lon in coordinates
+    }
+
+
+def test_get_current_temperatures_single_coordinate(openmeteo_server):
+    temperatures = get_current_temperatures([(-8.0628, -34.8711)])
+
+    assert temperatures == {(-8.0628, -34.8711): round(-8.0628 - 34.8711, 4)}
+
+
+def test_get_current_temperatures_chunks_and_deduplicates(
+    openmeteo_server, settings
+):
+    settings.OPENMETEO_MAX_COORDINATES_PER_REQUEST = 10
+    coordinates = [(float(i), float(-i)) for i in range(25)]
+
+    temperatures = get_current_temperatures(coordinates + coordinates[:5])
+
+    assert [len(chunk) for chunk in openmeteo_server] == [10, 10, 5]
+    assert len(temperatures) == 25
+    assert all(temperatures[coordinate] == 0.0 for coordinate in coordinates)
+
+
+def test_get_current_temperatures_respects_query_length(
+    openmeteo_server, settings
+):
+    settings.OPENMETEO_MAX_QUERY_LENGTH = 60
+    coordinates = [(-8.0628 - i, -34.8711 - i) for i in range(10)]
+
+    temperatures = get_current_temperatures(coordinates)
+
+    assert len(openmeteo_server) > 1
+    assert all(
+        len(','.join(lat for lat, _ in chunk))
+        + len(','.join(lon for _, lon in chunk))
+        <= 60
+        for chunk in openmeteo_server
+    )
+    assert set(temperatures) == set(coordinates)
+
+
+@respx.mock
+def test_get_current_temperatures_http_error():
+    respx.get('https://api.open-meteo.com/v1/forecast').mock(
+        return_value=Response(
+            500,
+            request=Request('GET', 'https://api.open-meteo.com/v1/forecast'),
+        )
+    )
+
+    with pytest.raises(HTTPStatusError):
+        get_current_temperatures([(-8.0628, -34.8711), (52.52, 13.41)])
+
+
+def test_snap_coordinate():
+    assert snap_coordinate(-8.0628, -34.8711, 0.1) == (-8.1, -34.9)
+    assert snap_coordinate(-8.0628, -34.8711, 0) == (-8.0628, -34.8711)
+
+
+def test_get_current_temperatures_coalesces_grid_cells(
+    openmeteo_server, settings
+):
+    settings.OPENMETEO_GRID_RESOLUTION = 0.1
+    coordinates = [(-8.0628, -34.8711), (-8.0589, -34.8812), (-8.27, -34.97)]
+
+    temperatures = get_current_temperatures(coordinates)
+
+    [request] = openmeteo_server
+    assert request == [('-8.1', '-34.9'), ('-8.3', '-35.0')]
+    assert temperatures == {
+        (-8.0628, -34.8711): -43.0,
+        (-8.0589, -34.8812): -43.0,
+        (-8.27, -34.97): -43.3,
+    }
+    assert get_coalescing_stats() == {'coordinates': 3, 'cells': 2, 'saved': 1}
+
+
+@pytest.fixture
+def retries():
+    stamina.set_active(True)
+    with stamina.set_testing(True, attempts=3):
+        yield
+    stamina.set_active(False)
+
+
+@pytest.mark.parametrize(
+    'status, calls', [(503, 3), (429, 1), (400, 1)], ids=str
+)
+@respx.mock
+def test_fetch_retries_only_server_errors(settings, retries, status, calls):
+    settings.OPENMETEO_CACHE_TTL = 0
+    route = respx.get('https://api.open-meteo.com/v1/forecast').mock(
+        return_value=Response(status, headers={'Retry-After': '60'})
+    )
+
+    with pytest.raises(HTTPStatusError):
+        get_current_temperature(-8.0628, -34.8711)
+
+    assert route.call_count == calls
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_afetch_does_not_retry_rate_limited(settings, retries):
+    settings.OPENMETEO_CACHE_TTL = 0
+    route = respx.get('https://api.open-meteo.com/v1/forecast').mock(
+        return_value=Response(429, headers={'Retry-After': '60'})
+    )
+
+    assert await aget_current_temperatures([(-8.0628, -34.8711)]) == {}
+    assert route.call_count == 1
@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from weather_alert.integrations.rate_limiter import RateLimited, RateLimiter
+
+
+@pytest.fixture
+def limits(settings):
+    settings.REDIS_URL = ''
+    settings.OPENMETEO_RATE_LIMIT_PER_SECOND = 10.0
+    settings.OPENMETEO_RATE_LIMIT_BURST = 2
+    settings.OPENMETEO_RATE_LIMIT_MAX_WAIT = 1.0
+    return settings
+
+
+def test_acquire_waits_after_burst(limits, mocker):
+    clock = [1000.0]
+    mocker.patch(
+        'weather_alert.integrations.rate_limiter.time.monotonic',
+        side_effect=lambda: clock[0],
+    )
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    mocker.patch(
+        'weather_alert.integrations.rate_limiter.time.sleep', side_effect=sleep
+    )
+    limiter = RateLimiter('openmeteo')
+
+    limiter.acquire()
+    limiter.acquire()
+    assert sleeps == []
+
+    limiter.acquire()
+
+    assert sleeps == [pytest.approx(0.1)]
+    assert limiter.stats()['acquired'] == 3
+    assert limiter.stats()['throttled'] == 1
+
+
+def test_acquire_sheds_beyond_max_wait(limits):
+    limits.OPENMETEO_RATE_LIMIT_MAX_WAIT = 0
+    limiter = RateLimiter('openmeteo')
+    limiter.acquire(2)
+
+    with pytest.raises(RateLimited):
+        limiter.acquire()
+
+    assert limiter.stats()['shed'] == 1
+
+
+def test_acquire_charges_chunks_larger_than_burst(limits, mocker):
+    clock = [1000.0]
+    mocker.patch(
+        'weather_alert.integrations.rate_limiter.time.monotonic',
+        side_effect=lambda: clock[0],
+    )
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    mocker.patch(
+        'weather_alert.integrations.rate_limiter.time.sleep', side_effect=sleep
+    )
+    limiter = RateLimiter('openmeteo')
+
+    # 5 tokens with a burst of 2: the last 3 are refilled at 10 per second
+    limiter.acquire(5)
+
+    assert sum(sleeps) == pytest.approx(0.3)
+    assert limiter.stats()['acquired'] == 1
+
+
+def test_acquire_sheds_chunks_beyond_max_wait(limits):
+    limiter = RateLimiter('openmeteo')
+
+    with pytest.raises(RateLimited):
+        limiter.acquire(20)
+
+    # nothing was reserved
+    limiter.acquire(2)
+    assert limiter.stats()['throttled'] == 0
+
+
+def test_acquire_exports_metrics(limits):
+    labels = {'integration': 'openmeteo'}
+    before = (
+        REGISTRY.get_sample_value(
+            'weather_alert_rate_limit_acquired_total', labels
+        )
+        or 0.0
+    )
+    limiter = RateLimiter('openmeteo')
+
+    limiter.acquire()
+
+    assert (
+        REGISTRY.get_sample_value(
+            'weather_alert_rate_limit_acquired_total', labels
+        )
+        == before + 1
+    )
+
+
+def test_acquire_disabled(limits, mocker):
+    limits.OPENMETEO_RATE_LIMIT_PER_SECOND = 0
+    sleep = mocker.patch('weather_alert.integrations.rate_limiter.time.sleep')
+    limiter = RateLimiter('openmeteo')
+
+    for _ in range(10):
+        limiter.acquire()
+
+    sleep.assert_not_called()
+
+
+def test_acquire_falls_back_when_redis_is_down(limits):
+    limits.REDIS_URL = 'redis://127.0.0.1:1/0'
+    limits.OPENMETEO_RATE_LIMIT_MAX_WAIT = 0
+    limiter = RateLimiter('openmeteo')
+
+    limiter.acquire(2)
+    with pytest.raises(RateLimited):
+        limiter.acquire()
+
+
+@pytest.mark.asyncio
+async def test_aacquire_does_not_block_event_loop(limits):
+    limiter = RateLimiter('openmeteo')
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.gather(*(limiter.aacquire() for _ in range(4)))
+    task.cancel()
+
+    assert limiter.stats()['throttled'] == 2
+    assert ticks >= 10
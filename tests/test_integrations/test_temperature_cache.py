@@ -0,0 +1,94 @@
+import pytest
+import respx
+from django.core.cache import caches
+from httpx import Response
+
+from weather_alert.integrations.openmeteo import (
+    get_current_temperature,
+    get_current_temperatures,
+)
+from weather_alert.integrations.temperature_cache import (
+    cache_key,
+    get_cache_stats,
+    get_cached_temperatures,
+    set_cached_temperatures,
+)
+
+OPENMETEO_URL = 'https://api.open-meteo.com/v1/forecast'
+
+
+def test_cache_key_rounds_coordinates(settings):
+    settings.OPENMETEO_CACHE_COORDINATE_PRECISION = 2
+
+    assert cache_key(-8.0628, -34.8711) == cache_key(-8.0601, -34.8698)
+    assert cache_key(-8.0628, -34.8711) != cache_key(-8.07, -34.8711)
+
+
+def test_cached_temperatures_count_hits_and_misses(mocker):
+    set_cached_temperatures({(-8.0628, -34.8711): 28.5})
+    before = get_cache_stats()
+    incr = mocker.spy(caches['default'], 'incr')
+
+    found = get_cached_temperatures([(-8.0628, -34.8711), (52.52, 13.41)])
+
+    assert found == {(-8.0628, -34.8711): 28.5}
+    assert get_cache_stats() == {
+        'hits': before['hits'] + 1,
+        'misses': before['misses'] + 1,
+    }
+    incr.assert_not_called()
+
+
+def test_cache_disabled_with_zero_ttl(settings):
+    settings.OPENMETEO_CACHE_TTL = 0
+    set_cached_temperatures({(-8.0628, -34.8711): 28.5})
+
+    assert get_cached_temperatures([(-8.0628, -34.8711)]) == {}
+
+
+def test_cache_falls_back_to_local_cache(mocker):
+    broken = mocker.MagicMock()
+    broken.get_many.side_effect = ConnectionError('redis down')
+    broken.set_many.side_effect = ConnectionError('redis down')
+    broken.incr.side_effect = ConnectionError('redis down')
+    caches = {'default': broken, 'local': mocker.MagicMock()}
+    caches['local'].get_many.return_value = {}
+    mocker.patch('weather_alert.integrations.temperature_cache.caches', caches)
+
+    assert get_cached_temperatures([(-8.0628, -34.8711)]) == {}
+    set_cached_temperatures({(-8.0628, -34.8711): 28.5})
+
+    caches['local'].get_many.assert_called_once()
+    caches['local'].set_many.assert_called_once()
+
+
+@respx.mock
+def test_get_current_temperature_uses_cache():
+    route = respx.get(OPENMETEO_URL).mock(
+        return_value=Response(
+            200, json={'current_weather': {'temperature': 28.5}}
+        )
+    )
+
+    assert get_current_temperature(-8.0628, -34.8711) == 28.5
+    assert get_current_temperature(-8.0601, -34.8698) == 28.5
+
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_get_current_temperatures_only_fetches_misses():
+    set_cached_temperatures({(-8.0628, -34.8711): 28.5})
+    route = respx.get(OPENMETEO_URL).mock(
+        return_value=Response(
+            200, json={'current_weather': {'temperature': 15.0}}
+        )
+    )
+
+    temperatures = get_current_temperatures(
+        [(-8.0628, -34.8711), (52.52, 13.41)]
+    )
+
+    assert temperatures == {(-8.0628, -34.8711): 28.5, (52.52, 13.41): 15.0}
+    assert route.call_count == 1
+    assert route.calls[0].request.url.params['latitude'] == '52.52'
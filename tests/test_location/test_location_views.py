@@ -1,6 +1,11 @@
 import pytest
+from django_celery_beat.models import PeriodicTask
 from ninja.testing import TestAsyncClient
 
+from weather_alert.apps.alerts.services.alert_config_service import (
+    AlertConfigService,
+    location_task_name,
+)
 from weather_alert.apps.location.models import Location
 
 
@@ -25,6 +30,27 @@ async def test_create_location(
     assert await Location.objects.filter(name='Recife Antigo').aexists()
 
 
+@pytest.mark.asyncio
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'field, value, message',
+    [
+        ('name', '  ', 'Nome obrigatório'),
+        ('latitude', -90.5, 'Latitude deve estar entre -90 e 90'),
+        ('longitude', 180.5, 'Longitude deve estar entre -180 e 180'),
+    ],
+)
+async def test_create_location_invalid(
+    api_client: TestAsyncClient, create_location_data, field, value, message
+):
+    response = await api_client.post(
+        'locations/', json={**create_location_data, field: value}
+    )
+
+    assert response.status_code == 422
+    assert [error['msg'] for error in response.json()['detail']] == [message]
+
+
 @pytest.mark.asyncio
 @pytest.mark.django_db
 async def test_list_locations(
@@ -68,3 +94,91 @@ async def test_delete_location(
     response_not_found = await api_client.delete(f'locations/{location.id}/')
     assert response_not_found.status_code == 404
     assert response_not_found.json()['message'] == 'Localidade não encontrada'
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_delete_location_removes_periodic_task(
+    api_client: TestAsyncClient, create_location_data
+):
+    location = await Location.objects.acreate(**create_location_data)
+    await AlertConfigService.create_alert_config_and_schedule_task(
+        location=location, temperature_threshold=30.0
+    )
+    assert await PeriodicTask.objects.filter(
+        name=location_task_name(location.id)
+    ).aexists()
+
+    response = await api_client.delete(f'locations/{location.id}/')
+
+    assert response.status_code == 204
+    assert not await PeriodicTask.objects.filter(
+        name=location_task_name(location.id)
+    ).aexists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_bulk_create_locations(
+    api_client: TestAsyncClient, create_location_data
+):
+    payload = [
+        create_location_data,
+        {'name': 'Fora do Mapa', 'latitude': 120.0, 'longitude': 0.0},
+        {'name': 'Olinda', 'latitude': -8.0089, 'longitude': -34.8553},
+    ]
+
+    response = await api_client.post('locations/bulk/', json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert [location['name'] for location in data['created']] == [
+        'Recife Antigo',
+        'Olinda',
+    ]
+    assert all(location['id'] for location in data['created'])
+    assert data['errors'] == [
+        {
+            'index': 1,
+            'message': 'latitude: Latitude deve estar entre -90 e 90',
+        }
+    ]
+    assert not await Location.objects.filter(name='Fora do Mapa').aexists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_bulk_create_locations_invalid_item(
+    api_client: TestAsyncClient, create_location_data
+):
+    payload = [
+        {'name': 'Sem Latitude', 'longitude': 0.0},
+        {'name': 'Fora do Mapa', 'latitude': 120.0, 'longitude': 0.0},
+        {'name': 'Texto', 'latitude': 'norte', 'longitude': 0.0},
+        create_location_data,
+    ]
+
+    response = await api_client.post('locations/bulk/', json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert [location['name'] for location in data['created']] == [
+        'Recife Antigo'
+    ]
+    assert [error['index'] for error in data['errors']] == [0, 1, 2]
+    assert data['errors'][0]['message'].startswith('latitude:')
+    assert data['errors'][1]['message'] == (
+        'latitude: Latitude deve estar entre -90 e 90'
+    )
+    assert data['errors'][2]['message'].startswith('latitude:')
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_bulk_create_locations_too_large(
+    api_client: TestAsyncClient, settings, create_location_data
+):
+    settings.API_BULK_MAX_ITEMS = 1
+
+    response = await api_client.post(
+        'locations/bulk/', json=[create_location_data] * 2
+    )
+    assert response.status_code == 400
@@ -0,0 +1,128 @@
+import pytest
+import respx
+from django.test import Client
+from httpx import Response
+from prometheus_client import REGISTRY
+
+from weather_alert.apps.alerts.services.alert_service import (
+    create_alert_and_notify,
+)
+from weather_alert.integrations.openmeteo import get_current_temperature
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.fixture
+def metrics_enabled(settings):
+    settings.METRICS_ENABLED = True
+    settings.MIDDLEWARE = [
+        'weather_alert.metrics.request_metrics_middleware',
+        *settings.MIDDLEWARE,
+    ]
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_exports_route_latency(metrics_enabled):
+    client = Client()
+    route = 'api/locations/'
+    before = sample(
+        'weather_alert_http_request_seconds_count',
+        method='GET',
+        route=route,
+        status='200',
+    )
+
+    client.get('/api/locations/')
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain')
+    assert b'weather_alert_http_request_seconds_bucket' in response.content
+    assert (
+        sample(
+            'weather_alert_http_request_seconds_count',
+            method='GET',
+            route=route,
+            status='200',
+        )
+        == before + 1
+    )
+
+
+def test_metrics_endpoint_disabled_by_default(settings):
+    settings.METRICS_ENABLED = False
+
+    assert Client().get('/metrics').status_code == 404
+
+
+def test_metrics_endpoint_requires_token(settings, metrics_enabled):
+    settings.METRICS_TOKEN = 'segredo'
+    client = Client()
+
+    assert client.get('/metrics').status_code == 401
+    assert (
+        client.get(
+            '/metrics', headers={'Authorization': 'Bearer outro'}
+        ).status_code
+        == 401
+    )
+    assert (
+        client.get(
+            '/metrics', headers={'Authorization': 'Bearer segredo'}
+        ).status_code
+        == 200
+    )
+
+
+@respx.mock
+def test_openmeteo_latency_and_cache_lookups():
+    respx.get('https://api.open-meteo.com/v1/forecast').mock(
+        return_value=Response(
+            200, json={'current_weather': {'temperature': 28.5}}
+        )
+    )
+    requests = sample(
+        'weather_alert_openmeteo_request_seconds_count',
+        mode='single',
+        outcome='success',
+    )
+    hits = sample(
+        'weather_alert_temperature_cache_lookups_total', result='hit'
+    )
+
+    get_current_temperature(-8.0628, -34.8711)
+    get_current_temperature(-8.0628, -34.8711)
+
+    assert (
+        sample(
+            'weather_alert_openmeteo_request_seconds_count',
+            mode='single',
+            outcome='success',
+        )
+        == requests + 1
+    )
+    assert (
+        sample('weather_alert_temperature_cache_lookups_total', result='hit')
+        == hits + 1
+    )
+
+
+@pytest.mark.django_db
+def test_alerts_created_counter(
+    mocker, django_capture_on_commit_callbacks, create_alert_config
+):
+    mocker.patch(
+        'weather_alert.apps.alerts.services.alert_service._trigger_dispatch'
+    )
+    before = sample('weather_alert_alerts_created_total')
+
+    with django_capture_on_commit_callbacks(execute=True):
+        create_alert_and_notify(
+            location=create_alert_config.location,
+            temperature=35.0,
+            alert_config=create_alert_config,
+        )
+
+    assert sample('weather_alert_alerts_created_total') == before + 1
@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from weather_alert.apps.temperature.models import (
+    TemperatureLog,
+    TemperatureRollup,
+)
+from weather_alert.apps.temperature.services.retention_service import (
+    delete_in_chunks,
+)
+from weather_alert.apps.temperature.tasks import (
+    purge_expired_temperature_data,
+)
+
+
+@pytest.fixture
+def retention(settings):
+    settings.TEMPERATURE_LOG_RETENTION_DAYS = 30
+    settings.TEMPERATURE_HOURLY_ROLLUP_RETENTION_DAYS = 60
+    settings.TEMPERATURE_DAILY_ROLLUP_RETENTION_DAYS = 0
+    settings.TEMPERATURE_RETENTION_CHUNK_SIZE = 2
+    settings.TEMPERATURE_RETENTION_MAX_CHUNKS = 100
+
+
+@pytest.mark.django_db
+def test_delete_in_chunks_respects_max_chunks(create_location):
+    TemperatureLog.objects.bulk_create(
+        [
+            TemperatureLog(location=create_location, temperature=20.0)
+            for _ in range(5)
+        ]
+    )
+    queryset = TemperatureLog.objects.filter(location=create_location)
+
+    assert delete_in_chunks(queryset, chunk_size=2, max_chunks=2) == 4
+    assert queryset.count() == 1
+    assert delete_in_chunks(queryset, chunk_size=2) == 1
+
+
+@pytest.mark.django_db
+def test_purge_expired_temperature_data(retention, create_location):
+    now = timezone.now()
+    TemperatureLog.objects.bulk_create(
+        [
+            TemperatureLog(
+                location=create_location,
+                temperature=20.0,
+                timestamp=now - timedelta(days=days),
+            )
+            for days in (1, 29, 31, 45, 90)
+        ]
+    )
+    TemperatureRollup.objects.bulk_create(
+        [
+            TemperatureRollup(
+                location=create_location,
+                period=period,
+                bucket=now - timedelta(days=days),
+                count=1,
+                min=20.0,
+                max=20.0,
+                sum=20.0,
+            )
+            for period in ('hour', 'day')
+            for days in (45, 90)
+        ]
+    )
+
+    result = purge_expired_temperature_data()
+
+    assert result['temperature_logs'] == 3
+    assert result['hourly_rollups'] == 1
+    assert result['daily_rollups'] == 0
+    assert 'seconds' in result
+    assert TemperatureLog.objects.filter(location=create_location).count() == 2
+    assert (
+        TemperatureRollup.objects.filter(
+            location=create_location, period='day'
+        ).count()
+        == 2
+    )
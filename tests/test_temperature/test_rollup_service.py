@@ -0,0 +1,180 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from weather_alert.apps.temperature.models import (
+    TemperatureLog,
+    TemperatureRollup,
+)
+from weather_alert.apps.temperature.services.aggregation_service import (
+    rollup_period,
+)
+from weather_alert.apps.temperature.services.rollup_service import (
+    apply_readings,
+    bucket_start,
+    rebuild_rollups,
+    rebuildable_since,
+)
+from weather_alert.apps.temperature.services.temperature_log_buffer import (
+    TemperatureLogBuffer,
+)
+
+
+@pytest.fixture
+def day():
+    return bucket_start(timezone.now(), 'day') - timedelta(days=2)
+
+
+def _rollups(location, period):
+    return list(
+        TemperatureRollup.objects.filter(location=location, period=period)
+        .order_by('bucket')
+        .values_list('bucket', 'count', 'min', 'max', 'sum')
+    )
+
+
+@pytest.mark.django_db
+def test_apply_readings_merges_into_existing_rollups(create_location, day):
+    apply_readings(
+        [
+            (create_location.id, 20.0, day + timedelta(minutes=5)),
+            (create_location.id, 24.0, day + timedelta(minutes=50)),
+        ]
+    )
+    apply_readings(
+        [
+            (create_location.id, 18.0, day + timedelta(minutes=55)),
+            (create_location.id, 30.0, day + timedelta(hours=2)),
+        ]
+    )
+
+    assert _rollups(create_location, 'hour') == [
+        (day, 3, 18.0, 24.0, 62.0),
+        (day + timedelta(hours=2), 1, 30.0, 30.0, 30.0),
+    ]
+    assert _rollups(create_location, 'day') == [(day, 4, 18.0, 30.0, 92.0)]
+
+
+@pytest.mark.django_db
+def test_buffer_flush_updates_rollups(settings, create_location, day):
+    settings.TEMPERATURE_LOG_BUFFER_SIZE = 10
+    buffer = TemperatureLogBuffer()
+    buffer.add(create_location.id, 21.0, day + timedelta(hours=1))
+    buffer.add(create_location.id, 23.0, day + timedelta(hours=1))
+
+    buffer.flush()
+
+    assert _rollups(create_location, 'hour') == [
+        (day + timedelta(hours=1), 2, 21.0, 23.0, 44.0)
+    ]
+
+
+@pytest.mark.django_db
+def test_rebuild_rollups_from_logs(create_location, day):
+    TemperatureLog.objects.bulk_create(
+        [
+            TemperatureLog(
+                location=create_location,
+                temperature=20.0 + i,
+                timestamp=day + timedelta(hours=i * 12),
+            )
+            for i in range(4)
+        ]
+    )
+    assert not _rollups(create_location, 'day')
+
+    rebuild_rollups(day, day + timedelta(days=2), [create_location.id])
+
+    assert _rollups(create_location, 'day') == [
+        (day, 2, 20.0, 21.0, 41.0),
+        (day + timedelta(days=1), 2, 22.0, 23.0, 45.0),
+    ]
+    assert len(_rollups(create_location, 'hour')) == 4
+
+    # recalcular não duplica os agregados
+    call_command(
+        'rebuild_temperature_rollups',
+        location_ids=[create_location.id],
+        window_days=1,
+    )
+    assert _rollups(create_location, 'day')[0] == (day, 2, 20.0, 21.0, 41.0)
+
+
+@pytest.mark.django_db
+def test_rebuild_rollups_keeps_rollups_beyond_log_retention(
+    settings, create_location, day
+):
+    settings.TEMPERATURE_LOG_RETENTION_DAYS = 1
+    since = rebuildable_since()
+    assert since == day + timedelta(days=2)
+
+    # the logs of `day` and of the next (partly purged) day are gone
+    apply_readings(
+        [
+            (create_location.id, 20.0, day + timedelta(hours=1)),
+            (create_location.id, 22.0, day + timedelta(days=1, hours=1)),
+        ]
+    )
+    TemperatureLog.objects.create(
+        location=create_location,
+        temperature=30.0,
+        timestamp=timezone.now(),
+    )
+
+    call_command(
+        'rebuild_temperature_rollups',
+        start=day,
+        location_ids=[create_location.id],
+    )
+
+    assert _rollups(create_location, 'day')[:2] == [
+        (day, 1, 20.0, 20.0, 20.0),
+        (day + timedelta(days=1), 1, 22.0, 22.0, 22.0),
+    ]
+    assert _rollups(create_location, 'day')[2][1:] == (1, 30.0, 30.0, 30.0)
+
+
+@pytest.mark.django_db
+def test_rebuild_rollups_skips_range_without_logs(create_location, day):
+    apply_readings([(create_location.id, 20.0, day + timedelta(hours=1))])
+
+    assert rebuild_rollups(day, day + timedelta(days=1)) == 0
+    assert _rollups(create_location, 'day') == [(day, 1, 20.0, 20.0, 20.0)]
+
+
+def test_rollup_period(day):
+    assert rollup_period('hour', day) == 'hour'
+    assert rollup_period('day', day) == 'day'
+    assert rollup_period('month', day, day + timedelta(hours=5)) == 'hour'
+    assert rollup_period('day', day + timedelta(minutes=10)) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_aggregate_reads_rollups_when_aligned(
+    api_client, create_location, day
+):
+    await TemperatureRollup.objects.acreate(
+        location=create_location,
+        period='day',
+        bucket=day,
+        count=4,
+        min=10.0,
+        max=30.0,
+        sum=80.0,
+    )
+
+    response = await api_client.get(
+        'temperature-logs/aggregate/',
+        query_params={
+            'bucket': 'day',
+            'start': day.isoformat(),
+            'location_ids': [create_location.id],
+        },
+    )
+
+    [series] = response.json()['series']
+    assert series['count'] == [4]
+    assert series['avg'] == [20.0]
@@ -0,0 +1,142 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from prometheus_client import REGISTRY
+
+from weather_alert.apps.temperature.models import TemperatureLog
+from weather_alert.apps.temperature.services.temperature_log_buffer import (
+    TemperatureLogBuffer,
+)
+
+
+@pytest.fixture
+def buffer(settings):
+    settings.TEMPERATURE_LOG_BUFFER_SIZE = 3
+    settings.TEMPERATURE_LOG_BUFFER_MAX_AGE_SECONDS = 60
+    return TemperatureLogBuffer()
+
+
+@pytest.mark.django_db
+def test_buffer_flushes_by_size(buffer, create_location):
+    assert buffer.add(create_location.id, 20.0) == 0
+    assert buffer.add(create_location.id, 21.0) == 0
+    assert not TemperatureLog.objects.filter(location=create_location).exists()
+
+    assert buffer.add(create_location.id, 22.0) == 3
+
+    assert len(buffer) == 0
+    assert buffer.last_flush_size == 3
+    assert sorted(
+        TemperatureLog.objects.filter(location=create_location).values_list(
+            'temperature', flat=True
+        )
+    ) == [20.0, 21.0, 22.0]
+
+
+@pytest.mark.django_db
+def test_buffer_flushes_by_age(buffer, settings, create_location):
+    buffer.add(create_location.id, 20.0)
+    assert buffer.flush_if_due() == 0
+
+    settings.TEMPERATURE_LOG_BUFFER_MAX_AGE_SECONDS = 0
+
+    assert buffer.flush_if_due() == 1
+    assert TemperatureLog.objects.filter(location=create_location).exists()
+
+
+@pytest.mark.django_db
+def test_buffer_keeps_reading_timestamp(buffer, create_location):
+    read_at = timezone.now() - timedelta(minutes=5)
+
+    buffer.add(create_location.id, 20.0, read_at)
+    buffer.flush()
+
+    log = TemperatureLog.objects.get(location=create_location)
+    assert log.timestamp == read_at
+
+
+@pytest.mark.django_db
+def test_buffer_restores_rows_when_flush_fails(
+    buffer, mocker, create_location
+):
+    mocker.patch.object(
+        TemperatureLog.objects, 'bulk_create', side_effect=RuntimeError
+    )
+    buffer.add(create_location.id, 20.0)
+
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+
+    assert len(buffer) == 1
+    assert buffer.flushes == 0
+
+
+@pytest.mark.django_db
+def test_buffer_add_keeps_rows_when_flush_fails(
+    buffer, mocker, create_location
+):
+    mocker.patch.object(
+        TemperatureLog.objects, 'bulk_create', side_effect=RuntimeError
+    )
+    buffer.add(create_location.id, 20.0)
+    buffer.add(create_location.id, 21.0)
+
+    # the failed flush does not reach the caller
+    assert buffer.add(create_location.id, 22.0) == 0
+
+    assert len(buffer) == 3
+
+    mocker.stopall()
+    assert buffer.flush() == 3
+
+
+@pytest.mark.django_db(transaction=True)
+def test_buffer_flushes_on_timer(settings, create_location):
+    settings.TEMPERATURE_LOG_BUFFER_SIZE = 10
+    settings.TEMPERATURE_LOG_BUFFER_MAX_AGE_SECONDS = 0.05
+    buffer = TemperatureLogBuffer()
+
+    buffer.add(create_location.id, 20.0)
+    timer = buffer._timer
+    assert timer is not None
+
+    # no task or further reading is needed to write the row
+    timer.join(timeout=5)
+
+    assert len(buffer) == 0
+    assert buffer._timer is None
+    assert TemperatureLog.objects.filter(location=create_location).exists()
+
+
+@pytest.mark.django_db
+def test_buffer_flush_cancels_timer_and_exports_metrics(
+    buffer, create_location
+):
+    flushed = REGISTRY.get_sample_value(
+        'weather_alert_temperature_logs_flushed_total'
+    )
+    flushes = REGISTRY.get_sample_value(
+        'weather_alert_temperature_log_flush_size_count'
+    )
+
+    buffer.add(create_location.id, 20.0)
+    buffer.add(create_location.id, 21.0)
+    timer = buffer._timer
+
+    assert buffer.flush() == 2
+
+    assert timer.finished.is_set()
+    assert buffer._timer is None
+    assert (
+        REGISTRY.get_sample_value(
+            'weather_alert_temperature_logs_flushed_total'
+        )
+        == flushed + 2
+    )
+    assert (
+        REGISTRY.get_sample_value(
+            'weather_alert_temperature_log_flush_size_count'
+        )
+        == flushes + 1
+    )
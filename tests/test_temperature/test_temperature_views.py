@@ -1,6 +1,13 @@
+import json
+from datetime import timedelta
+
 import pytest
+from django.test import AsyncClient
+from django.utils import timezone
 from ninja.testing import TestAsyncClient
 
+from weather_alert.apps.temperature.models import TemperatureLog
+
 
 @pytest.mark.asyncio
 @pytest.mark.django_db
@@ -45,3 +52,166 @@ async def test_get_temperature_log(
         response_not_found.json()['message']
         == 'Registro de temperatura não encontrado'
     )
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_list_temperature_logs_cursor_pagination(
+    api_client: TestAsyncClient, create_location
+):
+    now = timezone.now()
+    # dois registros com o mesmo timestamp testam o desempate pelo id
+    timestamps = [now, now, now - timedelta(minutes=1), now - timedelta(2)]
+    for i, timestamp in enumerate(timestamps):
+        await TemperatureLog.objects.acreate(
+            location=create_location, temperature=20.0 + i, timestamp=timestamp
+        )
+    expected = [
+        log.id
+        async for log in TemperatureLog.objects.filter(
+            location=create_location
+        ).order_by('-timestamp', '-id')
+    ]
+
+    ids = []
+    url = f'temperature-logs/?location_id={create_location.id}&limit=3'
+    response = await api_client.get(url)
+    page = response.json()
+    ids += [log['id'] for log in page]
+    assert len(page) == 3
+    assert response.has_header('X-Next-Cursor')
+
+    response = await api_client.get(
+        f"{url}&cursor={response['X-Next-Cursor']}"
+    )
+    ids += [log['id'] for log in response.json()]
+    assert not response.has_header('X-Next-Cursor')
+
+    assert ids == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_list_temperature_logs_invalid_cursor(
+    api_client: TestAsyncClient,
+):
+    response = await api_client.get('temperature-logs/?cursor=invalido')
+    assert response.status_code == 400
+    assert response.json()['message'] == 'Cursor inválido'
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_aggregate_temperature_logs(
+    api_client: TestAsyncClient, create_location
+):
+    hour = timezone.localtime().replace(
+        minute=0, second=0, microsecond=0
+    ) - timedelta(hours=3)
+    readings = [
+        (hour, 20.0),
+        (hour + timedelta(minutes=30), 24.0),
+        (hour + timedelta(hours=1, minutes=10), 30.0),
+    ]
+    for timestamp, temperature in readings:
+        await TemperatureLog.objects.acreate(
+            location=create_location,
+            temperature=temperature,
+            timestamp=timestamp,
+        )
+
+    response = await api_client.get(
+        'temperature-logs/aggregate/',
+        query_params={
+            'bucket': 'hour',
+            'start': (hour - timedelta(hours=1)).isoformat(),
+            'location_ids': [create_location.id],
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['bucket'] == 'hour'
+    [series] = data['series']
+    assert series['location_id'] == create_location.id
+    assert series['min'] == [20.0, 30.0]
+    assert series['max'] == [24.0, 30.0]
+    assert series['avg'] == [22.0, 30.0]
+    assert series['count'] == [2, 1]
+    assert len(series['timestamps']) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_aggregate_temperature_logs_invalid_range(
+    api_client: TestAsyncClient,
+):
+    now = timezone.now()
+    response = await api_client.get(
+        'temperature-logs/aggregate/',
+        query_params={
+            'start': now.isoformat(),
+            'end': (now - timedelta(days=1)).isoformat(),
+        },
+    )
+
+    assert response.status_code == 400
+    assert response.json()['message'] == 'Período inválido'
+
+
+async def _read_stream(response) -> str:
+    return b''.join(
+        [chunk async for chunk in response.streaming_content]
+    ).decode()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_export_temperature_logs(create_location, settings):
+    settings.API_EXPORT_CHUNK_SIZE = 2
+    now = timezone.now()
+    await TemperatureLog.objects.abulk_create(
+        [
+            TemperatureLog(
+                location=create_location,
+                temperature=20.0 + i,
+                timestamp=now - timedelta(hours=i),
+            )
+            for i in range(5)
+        ]
+    )
+    client = AsyncClient()
+    query = {
+        'location_ids': create_location.id,
+        'start': (now - timedelta(hours=3, minutes=30)).isoformat(),
+    }
+
+    response = await client.get('/api/temperature-logs/export/', query)
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/x-ndjson'
+    rows = [
+        json.loads(line)
+        for line in (await _read_stream(response)).splitlines()
+    ]
+    assert [row['temperature'] for row in rows] == [23.0, 22.0, 21.0, 20.0]
+
+    response = await client.get(
+        '/api/temperature-logs/export/', {**query, 'format': 'csv'}
+    )
+    assert response['Content-Type'] == 'text/csv'
+    lines = (await _read_stream(response)).splitlines()
+    assert lines[0] == 'id,location_id,temperature,timestamp'
+    assert len(lines) == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_export_temperature_logs_invalid_period(
+    api_client: TestAsyncClient,
+):
+    response = await api_client.get(
+        'temperature-logs/export/'
+        '?start=2024-01-02T00:00:00&end=2024-01-01T00:00:00'
+    )
+    assert response.status_code == 400
+    assert response.json()['message'] == 'Período inválido'
@@ -0,0 +1,47 @@
+"""
+Validação item a item dos endpoints de criação em lote.
+
+Os endpoints recebem `list[dict]` em vez de uma lista do schema de entrada,
+para que um item malformado seja reportado em `errors` com sua posição, em vez
+de recusar o lote inteiro com `422`.
+"""
+
+from typing import TypeVar
+
+from ninja import Schema
+from pydantic import ValidationError
+
+S = TypeVar('S', bound=Schema)
+
+
+def _message(error: ValidationError) -> str:
+    return '; '.join(
+        f'{".".join(str(part) for part in e["loc"])}: {e["msg"]}'
+        if e['loc']
+        else e['msg']
+        for e in error.errors()
+    )
+
+
+def validate_items(
+    schema: type[S], items: list
+) -> tuple[list[tuple[int, S]], list[dict]]:
+    """
+    Valida cada item do lote com `schema`.
+
+    Args:
+        schema (type[Schema]): Schema de entrada de um item.
+        items (list): Itens do corpo da requisição.
+
+    Returns:
+        tuple[list[tuple[int, Schema]], list[dict]]: Itens válidos com sua
+        posição no lote e os erros dos demais (`index` e `message`).
+    """
+    valid = []
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as e:
+            errors.append({'index': index, 'message': _message(e)})
+    return valid, errors
@@ -0,0 +1,201 @@
+"""
+GET condicional (`ETag` / `If-None-Match`) para as listagens da API.
+
+Cada coleção (localidades, configurações de alerta, alertas) tem uma versão
+no cache, trocada por `bump_versions` sempre que uma view ou serviço grava na
+coleção. O ETag de uma listagem é derivado do caminho da requisição e das
+versões das coleções das quais ela depende, então uma requisição com o ETag
+atual recebe `304 Not Modified` sem consultar nenhuma linha.
+
+Com `API_ETAG_BODY_CACHE_TTL` o corpo serializado também é guardado no cache,
+indexado pelo ETag, e servido sem executar a view, junto com os cabeçalhos
+de paginação.
+
+As versões são valores aleatórios e não contadores, de modo que a perda de
+uma chave no cache nunca faz um ETag antigo voltar a ser válido.
+
+As versões precisam ser vistas por todos os processos que gravam (workers do
+servidor web e do Celery), por isso a camada só é ativada com
+`API_ETAGS_ENABLED`, que por padrão exige `REDIS_URL`. Se o cache falhar, a
+requisição é atendida pela view, sem ETag, em vez de recorrer a um cache
+local que não enxerga as trocas de versão dos outros processos.
+"""
+
+import hashlib
+import uuid
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import admin
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import parse_etags
+from loguru import logger
+
+from .pagination import NEXT_PAGE_HEADERS
+
+LOCATIONS = 'locations'
+ALERT_CONFIGS = 'alert_configs'
+ALERTS = 'alerts'
+
+
+def _version_key(collection: str) -> str:
+    return f'api:version:{collection}'
+
+
+def _body_key(etag: str) -> str:
+    # v2: entries also carry the pagination headers
+    return f'api:body:v2:{etag}'
+
+
+def _set_versions(collections: tuple[str, ...]):
+    versions = {_version_key(c): uuid.uuid4().hex for c in collections}
+    try:
+        caches['default'].set_many(versions, timeout=None)
+    except Exception as e:
+        logger.error(
+            f'Cache indisponível, versões de {", ".join(collections)} não trocadas: {e}'
+        )
+
+
+def bump_versions(*collections: str):
+    """
+    Troca a versão das coleções após o commit da transação atual (ou
+    imediatamente, fora de uma transação), invalidando os ETags das listagens
+    que dependem delas.
+    """
+    if settings.API_ETAGS_ENABLED:
+        transaction.on_commit(partial(_set_versions, collections))
+
+
+abump_versions = sync_to_async(bump_versions)
+
+
+def get_versions(collections: tuple[str, ...]) -> list[str]:
+    """
+    Versões atuais das coleções, criando as que ainda não existem no cache.
+
+    Raises:
+        Exception: Se o cache estiver indisponível.
+    """
+    cache = caches['default']
+    keys = [_version_key(c) for c in collections]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            # add() keeps the version of a concurrent initializer
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def compute_etag(request, collections: tuple[str, ...]) -> str:
+    """
+    ETag da listagem: caminho e query string da requisição mais as versões
+    das coleções.
+    """
+    raw = '|'.join(
+        [request.path, request.GET.urlencode(), *get_versions(collections)]
+    )
+    return f'"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+
+
+def _lookup(request, collections: tuple[str, ...]):
+    """
+    ETag atual e, se possível, a resposta sem executar a view (`304` ou o
+    corpo guardado). Sem cache, devolve `(None, None)`.
+    """
+    try:
+        etag = compute_etag(request, collections)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            return etag, HttpResponseNotModified()
+
+        if settings.API_ETAG_BODY_CACHE_TTL:
+            cached = caches['default'].get(_body_key(etag))
+            if cached is not None:
+                content, content_type, headers = cached
+                return etag, HttpResponse(
+                    content, content_type=content_type, headers=headers
+                )
+    except Exception as e:
+        logger.warning(f'Cache indisponível, listagem servida sem ETag: {e}')
+        return None, None
+
+    return etag, None
+
+
+def _store(etag: str, response: HttpResponse):
+    if settings.API_ETAG_BODY_CACHE_TTL:
+        try:
+            caches['default'].set(
+                _body_key(etag),
+                (
+                    response.content,
+                    response['Content-Type'],
+                    {
+                        h: response[h]
+                        for h in NEXT_PAGE_HEADERS
+                        if h in response
+                    },
+                ),
+                timeout=settings.API_ETAG_BODY_CACHE_TTL,
+            )
+        except Exception as e:
+            logger.warning(f'Cache indisponível, corpo não guardado: {e}')
+
+
+def collection_etag(*collections: str):
+    """
+    Decorator (para `ninja.decorators.decorate_view`) que adiciona GET
+    condicional a uma listagem assíncrona que depende de `collections`.
+
+    Respostas 200 recebem o `ETag` e `Cache-Control: no-cache`, para que
+    navegadores e clientes revalidem a cada requisição. Sem
+    `API_ETAGS_ENABLED` a view é executada sem alterações.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if not settings.API_ETAGS_ENABLED:
+                return await view(request, *args, **kwargs)
+
+            etag, response = await sync_to_async(_lookup)(request, collections)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+                if etag is None or response.status_code != 200:
+                    return response
+                await sync_to_async(_store)(etag, response)
+
+            response['ETag'] = etag
+            response['Cache-Control'] = 'no-cache'
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+class VersionedModelAdmin(admin.ModelAdmin):
+    """
+    ModelAdmin que troca a versão das coleções afetadas pelas gravações
+    feitas no admin.
+    """
+
+    collections: tuple[str, ...] = ()
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        bump_versions(*self.collections)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        bump_versions(*self.collections)
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        bump_versions(*self.collections)
@@ -0,0 +1,102 @@
+"""
+Paginação por cursor (keyset) em `(timestamp, id)`.
+
+Em vez de OFFSET, cada página continua a partir da última linha da página
+anterior, de modo que o custo de uma página não cresce com o histórico.
+
+O corpo das listagens continua sendo a lista de itens; o cursor da próxima
+página segue nos cabeçalhos `X-Next-Cursor` e `Link` (`rel="next"`).
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db.models import QuerySet
+from django.http import HttpResponse
+
+
+NEXT_PAGE_HEADERS = ('X-Next-Cursor', 'Link')
+
+
+class InvalidCursor(ValueError):
+    """
+    Cursor de paginação malformado.
+    """
+
+
+def encode_cursor(timestamp: datetime, id: int) -> str:
+    """
+    Codifica a posição `(timestamp, id)` em um cursor opaco.
+    """
+    raw = json.dumps([timestamp.isoformat(), id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decodifica um cursor gerado por `encode_cursor`.
+
+    Raises:
+        InvalidCursor: Se o cursor for inválido.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        timestamp, id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursor(cursor) from e
+
+
+async def paginate_by_timestamp(
+    queryset: QuerySet, limit: int, cursor: str = None
+) -> tuple[list, str | None]:
+    """
+    Retorna uma página do queryset em ordem decrescente de `(timestamp, id)`.
+
+    Args:
+        queryset (QuerySet): Consulta com os campos `timestamp` e `id`.
+        limit (int): Tamanho da página.
+        cursor (str, optional): Cursor `next` da página anterior.
+
+    Returns:
+        tuple[list, str | None]: Itens da página e o cursor da próxima página
+        (`None` na última página).
+
+    Raises:
+        InvalidCursor: Se o cursor for inválido.
+    """
+    queryset = queryset.order_by('-timestamp', '-id')
+
+    if cursor:
+        timestamp, id = decode_cursor(cursor)
+        # timestamp <= t limita a varredura do índice; o exclude desempata pelo id
+        queryset = queryset.filter(timestamp__lte=timestamp).exclude(
+            timestamp=timestamp, id__gte=id
+        )
+
+    items = [item async for item in queryset[: limit + 1]]
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    return items, encode_cursor(items[-1].timestamp, items[-1].id)
+
+
+def set_next_page_headers(
+    request, response: HttpResponse, next_cursor: str | None
+):
+    """
+    Adiciona à resposta os cabeçalhos da próxima página, se houver.
+
+    `X-Next-Cursor` traz o cursor e `Link` a URL (relativa) da próxima
+    página, com os mesmos filtros da requisição atual.
+    """
+    if next_cursor is None:
+        return
+
+    query = request.GET.copy()
+    query['cursor'] = next_cursor
+    response['X-Next-Cursor'] = next_cursor
+    response['Link'] = f'<{request.path}?{query.urlencode()}>; rel="next"'
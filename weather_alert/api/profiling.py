@@ -0,0 +1,180 @@
+"""
+Perfil de requisições da API com cabeçalhos `Server-Timing`.
+
+Ativado por `API_PROFILING_SAMPLE_RATE`: uma fração das requisições da API é
+perfilada, registrando quantidade de queries, tempo no banco, tempo de
+serialização (renderização JSON) e tempo restante da view. Os tempos são
+devolvidos no cabeçalho `Server-Timing` e requisições acima de
+`API_PROFILING_SLOW_MS` são registradas no log.
+
+As queries são medidas por um `execute_wrapper` instalado em cada conexão.
+Fora de uma requisição perfilada o wrapper apenas consulta uma `ContextVar`.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+from inspect import iscoroutinefunction
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.decorators import sync_and_async_middleware
+from loguru import logger
+
+from weather_alert.api.renderers import ORJSONRenderer
+
+# mount point of the NinjaAPI in weather_alert.urls
+PATH_PREFIX = '/api/'
+
+_current_profile: ContextVar['RequestProfile | None'] = ContextVar(
+    'request_profile', default=None
+)
+
+
+class RequestProfile:
+    """
+    Tempos acumulados de uma requisição perfilada.
+
+    Attributes:
+        queries (int): Queries executadas.
+        db_seconds (float): Tempo gasto no banco.
+        serialization_seconds (float): Tempo gasto renderizando a resposta.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialization_seconds = 0.0
+
+    def timings(self) -> dict[str, float]:
+        """
+        Tempos em milissegundos: `db`, `serialize`, `view` e `total`.
+
+        O tempo de `view` é o total menos o tempo de banco e de serialização.
+        """
+        total = time.perf_counter() - self.started_at
+        view = max(0.0, total - self.db_seconds - self.serialization_seconds)
+        return {
+            'db': self.db_seconds * 1000,
+            'serialize': self.serialization_seconds * 1000,
+            'view': view * 1000,
+            'total': total * 1000,
+        }
+
+    def server_timing(self, timings: dict[str, float]) -> str:
+        return ', '.join(
+            [
+                f'db;dur={timings["db"]:.1f};desc="{self.queries} queries"',
+                f'serialize;dur={timings["serialize"]:.1f}',
+                f'view;dur={timings["view"]:.1f}',
+                f'total;dur={timings["total"]:.1f}',
+            ]
+        )
+
+
+def _record_query(execute, sql, params, many, context):
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries += 1
+        profile.db_seconds += time.perf_counter() - start
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    Instala o wrapper de medição de queries em cada nova conexão.
+    """
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+class ProfilingJSONRenderer(ORJSONRenderer):
+    """
+    Renderizador JSON (`orjson`) que acumula o tempo de serialização na
+    requisição perfilada.
+    """
+
+    def render(self, request, data, *, response_status):
+        profile = _current_profile.get()
+        if profile is None:
+            return super().render(
+                request, data, response_status=response_status
+            )
+
+        start = time.perf_counter()
+        try:
+            return super().render(
+                request, data, response_status=response_status
+            )
+        finally:
+            profile.serialization_seconds += time.perf_counter() - start
+
+
+def _should_profile(request) -> bool:
+    return (
+        request.path.startswith(PATH_PREFIX)
+        and random.random() < settings.API_PROFILING_SAMPLE_RATE
+    )
+
+
+def _finish(request, response, profile: RequestProfile):
+    timings = profile.timings()
+    response['Server-Timing'] = profile.server_timing(timings)
+
+    if timings['total'] > settings.API_PROFILING_SLOW_MS:
+        logger.warning(
+            f'Requisição lenta {request.method} {request.path} ({response.status_code}): '
+            f'{timings["total"]:.1f}ms no total, {profile.queries} queries em {timings["db"]:.1f}ms, '
+            f'serialização {timings["serialize"]:.1f}ms, view {timings["view"]:.1f}ms'
+        )
+
+
+@sync_and_async_middleware
+def profiling_middleware(get_response):
+    """
+    Perfila uma amostra das requisições da API (ver `API_PROFILING_SAMPLE_RATE`).
+    """
+    connection_created.connect(
+        install_query_recorder, dispatch_uid='api_profiling_query_recorder'
+    )
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(None, connection)
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            if not _should_profile(request):
+                return await get_response(request)
+
+            profile = RequestProfile()
+            token = _current_profile.set(profile)
+            try:
+                response = await get_response(request)
+            finally:
+                _current_profile.reset(token)
+            _finish(request, response, profile)
+            return response
+
+    else:
+
+        def middleware(request):
+            if not _should_profile(request):
+                return get_response(request)
+
+            profile = RequestProfile()
+            token = _current_profile.set(profile)
+            try:
+                response = get_response(request)
+            finally:
+                _current_profile.reset(token)
+            _finish(request, response, profile)
+            return response
+
+    return middleware
@@ -0,0 +1,56 @@
+"""
+Renderizador e parser JSON da API baseados em `orjson`.
+
+O `orjson` serializa as listas grandes (logs de temperatura, alertas) várias
+vezes mais rápido que o `json` da biblioteca padrão usado pelo renderizador
+padrão do Ninja. Diferenças em relação a ele:
+
+* datetimes seguem a RFC 3339 com microssegundos e `Z` para UTC (o encoder do
+  Django trunca em milissegundos);
+* `NaN` e `Infinity` viram `null`, em vez dos literais `NaN`/`Infinity` que
+  não são JSON válido;
+* os demais tipos (Decimal, timedelta, strings traduzíveis, modelos
+  pydantic...) são convertidos pelo `NinjaJSONEncoder`, como antes.
+"""
+
+from typing import Any
+
+import orjson
+from ninja.parser import Parser
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+
+OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_encoder = NinjaJSONEncoder()
+
+
+def _default(o: Any) -> Any:
+    return _encoder.default(o)
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Serializa `data` em JSON com as mesmas regras do renderizador da API.
+    """
+    return orjson.dumps(data, default=_default, option=OPTIONS)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Renderizador JSON da API baseado em `orjson`.
+    """
+
+    media_type = 'application/json'
+
+    def render(self, request, data, *, response_status):
+        return dumps(data)
+
+
+class ORJSONParser(Parser):
+    """
+    Parser do corpo JSON das requisições baseado em `orjson`.
+    """
+
+    def parse_body(self, request):
+        return orjson.loads(request.body)
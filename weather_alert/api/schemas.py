@@ -3,3 +3,16 @@ from ninja import Schema
 
 class MessageSchema(Schema):
     message: str
+
+
+class BulkErrorSchema(Schema):
+    """
+    Erro de um item de uma requisição em lote.
+
+    Attributes:
+        index (int): Posição do item no lote.
+        message (str): Motivo pelo qual o item não foi criado.
+    """
+
+    index: int
+    message: str
@@ -1,6 +1,21 @@
 from django.contrib import admin
 
-from .models import Alert, AlertConfig
+from weather_alert.api.etags import ALERT_CONFIGS, ALERTS, VersionedModelAdmin
 
-admin.site.register(Alert)
-admin.site.register(AlertConfig)
+from .models import Alert, AlertConfig, NotificationOutbox
+
+
+@admin.register(Alert)
+class AlertAdmin(VersionedModelAdmin):
+    collections = (ALERTS,)
+    # __str__ uses the location name
+    list_select_related = ('location',)
+
+
+@admin.register(AlertConfig)
+class AlertConfigAdmin(VersionedModelAdmin):
+    collections = (ALERT_CONFIGS,)
+    list_select_related = ('location',)
+
+
+admin.site.register(NotificationOutbox)
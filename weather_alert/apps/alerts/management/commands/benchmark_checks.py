@@ -0,0 +1,117 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from weather_alert.benchmarks.check_pipeline import (
+    run_check_pipeline_benchmark,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede vazão, latência e queries do pipeline de verificação contra '
+        'servidores locais que simulam o Open-Meteo e o N8N.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--locations', type=int, default=100)
+        parser.add_argument('--configs-per-location', type=int, default=1)
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--temperature', type=float, default=30.0)
+        parser.add_argument(
+            '--forecast-latency-ms',
+            type=float,
+            default=0.0,
+            help='Latência simulada do Open-Meteo, em milissegundos.',
+        )
+        parser.add_argument(
+            '--webhook-latency-ms',
+            type=float,
+            default=0.0,
+            help='Latência simulada do N8N, em milissegundos.',
+        )
+        parser.add_argument(
+            '--use-cache',
+            action='store_true',
+            help='Mantém o cache de temperaturas ativo durante a medição.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--output',
+            default=str(
+                Path(settings.BASE_DIR) / 'benchmarks' / 'check_pipeline.jsonl'
+            ),
+            help='Arquivo JSONL ao qual o resultado é acrescentado.',
+        )
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        previous = self._last_record(output)
+
+        record = run_check_pipeline_benchmark(
+            locations=options['locations'],
+            configs_per_location=options['configs_per_location'],
+            batch_size=options['batch_size'],
+            temperature=options['temperature'],
+            forecast_latency=options['forecast_latency_ms'] / 1000,
+            webhook_latency=options['webhook_latency_ms'] / 1000,
+            use_cache=options['use_cache'],
+            seed=options['seed'],
+        )
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open('a') as f:
+            f.write(json.dumps(record) + '\n')
+
+        self._report(record, previous)
+        self.stdout.write(self.style.SUCCESS(f'Resultado salvo em {output}'))
+
+    @staticmethod
+    def _last_record(output: Path) -> dict | None:
+        """
+        Último resultado registrado no arquivo, usado como base de comparação.
+        """
+        if not output.exists():
+            return None
+        lines = output.read_text().strip().splitlines()
+        return json.loads(lines[-1]) if lines else None
+
+    def _report(self, record: dict, previous: dict | None):
+        self.stdout.write(
+            f"{'cenário':<28}{'ops/s':>12}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'p99 ms':>10}{'queries/op':>12}{'Δ ops/s':>10}"
+        )
+        for name, result in record['results'].items():
+            if 'latency_ms' not in result:
+                continue
+
+            delta = ''
+            baseline = (previous or {}).get('results', {}).get(name)
+            if baseline and baseline['throughput_per_second']:
+                change = (
+                    result['throughput_per_second']
+                    / baseline['throughput_per_second']
+                    - 1
+                ) * 100
+                delta = f'{change:+.1f}%'
+
+            latency = result['latency_ms']
+            self.stdout.write(
+                f"{name:<28}{result['throughput_per_second']:>12.2f}"
+                f"{latency['p50']:>10.2f}{latency['p95']:>10.2f}"
+                f"{latency['p99']:>10.2f}"
+                f"{result['queries_per_operation']:>12.2f}{delta:>10}"
+            )
+
+        upstream = record['results'].get('upstream_requests', {})
+        self.stdout.write(
+            f"Requisições upstream: Open-Meteo={upstream.get('open_meteo', 0)} "
+            f"N8N={upstream.get('n8n', 0)}"
+        )
+        if previous:
+            self.stdout.write(
+                f"Comparado com a execução de {previous['recorded_at']} "
+                f"(versão {previous['version']})"
+            )
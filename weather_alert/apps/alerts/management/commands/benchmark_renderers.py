@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from weather_alert.benchmarks.json_renderer import (
+    RENDERERS,
+    run_json_renderer_benchmark,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara a vazão de serialização das listagens da API entre o '
+        'renderizador JSON padrão do Ninja e o renderizador orjson.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--items',
+            type=int,
+            default=1000,
+            help='Itens por página serializada.',
+        )
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--output',
+            default=str(
+                Path(settings.BASE_DIR) / 'benchmarks' / 'json_renderer.jsonl'
+            ),
+            help='Arquivo JSONL ao qual o resultado é acrescentado.',
+        )
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+
+        record = run_json_renderer_benchmark(
+            items=options['items'],
+            repeat=options['repeat'],
+            seed=options['seed'],
+        )
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open('a') as f:
+            f.write(json.dumps(record) + '\n')
+
+        self._report(record)
+        self.stdout.write(self.style.SUCCESS(f'Resultado salvo em {output}'))
+
+    def _report(self, record: dict):
+        self.stdout.write(
+            f"{'listagem':<24}{'renderizador':<14}{'itens/s':>14}"
+            f"{'p50 ms':>10}{'p99 ms':>10}{'bytes':>12}"
+        )
+        for name, result in record['results'].items():
+            for renderer in RENDERERS:
+                measured = result[renderer]
+                self.stdout.write(
+                    f'{name:<24}{renderer:<14}'
+                    f"{measured['throughput_per_second']:>14.0f}"
+                    f"{measured['latency_ms']['p50']:>10.2f}"
+                    f"{measured['latency_ms']['p99']:>10.2f}"
+                    f"{measured['bytes']:>12}"
+                )
+            self.stdout.write(
+                f"{name:<24}{'ganho':<14}{result['speedup']:>13.2f}x"
+            )
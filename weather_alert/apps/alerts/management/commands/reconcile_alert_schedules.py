@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from weather_alert.apps.alerts.services.alert_config_service import (
+    reconcile_schedules,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Ajusta os PeriodicTasks das verificações de temperatura ao '
+        'ALERT_SCHEDULER_MODE atual. Também roda ao iniciar o Celery Beat.'
+    )
+
+    def handle(self, *args, **options):
+        tasks = reconcile_schedules()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Modo {settings.ALERT_SCHEDULER_MODE}: {tasks} PeriodicTasks de localidade'
+            )
+        )
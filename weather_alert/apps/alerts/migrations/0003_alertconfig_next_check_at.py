@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:06
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0002_alter_alertconfig_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertconfig',
+            name='next_check_at',
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now
+            ),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:09
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0003_alertconfig_next_check_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('payload', models.JSONField()),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('pending', 'Pending'),
+                            ('sent', 'Sent'),
+                            ('failed', 'Failed'),
+                        ],
+                        default='pending',
+                        max_length=10,
+                    ),
+                ),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                (
+                    'next_attempt_at',
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                (
+                    'alert',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='outbox',
+                        to='alerts.alert',
+                    ),
+                ),
+            ],
+            options={
+                'indexes': [
+                    models.Index(
+                        fields=['status', 'next_attempt_at'],
+                        name='alerts_noti_status_2fdc05_idx',
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0004_notificationoutbox'),
+        ('location', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(
+                fields=['location', '-timestamp', '-id'],
+                name='alert_location_ts_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(
+                fields=['-timestamp', '-id'], name='alert_ts_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0005_timestamp_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertconfig',
+            name='last_notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='alertconfig',
+            name='state',
+            field=models.CharField(
+                choices=[('ok', 'Ok'), ('firing', 'Firing')],
+                default='ok',
+                max_length=6,
+            ),
+        ),
+        migrations.AddField(
+            model_name='alertconfig',
+            name='state_changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
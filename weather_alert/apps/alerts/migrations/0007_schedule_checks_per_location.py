@@ -0,0 +1,71 @@
+import json
+
+from django.db import migrations
+from django.db.models import Min
+from django.utils import timezone
+
+CONFIG_TASK_PREFIX = 'Check Temperature for Config '
+
+
+def schedule_checks_per_location(apps, schema_editor):
+    """
+    Troca os PeriodicTasks de cada AlertConfig por um PeriodicTask por
+    localidade, no menor intervalo entre as suas configurações.
+    """
+    AlertConfig = apps.get_model('alerts', 'AlertConfig')
+    IntervalSchedule = apps.get_model('django_celery_beat', 'IntervalSchedule')
+    PeriodicTask = apps.get_model('django_celery_beat', 'PeriodicTask')
+    PeriodicTasks = apps.get_model('django_celery_beat', 'PeriodicTasks')
+
+    config_tasks = PeriodicTask.objects.filter(
+        name__startswith=CONFIG_TASK_PREFIX,
+        task='weather_alert.apps.alerts.tasks.check_temperature',
+    )
+    config_ids = [
+        int(name.removeprefix(CONFIG_TASK_PREFIX))
+        for name in config_tasks.values_list('name', flat=True)
+    ]
+    # installations in sweep mode have no per-config tasks to convert
+    if not config_ids:
+        return
+
+    intervals = (
+        AlertConfig.objects.filter(
+            location_id__in=AlertConfig.objects.filter(
+                id__in=config_ids
+            ).values('location_id')
+        )
+        .values('location_id')
+        .annotate(every=Min('check_interval_minutes'))
+        .order_by()
+    )
+    for row in intervals:
+        schedule, _ = IntervalSchedule.objects.get_or_create(
+            every=row['every'], period='minutes'
+        )
+        PeriodicTask.objects.update_or_create(
+            name=f'Check Temperature for Location {row["location_id"]}',
+            defaults={
+                'interval': schedule,
+                'task': 'weather_alert.apps.alerts.tasks.check_location_temperature',
+                'args': json.dumps([row['location_id']]),
+            },
+        )
+    config_tasks.delete()
+    PeriodicTasks.objects.update_or_create(
+        ident=1, defaults={'last_update': timezone.now()}
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0006_alertconfig_state'),
+        ('django_celery_beat', '0019_alter_periodictasks_options'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            schedule_checks_per_location, migrations.RunPython.noop
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 from weather_alert.apps.location.models import Location
 
@@ -9,6 +10,19 @@ class AlertConfig(models.Model):
     )
     temperature_threshold = models.FloatField()
     check_interval_minutes = models.IntegerField(default=30)
+    # when the config is next due; read by both scheduler modes
+    next_check_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class State(models.TextChoices):
+        OK = 'ok'
+        FIRING = 'firing'
+
+    # alerts are created only on ok -> firing transitions (and re-notifications)
+    state = models.CharField(
+        max_length=6, choices=State.choices, default=State.OK
+    )
+    state_changed_at = models.DateTimeField(null=True, blank=True)
+    last_notified_at = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return f'Config for {self.location.name}'
@@ -23,5 +37,58 @@ class Alert(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
     notified = models.BooleanField(default=False)
 
+    class Meta:
+        # keyset pagination on (timestamp, id), with and without location filter
+        indexes = [
+            models.Index(
+                fields=['location', '-timestamp', '-id'],
+                name='alert_location_ts_idx',
+            ),
+            models.Index(fields=['-timestamp', '-id'], name='alert_ts_idx'),
+        ]
+
     def __str__(self):
         return f'ALERT: {self.location.name} - {self.temperature}°C'
+
+
+class NotificationOutbox(models.Model):
+    """
+    Notificação pendente de envio ao webhook do N8N.
+
+    Gravada na mesma transação do `Alert` e enviada depois pela task
+    `dispatch_notifications`, com novas tentativas e backoff exponencial.
+
+    Attributes:
+        alert (Alert): Alerta a ser notificado.
+        payload (dict): Corpo JSON enviado ao webhook.
+        status (str): Situação do envio (pending, sent ou failed).
+        attempts (int): Quantidade de tentativas de envio realizadas.
+        next_attempt_at (datetime): Momento a partir do qual o envio pode ser tentado.
+        last_error (str): Erro da última tentativa sem sucesso.
+        created_at (datetime): Data e hora de criação.
+        sent_at (datetime): Data e hora do envio bem-sucedido.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending'
+        SENT = 'sent'
+        FAILED = 'failed'
+
+    alert = models.OneToOneField(
+        Alert, on_delete=models.CASCADE, related_name='outbox'
+    )
+    payload = models.JSONField()
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+
+    def __str__(self):
+        return f'Outbox for alert {self.alert_id} ({self.status})'
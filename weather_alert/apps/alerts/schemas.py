@@ -1,6 +1,8 @@
 from typing import Optional
 
-from ninja import ModelSchema, Schema
+from ninja import Field, ModelSchema, Schema
+
+from weather_alert.api.schemas import BulkErrorSchema
 
 from .models import AlertConfig
 from datetime import datetime
@@ -15,6 +17,7 @@ class AlertConfigSchema(ModelSchema):
         location (Location): Localização associada à configuração de alerta.
         temperature_threshold (float): Limite de temperatura para disparo do alerta.
         check_interval_minutes (int): Intervalo em minutos para verificação da temperatura.
+        state (str): Estado atual da configuração (ok ou firing).
     """
 
     class Meta:
@@ -24,9 +27,35 @@ class AlertConfigSchema(ModelSchema):
             'location',
             'temperature_threshold',
             'check_interval_minutes',
+            'state',
         ]
 
 
+class AlertConfigExpandedSchema(Schema):
+    """
+    Schema de saída para configuração de alerta com os dados da localização.
+
+    Attributes:
+        id (int): Identificador único da configuração de alerta.
+        location_id (int): Identificador da localização associada.
+        location_name (str): Nome da localização associada.
+        latitude (float): Latitude da localização.
+        longitude (float): Longitude da localização.
+        temperature_threshold (float): Limite de temperatura para disparo do alerta.
+        check_interval_minutes (int): Intervalo em minutos para verificação da temperatura.
+        state (str): Estado atual da configuração (ok ou firing).
+    """
+
+    id: int
+    location_id: int
+    location_name: str = Field(..., alias='location.name')
+    latitude: float = Field(..., alias='location.latitude')
+    longitude: float = Field(..., alias='location.longitude')
+    temperature_threshold: float
+    check_interval_minutes: int
+    state: str
+
+
 class CreateAlertConfigSchema(Schema):
     """
     Schema de entrada para criação de configuração de alerta.
@@ -56,6 +85,19 @@ class UpdateAlertConfigSchema(Schema):
 
 
 
+class BulkAlertConfigResultSchema(Schema):
+    """
+    Resultado da criação de configurações de alerta em lote.
+
+    Attributes:
+        created (list[AlertConfigSchema]): Configurações criadas, na ordem do lote.
+        errors (list[BulkErrorSchema]): Itens recusados e o motivo.
+    """
+
+    created: list[AlertConfigSchema]
+    errors: list[BulkErrorSchema]
+
+
 class AlertSchema(Schema):
     """
     Schema de saída para alerta.
@@ -1,11 +1,153 @@
 import json
+from collections.abc import Iterable
+from datetime import timedelta
 
-from django_celery_beat.models import IntervalSchedule, PeriodicTask
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+from django_celery_beat.models import (
+    IntervalSchedule,
+    PeriodicTask,
+    PeriodicTasks,
+)
 
+from weather_alert.api.etags import (
+    ALERT_CONFIGS,
+    abump_versions,
+    bump_versions,
+)
 from weather_alert.apps.alerts.models import AlertConfig
 from weather_alert.apps.location.models import Location
 
 
+CHECK_LOCATION_TASK = (
+    'weather_alert.apps.alerts.tasks.check_location_temperature'
+)
+
+
+def uses_sweep_scheduler() -> bool:
+    """
+    Indica se as verificações são agendadas pela task de varredura única
+    (`next_check_at`) em vez de um PeriodicTask por localidade.
+    """
+    return settings.ALERT_SCHEDULER_MODE == 'sweep'
+
+
+def location_task_name(location_id: int) -> str:
+    """
+    Nome do PeriodicTask que verifica a localidade.
+    """
+    return f'Check Temperature for Location {location_id}'
+
+
+def schedule_locations(location_ids: Iterable[int]):
+    """
+    Sincroniza o PeriodicTask de cada localidade com suas configurações de
+    alerta.
+
+    Cada localidade com configurações tem um único PeriodicTask que chama
+    `check_location_temperature` no menor intervalo entre elas; localidades
+    sem configurações perdem o seu. No modo de varredura não faz nada.
+
+    Args:
+        location_ids (Iterable[int]): Localidades cujas configurações mudaram.
+    """
+    location_ids = set(location_ids)
+    if uses_sweep_scheduler() or not location_ids:
+        return
+
+    intervals = dict(
+        AlertConfig.objects.filter(location_id__in=location_ids)
+        .values('location_id')
+        .annotate(every=Min('check_interval_minutes'))
+        .values_list('location_id', 'every')
+        .order_by()
+    )
+    tasks = {
+        task.name: task
+        for task in PeriodicTask.objects.filter(
+            name__in=[location_task_name(i) for i in location_ids]
+        )
+    }
+    schedules = {
+        schedule.every: schedule
+        for schedule in IntervalSchedule.objects.filter(
+            every__in=set(intervals.values()),
+            period=IntervalSchedule.MINUTES,
+        )
+    }
+
+    created, updated, deleted = [], [], []
+    for location_id in sorted(location_ids):
+        task = tasks.get(location_task_name(location_id))
+        every = intervals.get(location_id)
+        if every is None:
+            if task:
+                deleted.append(task.id)
+            continue
+
+        if every not in schedules:
+            schedules[every], _ = IntervalSchedule.objects.get_or_create(
+                every=every, period=IntervalSchedule.MINUTES
+            )
+        if task is None:
+            created.append(
+                PeriodicTask(
+                    interval=schedules[every],
+                    name=location_task_name(location_id),
+                    task=CHECK_LOCATION_TASK,
+                    args=json.dumps([location_id]),
+                )
+            )
+        elif task.interval_id != schedules[every].id:
+            task.interval = schedules[every]
+            updated.append(task)
+
+    if not (created or updated or deleted):
+        return
+    with transaction.atomic():
+        PeriodicTask.objects.bulk_create(created)
+        PeriodicTask.objects.bulk_update(updated, ['interval'])
+        PeriodicTask.objects.filter(id__in=deleted).delete()
+        # bulk operations skip PeriodicTask.save(), which is what tells the
+        # beat scheduler to reload its schedule
+        PeriodicTasks.update_changed()
+
+
+def reconcile_schedules() -> int:
+    """
+    Ajusta os PeriodicTasks das verificações ao `ALERT_SCHEDULER_MODE` atual.
+
+    `schedule_locations` só roda quando as configurações são gravadas, então
+    trocar de modo não altera os agendamentos existentes. No modo de
+    varredura os PeriodicTasks das localidades são removidos, para que
+    nenhuma localidade seja verificada duas vezes; no modo `periodic_task`
+    eles são recriados para todas as localidades com configurações.
+
+    Returns:
+        int: Quantidade de PeriodicTasks de localidade ao final.
+    """
+    tasks = PeriodicTask.objects.filter(task=CHECK_LOCATION_TASK)
+    if uses_sweep_scheduler():
+        with transaction.atomic():
+            deleted, _ = tasks.delete()
+            if deleted:
+                PeriodicTasks.update_changed()
+        return 0
+
+    location_ids = set(
+        AlertConfig.objects.values_list('location_id', flat=True).distinct()
+    )
+    # tasks left behind by locations that no longer have configs
+    location_ids.update(
+        json.loads(args)[0] for args in tasks.values_list('args', flat=True)
+    )
+    schedule_locations(location_ids)
+    return tasks.count()
+
+
 class AlertConfigService:
     @staticmethod
     async def create_alert_config_and_schedule_task(
@@ -14,7 +156,12 @@ class AlertConfigService:
         check_interval_minutes: int = 30,
     ) -> AlertConfig:
         """
-        Cria um AlertConfig e agenda sua task periódica no Celery Beat.
+        Cria um AlertConfig e ajusta o PeriodicTask da sua localidade no
+        Celery Beat (ver `schedule_locations`).
+
+        No modo de varredura (`ALERT_SCHEDULER_MODE = 'sweep'`) apenas o
+        `next_check_at` é definido, para que a próxima varredura verifique a
+        configuração.
 
         Args:
             location (Location): Localização associada ao AlertConfig.
@@ -28,21 +175,35 @@ class AlertConfigService:
             location=location,
             temperature_threshold=temperature_threshold,
             check_interval_minutes=check_interval_minutes,
+            next_check_at=timezone.now(),
         )
+        await abump_versions(ALERT_CONFIGS)
+        await sync_to_async(schedule_locations)([alert_config.location_id])
 
-        schedule, _ = await IntervalSchedule.objects.aget_or_create(
-            every=alert_config.check_interval_minutes,
-            period=IntervalSchedule.MINUTES,
-        )
+        return alert_config
 
-        await PeriodicTask.objects.acreate(
-            interval=schedule,
-            name=f'Check Temperature for Config {alert_config.id}',
-            task='weather_alert.apps.alerts.tasks.check_temperature',
-            args=json.dumps([alert_config.id]),
-        )
+    @staticmethod
+    async def bulk_create_alert_configs_and_schedule_tasks(
+        items: list[dict],
+    ) -> tuple[list[AlertConfig], list[dict]]:
+        """
+        Cria várias configurações de alerta em uma única transação, com
+        `bulk_create`, e ajusta os PeriodicTasks das localidades do lote.
 
-        return alert_config
+        As localidades do lote são buscadas em uma única query e cada
+        intervalo distinto resolve seu `IntervalSchedule` uma única vez.
+        Itens inválidos (localidade inexistente, intervalo menor que 1) são
+        reportados sem impedir a criação dos demais.
+
+        Args:
+            items (list[dict]): Itens com `location`, `temperature_threshold`
+                e `check_interval_minutes`.
+
+        Returns:
+            tuple[list[AlertConfig], list[dict]]: Configurações criadas e os
+            erros de cada item recusado (`index` e `message`).
+        """
+        return await sync_to_async(_bulk_create_alert_configs)(items)
 
     @staticmethod
     async def update_alert_config_and_schedule_task(
@@ -51,7 +212,8 @@ class AlertConfigService:
         check_interval_minutes: int = None,
     ) -> AlertConfig:
         """
-        Atualiza o AlertConfig e seu respectivo PeriodicTask.
+        Atualiza o AlertConfig e, se o intervalo mudou, reprograma o seu
+        `next_check_at` e o PeriodicTask da sua localidade.
 
         Args:
             alert_config (AlertConfig): A configuração de alerta a ser atualizada.
@@ -62,6 +224,7 @@ class AlertConfigService:
             AlertConfig: A configuração de alerta atualizada.
         """
         updated = False
+        interval_changed = False
 
         if temperature_threshold is not None:
             alert_config.temperature_threshold = temperature_threshold
@@ -72,29 +235,28 @@ class AlertConfigService:
             and check_interval_minutes != alert_config.check_interval_minutes
         ):
             alert_config.check_interval_minutes = check_interval_minutes
+            alert_config.next_check_at = timezone.now() + timedelta(
+                minutes=check_interval_minutes
+            )
             updated = True
+            interval_changed = True
 
         if updated:
             await alert_config.asave()
+            await abump_versions(ALERT_CONFIGS)
 
-            schedule, _ = await IntervalSchedule.objects.aget_or_create(
-                every=alert_config.check_interval_minutes,
-                period=IntervalSchedule.MINUTES,
-            )
-
-            periodic_task = await PeriodicTask.objects.select_related(
-                'interval'
-            ).aget(name=f'Check Temperature for Config {alert_config.id}')
-            periodic_task.interval = schedule
-            periodic_task.args = json.dumps([alert_config.id])
-            await periodic_task.asave()
+        if interval_changed:
+            await sync_to_async(schedule_locations)([alert_config.location_id])
 
         return alert_config
 
     @staticmethod
     async def delete_alert_config_and_schedule_task(alert_config: AlertConfig):
         """
-        Remove o AlertConfig e seu PeriodicTask associado.
+        Remove o AlertConfig e ajusta o PeriodicTask da sua localidade, que é
+        removido junto com a última configuração.
+
+        No modo de varredura não há PeriodicTask, apenas o AlertConfig é removido.
 
         Args:
             alert_config (AlertConfig): A configuração de alerta a ser removida.
@@ -102,12 +264,52 @@ class AlertConfigService:
         Raises:
             AlertConfig.DoesNotExist: Se a configuração de alerta não existir.
         """
-        try:
-            periodic_task = await PeriodicTask.objects.aget(
-                name=f'Check Temperature for Config {alert_config.id}'
+        location_id = alert_config.location_id
+        await alert_config.adelete()
+        await abump_versions(ALERT_CONFIGS)
+        await sync_to_async(schedule_locations)([location_id])
+
+
+def _bulk_create_alert_configs(
+    items: list[dict],
+) -> tuple[list[AlertConfig], list[dict]]:
+    location_ids = set(
+        Location.objects.filter(
+            id__in={item['location'] for item in items}
+        ).values_list('id', flat=True)
+    )
+
+    alert_configs = []
+    errors = []
+    now = timezone.now()
+    for index, item in enumerate(items):
+        if item['location'] not in location_ids:
+            errors.append(
+                {'index': index, 'message': 'Localidade não encontrada'}
+            )
+        elif item['check_interval_minutes'] < 1:
+            errors.append(
+                {
+                    'index': index,
+                    'message': 'Intervalo deve ser de pelo menos 1 minuto',
+                }
+            )
+        else:
+            alert_configs.append(
+                AlertConfig(
+                    location_id=item['location'],
+                    temperature_threshold=item['temperature_threshold'],
+                    check_interval_minutes=item['check_interval_minutes'],
+                    next_check_at=now,
+                )
             )
-            await periodic_task.adelete()
-        except PeriodicTask.DoesNotExist:
-            pass
 
-        await alert_config.adelete()
+    if not alert_configs:
+        return [], errors
+
+    with transaction.atomic():
+        alert_configs = AlertConfig.objects.bulk_create(alert_configs)
+        schedule_locations(c.location_id for c in alert_configs)
+        bump_versions(ALERT_CONFIGS)
+
+    return alert_configs, errors
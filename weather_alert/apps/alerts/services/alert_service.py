@@ -1,18 +1,43 @@
-from datetime import datetime
+import asyncio
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from functools import partial
 
 import httpx
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from loguru import logger
 
-from weather_alert.apps.alerts.models import Alert, AlertConfig
+from weather_alert.api.etags import ALERT_CONFIGS, ALERTS, bump_versions
+from weather_alert.apps.alerts.models import (
+    Alert,
+    AlertConfig,
+    NotificationOutbox,
+)
+from weather_alert.apps.alerts.services.alert_stream import publish_alert
 from weather_alert.apps.location.models import Location
+from weather_alert.integrations.http_client import (
+    get_async_client,
+    run_async,
+)
+from weather_alert.metrics import (
+    ALERTS_CREATED,
+    N8N_WEBHOOK_SECONDS,
+    NOTIFICATIONS,
+    observe_latency,
+)
 
 
 def create_alert_and_notify(
     location: Location, temperature: float, alert_config: AlertConfig
 ):
     """
-    Cria um alerta e notifica via webhook do N8N.
+    Cria um alerta e enfileira sua notificação para o webhook do N8N.
+
+    O alerta e a entrada no outbox são gravados na mesma transação; o envio é
+    feito pela task `dispatch_notifications`, fora da verificação. Após o
+    commit o alerta é publicado no stream de alertas (`/api/alerts/stream/`).
 
     Args:
         location (Location): Localização associada ao alerta.
@@ -20,50 +45,285 @@ def create_alert_and_notify(
         alert_config (AlertConfig): Configuração de alerta associada.
 
     Returns:
-        Alert: O alerta criado e notificado.
+        Alert: O alerta criado.
     """
-    alert = Alert.objects.create(
-        location=location,
-        temperature=temperature,
-        threshold=alert_config.temperature_threshold,
-    )
-
-    payload = {
-        'alert_id': alert.id,
-        'location': location.name,
-        'temperature': temperature,
-        'threshold': alert_config.temperature_threshold,
-        'timestamp': datetime.now().strftime('%d/%m/%Y %H:%M:%S'),
-    }
-
-    logger.info(
-        f'Enviando notificação para N8N webhook (alert_id={alert.id})...'
-    )
-
     if settings.FAKE_WEBHOOK:
+        alert = Alert.objects.create(
+            location=location,
+            temperature=temperature,
+            threshold=alert_config.temperature_threshold,
+        )
         logger.warning(
             f'Modo FAKE_WEBHOOK ativo. Simulando notificação para alerta ID {alert.id}'
         )
         alert.notified = True
         alert.save(update_fields=['notified'])
+        transaction.on_commit(ALERTS_CREATED.inc)
+        transaction.on_commit(partial(publish_alert, alert))
+        bump_versions(ALERTS)
         return alert
 
-    try:
-        response = httpx.post(
-            settings.N8N_WEBHOOK_URL,
-            json=payload,
-            headers={'N8N_WEBHOOK_KEY': settings.N8N_WEBHOOK_HEADER_KEY},
-        )
-        response.raise_for_status()
-        logger.success(
-            f'Notificação enviada com sucesso para N8N (alert_id={alert.id})'
+    with transaction.atomic():
+        alert = Alert.objects.create(
+            location=location,
+            temperature=temperature,
+            threshold=alert_config.temperature_threshold,
         )
-    except httpx.HTTPStatusError:
-        logger.error(
-            f'Falha ao notificar N8N para alerta ID {alert.id} - status: {response.status_code} - resposta: {response.text}'
+        NotificationOutbox.objects.create(
+            alert=alert,
+            payload={
+                'alert_id': alert.id,
+                'location': location.name,
+                'temperature': temperature,
+                'threshold': alert_config.temperature_threshold,
+                'timestamp': datetime.now().strftime('%d/%m/%Y %H:%M:%S'),
+            },
         )
+        transaction.on_commit(ALERTS_CREATED.inc)
+        transaction.on_commit(partial(publish_alert, alert))
+        bump_versions(ALERTS)
+        transaction.on_commit(_trigger_dispatch)
 
     logger.success(
-        f"Alerta criado e notificação enviada para localidade '{location}' (ID: {location.id})"
+        f"Alerta criado e notificação enfileirada para localidade '{location}' (ID: {location.id})"
     )
     return alert
+
+
+def advance_alert_state(
+    alert_config: AlertConfig, temperature: float, now: datetime = None
+) -> str | None:
+    """
+    Atualiza o estado (ok/firing) da configuração de alerta com uma nova leitura.
+
+    A configuração passa a `firing` quando a temperatura excede o limite e só
+    volta a `ok` quando cai para `limite - ALERT_HYSTERESIS`. Enquanto estiver
+    em `firing`, uma nova notificação é devida a cada `ALERT_RENOTIFY_MINUTES`
+    (0 desativa). Cada transição é um `UPDATE` condicionado ao estado atual,
+    de modo que verificações concorrentes da mesma configuração não disparam
+    o alerta duas vezes.
+
+    Args:
+        alert_config (AlertConfig): Configuração de alerta verificada.
+        temperature (float): Temperatura lida.
+        now (datetime, optional): Momento da leitura. Padrão: agora.
+
+    Returns:
+        str | None: `fired` ou `renotify` quando um alerta deve ser criado,
+        `resolved` quando a configuração volta a `ok` e `None` caso contrário.
+    """
+    now = now or timezone.now()
+    threshold = alert_config.temperature_threshold
+    configs = AlertConfig.objects.filter(id=alert_config.id)
+
+    if temperature > threshold:
+        if configs.filter(state=AlertConfig.State.OK).update(
+            state=AlertConfig.State.FIRING,
+            state_changed_at=now,
+            last_notified_at=now,
+        ):
+            alert_config.state = AlertConfig.State.FIRING
+            alert_config.state_changed_at = now
+            alert_config.last_notified_at = now
+            bump_versions(ALERT_CONFIGS)
+            return 'fired'
+
+        renotify = settings.ALERT_RENOTIFY_MINUTES
+        if renotify > 0 and configs.filter(
+            state=AlertConfig.State.FIRING,
+            last_notified_at__lte=now - timedelta(minutes=renotify),
+        ).update(last_notified_at=now):
+            alert_config.last_notified_at = now
+            return 'renotify'
+
+    elif temperature <= threshold - settings.ALERT_HYSTERESIS:
+        if configs.filter(state=AlertConfig.State.FIRING).update(
+            state=AlertConfig.State.OK, state_changed_at=now
+        ):
+            alert_config.state = AlertConfig.State.OK
+            alert_config.state_changed_at = now
+            bump_versions(ALERT_CONFIGS)
+            return 'resolved'
+
+    return None
+
+
+def partition_alert_configs(
+    alert_configs: list[AlertConfig], temperature: float
+) -> tuple[list[AlertConfig], list[AlertConfig]]:
+    """
+    Separa as configurações de uma localidade que podem mudar de estado com a
+    leitura, por busca binária nos limites.
+
+    Args:
+        alert_configs (list[AlertConfig]): Configurações da localidade em ordem
+            crescente de `temperature_threshold`.
+        temperature (float): Temperatura lida.
+
+    Returns:
+        tuple[list[AlertConfig], list[AlertConfig]]: As configurações com o
+        limite excedido e as que estão abaixo de `limite - ALERT_HYSTERESIS`.
+        As demais não mudam de estado com esta leitura.
+    """
+    thresholds = [c.temperature_threshold for c in alert_configs]
+    exceeded = alert_configs[: bisect_left(thresholds, temperature)]
+    cleared = alert_configs[
+        bisect_left(thresholds, temperature + settings.ALERT_HYSTERESIS) :
+    ]
+    return exceeded, cleared
+
+
+def _trigger_dispatch():
+    """
+    Agenda o envio imediato do outbox. Se o broker estiver indisponível, a
+    execução periódica de `dispatch_notifications` envia a notificação depois.
+    """
+    if not settings.N8N_OUTBOX_DISPATCH_ON_COMMIT:
+        return
+
+    from weather_alert.apps.alerts.tasks import dispatch_notifications
+
+    try:
+        dispatch_notifications.delay()
+    except Exception as e:
+        logger.warning(f'Não foi possível agendar o envio do outbox: {e}')
+
+
+def dispatch_pending_notifications(batch_size: int = None) -> dict[str, int]:
+    """
+    Envia ao N8N um lote de notificações pendentes do outbox.
+
+    As entradas vencidas são reservadas com `SELECT ... FOR UPDATE SKIP LOCKED`
+    e têm o `next_attempt_at` adiado pelo tempo de reserva, para que
+    dispatchers concorrentes não as enviem em duplicidade. Os envios são
+    feitos de forma concorrente, limitados por `N8N_OUTBOX_CONCURRENCY`. Em
+    caso de sucesso o alerta é marcado como notificado; em caso de falha a
+    tentativa é reagendada com backoff exponencial até `N8N_OUTBOX_MAX_ATTEMPTS`.
+
+    Args:
+        batch_size (int, optional): Máximo de notificações enviadas.
+            Padrão: `N8N_OUTBOX_BATCH_SIZE`.
+
+    Returns:
+        dict[str, int]: Quantidade de notificações `sent`, `retried` e `failed`.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        entries = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=NotificationOutbox.Status.PENDING,
+                next_attempt_at__lte=now,
+            )
+            .order_by('next_attempt_at')[
+                : batch_size or settings.N8N_OUTBOX_BATCH_SIZE
+            ]
+        )
+        NotificationOutbox.objects.filter(
+            id__in=[entry.id for entry in entries]
+        ).update(
+            next_attempt_at=now
+            + timedelta(seconds=settings.N8N_OUTBOX_LEASE_SECONDS)
+        )
+
+    result = {'sent': 0, 'retried': 0, 'failed': 0}
+    if not entries:
+        return result
+
+    errors = run_async(_send_notifications(entries))
+    now = timezone.now()
+
+    for entry, error in zip(entries, errors):
+        entry.attempts += 1
+
+        if error is None:
+            entry.status = NotificationOutbox.Status.SENT
+            entry.sent_at = now
+            entry.last_error = ''
+            result['sent'] += 1
+            continue
+
+        entry.last_error = error
+        if entry.attempts >= settings.N8N_OUTBOX_MAX_ATTEMPTS:
+            entry.status = NotificationOutbox.Status.FAILED
+            result['failed'] += 1
+            logger.error(
+                f'Notificação do alerta ID {entry.alert_id} descartada após {entry.attempts} tentativas: {error}'
+            )
+        else:
+            entry.next_attempt_at = now + _retry_delay(entry.attempts)
+            result['retried'] += 1
+            logger.warning(
+                f'Falha ao notificar N8N para alerta ID {entry.alert_id} (tentativa {entry.attempts}): {error}'
+            )
+
+    with transaction.atomic():
+        NotificationOutbox.objects.bulk_update(
+            entries,
+            ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'],
+        )
+        Alert.objects.filter(
+            id__in=[
+                entry.alert_id
+                for entry in entries
+                if entry.status == NotificationOutbox.Status.SENT
+            ]
+        ).update(notified=True)
+        if result['sent']:
+            bump_versions(ALERTS)
+
+    for key, count in result.items():
+        NOTIFICATIONS.labels(result=key).inc(count)
+    logger.info(
+        f"Outbox N8N: {result['sent']} enviadas, {result['retried']} reagendadas, {result['failed']} descartadas"
+    )
+    return result
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    """
+    Calcula o backoff exponencial da próxima tentativa.
+    """
+    seconds = settings.N8N_OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(
+        seconds=min(seconds, settings.N8N_OUTBOX_RETRY_MAX_SECONDS)
+    )
+
+
+async def _send_notifications(
+    entries: list[NotificationOutbox],
+) -> list[str | None]:
+    """
+    Envia as notificações concorrentemente.
+
+    Returns:
+        list[str | None]: Erro de cada envio, na ordem das entradas
+        (`None` quando o envio teve sucesso).
+    """
+    semaphore = asyncio.Semaphore(settings.N8N_OUTBOX_CONCURRENCY)
+    client = get_async_client('n8n')
+
+    async def send(entry: NotificationOutbox) -> str | None:
+        async with semaphore:
+            try:
+                with observe_latency(N8N_WEBHOOK_SECONDS):
+                    response = await client.post(
+                        settings.N8N_WEBHOOK_URL,
+                        json=entry.payload,
+                        headers={
+                            'N8N_WEBHOOK_KEY': settings.N8N_WEBHOOK_HEADER_KEY
+                        },
+                    )
+                    response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                return f'status {e.response.status_code}: {e.response.text}'
+            except httpx.HTTPError as e:
+                return repr(e)
+
+        logger.success(
+            f'Notificação enviada com sucesso para N8N (alert_id={entry.alert_id})'
+        )
+        return None
+
+    return await asyncio.gather(*(send(entry) for entry in entries))
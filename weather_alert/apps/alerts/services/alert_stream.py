@@ -0,0 +1,186 @@
+"""
+Transmissão dos alertas novos por Server-Sent Events.
+
+Cada alerta criado é publicado, após o commit, no canal `CHANNEL` do Redis de
+`REDIS_URL`. O endpoint `GET /api/alerts/stream/` assina o canal com
+`redis.asyncio` e repassa cada mensagem ao navegador, que recebe apenas os
+alertas novos em vez de recarregar a listagem inteira.
+
+Sem `REDIS_URL` (ou com o Redis fora do ar na publicação) os alertas chegam
+apenas aos assinantes do mesmo processo, o que basta para desenvolvimento
+local, mas não para o worker do Celery falar com o servidor web.
+"""
+
+import asyncio
+import json
+import threading
+from collections.abc import AsyncIterator
+
+import redis
+import redis.asyncio
+from django.conf import settings
+from loguru import logger
+
+from weather_alert.apps.alerts.models import Alert
+from weather_alert.apps.alerts.schemas import AlertSchema
+
+CHANNEL = 'weather_alert:alerts'
+
+_lock = threading.Lock()
+_clients: dict[str, redis.Redis] = {}
+# in-process subscribers: queue and the event loop that owns it
+_local_subscribers: set[
+    tuple[asyncio.Queue, asyncio.AbstractEventLoop]
+] = set()
+
+
+def serialize_alert(alert: Alert) -> str:
+    """
+    Alerta no mesmo formato JSON da listagem `/api/alerts/`.
+    """
+    return AlertSchema(
+        id=alert.id,
+        location_id=alert.location.id,
+        location_name=alert.location.name,
+        temperature=alert.temperature,
+        threshold=alert.threshold,
+        timestamp=alert.timestamp,
+        notified=alert.notified,
+    ).model_dump_json()
+
+
+def _redis_client() -> redis.Redis:
+    with _lock:
+        client = _clients.get(settings.REDIS_URL)
+        if client is None:
+            client = _clients[settings.REDIS_URL] = redis.Redis.from_url(
+                settings.REDIS_URL, socket_timeout=1, socket_connect_timeout=1
+            )
+        return client
+
+
+def _publish_local(message: str):
+    for queue, loop in list(_local_subscribers):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, message)
+        except RuntimeError:
+            # the subscriber's loop was closed without unsubscribing
+            _local_subscribers.discard((queue, loop))
+
+
+def publish_alert(alert: Alert):
+    """
+    Publica o alerta para os assinantes do stream.
+
+    Deve ser chamada após o commit da transação que criou o alerta (ver
+    `transaction.on_commit`), para que nenhum assinante receba um alerta
+    desfeito por rollback. Falhas do Redis são registradas e não interrompem a
+    verificação.
+    """
+    message = serialize_alert(alert)
+    if settings.REDIS_URL:
+        try:
+            _redis_client().publish(CHANNEL, message)
+            return
+        except redis.RedisError as e:
+            logger.warning(
+                f'Redis indisponível, alerta ID {alert.id} publicado apenas neste processo: {e}'
+            )
+    _publish_local(message)
+
+
+async def _subscribe_redis(heartbeat: float) -> AsyncIterator[str | None]:
+    client = redis.asyncio.Redis.from_url(settings.REDIS_URL)
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(CHANNEL)
+        yield None
+        while True:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=heartbeat
+            )
+            yield message['data'].decode() if message else None
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
+
+
+async def _subscribe_local(heartbeat: float) -> AsyncIterator[str | None]:
+    subscriber = (asyncio.Queue(), asyncio.get_running_loop())
+    _local_subscribers.add(subscriber)
+    try:
+        yield None
+        while True:
+            try:
+                yield await asyncio.wait_for(subscriber[0].get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+    finally:
+        _local_subscribers.discard(subscriber)
+
+
+def subscribe(heartbeat: float) -> AsyncIterator[str | None]:
+    """
+    Assina os alertas publicados, devolvendo cada um já serializado em JSON.
+
+    O primeiro valor é sempre `None`, devolvido assim que a assinatura está
+    ativa: alertas publicados a partir daí não são perdidos.
+
+    Args:
+        heartbeat (float): Segundos sem mensagens após os quais `None` é
+            devolvido, para que a conexão seja mantida viva.
+
+    Returns:
+        AsyncIterator[str | None]: Alertas serializados, ou `None` a cada
+        intervalo sem mensagens.
+    """
+    if settings.REDIS_URL:
+        return _subscribe_redis(heartbeat)
+    return _subscribe_local(heartbeat)
+
+
+def _event(alert_id: int, message: str) -> str:
+    return f'id: {alert_id}\nevent: alert\ndata: {message}\n\n'
+
+
+async def event_stream(last_event_id: int | None = None) -> AsyncIterator[str]:
+    """
+    Eventos SSE dos alertas novos, com um comentário a cada
+    `ALERT_STREAM_HEARTBEAT_SECONDS` sem alertas.
+
+    Cada evento leva o ID do alerta, que o navegador reenvia em
+    `Last-Event-ID` ao reconectar; nesse caso os alertas criados durante a
+    desconexão (até `API_MAX_PAGE_SIZE`) são enviados antes dos novos.
+
+    Args:
+        last_event_id (int, opcional): ID do último alerta recebido.
+
+    Returns:
+        AsyncIterator[str]: Eventos no formato `text/event-stream`.
+    """
+    stream = subscribe(settings.ALERT_STREAM_HEARTBEAT_SECONDS)
+    try:
+        # subscribe before replaying, so nothing created meanwhile is missed
+        await anext(stream)
+        yield ': connected\n\n'
+
+        replayed = set()
+        if last_event_id is not None:
+            queryset = (
+                Alert.objects.select_related('location')
+                .filter(id__gt=last_event_id)
+                .order_by('id')[: settings.API_MAX_PAGE_SIZE]
+            )
+            async for alert in queryset:
+                replayed.add(alert.id)
+                yield _event(alert.id, serialize_alert(alert))
+
+        async for message in stream:
+            if message is None:
+                yield ': keep-alive\n\n'
+                continue
+            alert_id = json.loads(message)['id']
+            if alert_id not in replayed:
+                yield _event(alert_id, message)
+    finally:
+        await stream.aclose()
@@ -1,64 +1,341 @@
+from collections import defaultdict
+from datetime import timedelta
+
+import httpx
 from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from loguru import logger
 
 from weather_alert.apps.alerts.models import Alert, AlertConfig
 from weather_alert.apps.alerts.services.alert_service import (
+    advance_alert_state,
     create_alert_and_notify,
+    dispatch_pending_notifications,
+    partition_alert_configs,
+)
+from weather_alert.apps.location.models import Location
+from weather_alert.apps.temperature.services.temperature_log_buffer import (
+    temperature_log_buffer,
+)
+from weather_alert.integrations.circuit_breaker import CircuitOpen
+from weather_alert.integrations.http_client import run_async
+from weather_alert.integrations.openmeteo import (
+    aget_current_temperatures,
+    get_current_temperature,
+    get_stale_temperature,
 )
-from weather_alert.apps.temperature.models import TemperatureLog
-from weather_alert.integrations.openmeteo import get_current_temperature
+from weather_alert.integrations.rate_limiter import RateLimited
 
 
-@shared_task
-def check_temperature(alert_config_id: int):
+def _read_temperature(location) -> tuple[float, bool]:
     """
-    Verifica a temperatura atual e cria um alerta se necessário.
+    Obtém a leitura atual da localidade ou, se o Open-Meteo estiver
+    indisponível (circuito aberto, limite de requisições ou erro HTTP), a
+    última leitura conhecida dentro de `OPENMETEO_STALE_MAX_AGE`.
 
-    Args:
-        alert_config_id (int): ID da configuração de alerta a ser verificada.
+    Leituras desatualizadas não geram log de temperatura, apenas avaliam os
+    alertas.
+
+    Returns:
+        tuple[float, bool]: Temperatura e se a leitura está desatualizada.
 
     Raises:
-        Exception: Se a configuração de alerta com o ID fornecido não for encontrada.
+        CircuitOpen, RateLimited, httpx.HTTPError: Se a leitura falhar e não
+            houver leitura conhecida para a localidade.
+    """
+    try:
+        return (
+            get_current_temperature(location.latitude, location.longitude),
+            False,
+        )
+    except (CircuitOpen, RateLimited, httpx.HTTPError) as e:
+        stale = get_stale_temperature(location.latitude, location.longitude)
+        if stale is None:
+            raise
+        temperature, age = stale
+        logger.warning(
+            f"Open-Meteo indisponível ({e!r}), usando leitura desatualizada de {age:.0f}s para localidade '{location}' (ID: {location.id})"
+        )
+        return temperature, True
+
+
+def _evaluate_temperature(alert_config, location, temperature: float):
+    """
+    Atualiza o estado da configuração com a leitura e cria o alerta apenas na
+    transição para `firing` ou quando uma nova notificação é devida.
+    """
+    with transaction.atomic():
+        transition = advance_alert_state(alert_config, temperature)
+        if transition in ('fired', 'renotify'):
+            logger.warning(
+                f"Temperatura {temperature}°C excedeu o limite de {alert_config.temperature_threshold}°C para localidade '{location}' (ID: {location.id})"
+            )
+            create_alert_and_notify(
+                location=location,
+                temperature=temperature,
+                alert_config=alert_config,
+            )
+            return
+
+    if transition == 'resolved':
+        logger.info(
+            f"Temperatura normalizada para localidade '{location}' (ID: {location.id}) - AlertConfig ID {alert_config.id} voltou ao estado ok."
+        )
+    elif alert_config.state == AlertConfig.State.FIRING:
+        logger.info(
+            f"AlertConfig ID {alert_config.id} segue em alerta para localidade '{location}' (ID: {location.id}) - Nenhum novo alerta gerado."
+        )
+    else:
+        logger.info(
+            f"Temperatura dentro do limite para localidade '{location}' (ID: {location.id}) - Nenhum alerta gerado."
+        )
+
+
+def _evaluate_location(location, temperature: float, alert_configs):
+    """
+    Avalia todas as configurações de uma localidade contra uma única leitura.
+
+    As configurações devem estar em ordem crescente de limite; apenas as que
+    podem mudar de estado com a leitura (ver `partition_alert_configs`) são
+    atualizadas no banco.
     """
+    exceeded, cleared = partition_alert_configs(alert_configs, temperature)
+    renotify = settings.ALERT_RENOTIFY_MINUTES > 0
+
+    for alert_config in exceeded:
+        if alert_config.state == AlertConfig.State.OK or renotify:
+            _evaluate_temperature(alert_config, location, temperature)
+    for alert_config in cleared:
+        if alert_config.state == AlertConfig.State.FIRING:
+            _evaluate_temperature(alert_config, location, temperature)
+
     logger.info(
-        f'Iniciando verificação de temperatura para AlertConfig ID {alert_config_id}'
+        f"{len(alert_configs)} configurações avaliadas para localidade '{location}' (ID: {location.id}), {len(exceeded)} acima do limite"
     )
 
+
+@shared_task
+def check_location_temperature(location_id: int) -> int:
+    """
+    Verifica a temperatura de uma localidade e avalia as suas configurações de
+    alerta vencidas com uma única leitura e um único log.
+
+    Agendada por um PeriodicTask por localidade no modo `periodic_task` (ver
+    `schedule_locations`), no menor intervalo entre as configurações. Cada
+    configuração continua sendo avaliada no seu próprio
+    `check_interval_minutes`: apenas as com `next_check_at` vencido (com
+    tolerância de meio intervalo da task) são avaliadas, e o `next_check_at`
+    delas é avançado pelo seu intervalo.
+
+    Args:
+        location_id (int): ID da localidade a ser verificada.
+
+    Returns:
+        int: Quantidade de configurações avaliadas.
+
+    Raises:
+        Exception: Se a localidade com o ID fornecido não for encontrada.
+    """
     try:
-        alert_config = AlertConfig.objects.get(id=alert_config_id)
-    except AlertConfig.DoesNotExist:
-        logger.error(f'AlertConfig ID {alert_config_id} não encontrada')
+        location = Location.objects.get(id=location_id)
+    except Location.DoesNotExist:
+        logger.error(f'Localidade ID {location_id} não encontrada')
         raise Exception(
-            f'Não foi encontrado nenhum alerta com id {alert_config_id}'
+            f'Não foi encontrada nenhuma localidade com id {location_id}'
+        )
+
+    alert_configs = list(
+        location.alert_config.order_by('temperature_threshold')
+    )
+    if not alert_configs:
+        logger.info(
+            f"Nenhuma configuração de alerta para localidade '{location}' (ID: {location.id})"
+        )
+        return 0
+
+    now = timezone.now()
+    # the task runs every `tick` minutes; half a tick absorbs beat jitter
+    tick = min(c.check_interval_minutes for c in alert_configs)
+    horizon = now + timedelta(minutes=tick) / 2
+    due = [c for c in alert_configs if c.next_check_at <= horizon]
+    if not due:
+        logger.info(
+            f"Nenhuma configuração vencida para localidade '{location}' (ID: {location.id})"
         )
+        return 0
+
+    temperature, stale = _read_temperature(location)
+    logger.info(f"Temperatura atual em '{location}': {temperature}°C")
 
-    location = alert_config.location
+    if not stale:
+        temperature_log_buffer.add(location.id, temperature)
+    _evaluate_location(location, temperature, due)
+
+    ids_by_interval = defaultdict(list)
+    for alert_config in due:
+        ids_by_interval[alert_config.check_interval_minutes].append(
+            alert_config.id
+        )
+    for interval, ids in ids_by_interval.items():
+        AlertConfig.objects.filter(id__in=ids).update(
+            next_check_at=now + timedelta(minutes=interval)
+        )
+
+    return len(due)
+
+
+@shared_task
+def check_temperature_batch(alert_config_ids: list[int]) -> int:
+    """
+    Verifica a temperatura de várias configurações de alerta em uma única task.
+
+    As leituras são obtidas de forma concorrente (uma por coordenada distinta)
+    com um `httpx.AsyncClient` limitado por `OPENMETEO_CONCURRENCY`. Em seguida
+    um log de temperatura é gravado por localidade e as configurações de cada
+    localidade são avaliadas contra a sua leitura (ver `_evaluate_location`).
+    Localidades sem leitura usam a última leitura conhecida, se houver.
+
+    Args:
+        alert_config_ids (list[int]): IDs das configurações a serem verificadas.
+
+    Returns:
+        int: Quantidade de configurações verificadas com sucesso.
+    """
     logger.info(
-        f"Obtendo temperatura atual para localidade '{location}' (ID: {location.id})"
+        f'Iniciando verificação em lote de {len(alert_config_ids)} configurações de alerta'
     )
 
-    temperature = get_current_temperature(
-        location.latitude, location.longitude
+    alert_configs = list(
+        AlertConfig.objects.select_related('location')
+        .filter(id__in=alert_config_ids)
+        .order_by('temperature_threshold')
     )
-    logger.info(
-        f"Temperatura atual em '{location}': {temperature}°C (threshold: {alert_config.temperature_threshold}°C)"
+    missing_ids = set(alert_config_ids) - {c.id for c in alert_configs}
+    if missing_ids:
+        logger.error(f'AlertConfigs não encontradas: {sorted(missing_ids)}')
+
+    locations = {c.location_id: c.location for c in alert_configs}
+    temperatures = run_async(
+        aget_current_temperatures(
+            [(loc.latitude, loc.longitude) for loc in locations.values()]
+        )
     )
 
-    TemperatureLog.objects.create(location=location, temperature=temperature)
-    logger.success(
-        f"Log de temperatura registrado para localidade '{location}' (ID: {location.id})"
+    readings = {
+        location_id: temperatures[(location.latitude, location.longitude)]
+        for location_id, location in locations.items()
+        if (location.latitude, location.longitude) in temperatures
+    }
+    temperature_log_buffer.add_many(
+        [
+            (location_id, temperature, None)
+            for location_id, temperature in readings.items()
+        ]
     )
+    logger.success(f'{len(readings)} logs de temperatura registrados')
 
-    if temperature > alert_config.temperature_threshold:
-        logger.warning(
-            f"Temperatura {temperature}°C excedeu o limite de {alert_config.temperature_threshold}°C para localidade '{location}' (ID: {location.id})"
+    # locations whose lookup failed are evaluated with their last known
+    # reading, without writing a log
+    for location_id, location in locations.items():
+        if location_id in readings:
+            continue
+        stale = get_stale_temperature(location.latitude, location.longitude)
+        if stale is not None:
+            readings[location_id] = stale[0]
+            logger.warning(
+                f"Usando leitura desatualizada de {stale[1]:.0f}s para localidade '{location}' (ID: {location.id})"
+            )
+
+    by_location = defaultdict(list)
+    for alert_config in alert_configs:
+        by_location[alert_config.location_id].append(alert_config)
+
+    checked = 0
+    for location_id, location_configs in by_location.items():
+        if location_id not in readings:
+            logger.warning(
+                f'Sem leitura para localidade ID {location_id}, {len(location_configs)} verificações ignoradas'
+            )
+            continue
+        _evaluate_location(
+            locations[location_id], readings[location_id], location_configs
         )
-        create_alert_and_notify(
-            location=location,
-            temperature=temperature,
-            alert_config=alert_config,
+        checked += len(location_configs)
+
+    return checked
+
+
+@shared_task
+def sweep_due_alert_configs() -> int:
+    """
+    Encontra as configurações de alerta com verificação vencida e despacha as
+    verificações em lotes de `ALERT_SWEEP_BATCH_SIZE` para
+    `check_temperature_batch`.
+
+    Usada no modo de varredura (`ALERT_SCHEDULER_MODE = 'sweep'`), em que uma
+    única task periódica substitui um PeriodicTask por localidade. O
+    `next_check_at` de cada configuração despachada é avançado pelo seu
+    intervalo na mesma transação, e linhas bloqueadas por outra varredura
+    concorrente são ignoradas.
+
+    Returns:
+        int: Quantidade de configurações despachadas.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        due = list(
+            AlertConfig.objects.select_for_update(skip_locked=True)
+            .filter(next_check_at__lte=now)
+            .order_by('next_check_at')
+            .values_list('id', 'check_interval_minutes')[
+                : settings.ALERT_SWEEP_MAX_CONFIGS
+            ]
         )
-    else:
-        logger.info(
-            f"Temperatura dentro do limite para localidade '{location}' (ID: {location.id}) - Nenhum alerta gerado."
+
+        ids_by_interval = defaultdict(list)
+        for alert_config_id, interval in due:
+            ids_by_interval[interval].append(alert_config_id)
+
+        for interval, ids in ids_by_interval.items():
+            AlertConfig.objects.filter(id__in=ids).update(
+                next_check_at=now + timedelta(minutes=interval)
+            )
+
+    if not due:
+        logger.info('Nenhuma configuração de alerta com verificação vencida')
+        return 0
+
+    ids = [alert_config_id for alert_config_id, _ in due]
+    for start in range(0, len(ids), settings.ALERT_SWEEP_BATCH_SIZE):
+        check_temperature_batch.delay(
+            ids[start : start + settings.ALERT_SWEEP_BATCH_SIZE]
         )
+
+    logger.success(
+        f'{len(due)} configurações de alerta despachadas para verificação'
+    )
+    return len(due)
+
+
+@shared_task
+def dispatch_notifications() -> dict[str, int]:
+    """
+    Envia ao N8N as notificações pendentes do outbox, em lotes, até esvaziá-lo
+    ou atingir `N8N_OUTBOX_MAX_BATCHES` lotes por execução.
+
+    Returns:
+        dict[str, int]: Totais de notificações `sent`, `retried` e `failed`.
+    """
+    totals = {'sent': 0, 'retried': 0, 'failed': 0}
+
+    for _ in range(settings.N8N_OUTBOX_MAX_BATCHES):
+        result = dispatch_pending_notifications()
+        for key, value in result.items():
+            totals[key] += value
+        if sum(result.values()) < settings.N8N_OUTBOX_BATCH_SIZE:
+            break
+
+    return totals
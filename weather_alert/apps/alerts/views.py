@@ -1,18 +1,37 @@
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
 from loguru import logger
-from ninja import Router
-
+from ninja import Query, Router
+from ninja.decorators import decorate_view
+
+from weather_alert.api.bulk import validate_items
+from weather_alert.api.etags import (
+    ALERT_CONFIGS,
+    ALERTS,
+    LOCATIONS,
+    abump_versions,
+    collection_etag,
+)
+from weather_alert.api.pagination import (
+    InvalidCursor,
+    paginate_by_timestamp,
+    set_next_page_headers,
+)
 from weather_alert.api.schemas import MessageSchema
 from weather_alert.api.security import n8n_header_key
 from weather_alert.apps.location.models import Location
 
 from .models import Alert, AlertConfig
 from .schemas import (
+    AlertConfigExpandedSchema,
     AlertConfigSchema,
     AlertSchema,
+    BulkAlertConfigResultSchema,
     CreateAlertConfigSchema,
     UpdateAlertConfigSchema,
 )
 from .services.alert_config_service import AlertConfigService
+from .services.alert_stream import event_stream
 
 alert_config_router = Router(tags=['Alert Configs'])
 alert_router = Router(tags=['Alerts'])
@@ -60,7 +79,55 @@ async def create_alert_config(request, payload: CreateAlertConfigSchema):
     return alert_config
 
 
+@alert_config_router.post(
+    '/bulk/', response={200: BulkAlertConfigResultSchema, 400: MessageSchema}
+)
+async def bulk_create_alert_configs(request, payload: list[dict]):
+    """
+    Cria várias configurações de alerta e seus agendamentos em uma única
+    transação.
+
+    Itens inválidos são reportados em `errors`, com sua posição no lote, sem
+    impedir a criação dos demais.
+
+    Args:
+        payload (list[dict]): Configurações a serem criadas, no formato de
+            `CreateAlertConfigSchema`.
+
+    Returns:
+        200: Configurações criadas e erros por item.
+        400: Se o lote exceder `API_BULK_MAX_ITEMS`.
+    """
+    if len(payload) > settings.API_BULK_MAX_ITEMS:
+        logger.warning(
+            f'Lote de {len(payload)} configurações de alerta recusado'
+        )
+        return 400, MessageSchema(
+            message=f'O lote deve ter no máximo {settings.API_BULK_MAX_ITEMS} itens'
+        )
+
+    logger.info(f'Criando {len(payload)} configurações de alerta em lote')
+    items, errors = validate_items(CreateAlertConfigSchema, payload)
+    alert_configs, service_errors = (
+        await AlertConfigService.bulk_create_alert_configs_and_schedule_tasks(
+            [item.model_dump() for _, item in items]
+        )
+    )
+    # the service reports positions among the valid items only
+    errors += [
+        {'index': items[error['index']][0], 'message': error['message']}
+        for error in service_errors
+    ]
+    errors.sort(key=lambda error: error['index'])
+
+    logger.success(
+        f'{len(alert_configs)} configurações de alerta criadas em lote, {len(errors)} recusadas'
+    )
+    return {'created': alert_configs, 'errors': errors}
+
+
 @alert_config_router.get('/', response=list[AlertConfigSchema])
+@decorate_view(collection_etag(ALERT_CONFIGS))
 async def list_alert_configs(request):
     """
     Lista todas as configurações de alerta cadastradas.
@@ -75,6 +142,23 @@ async def list_alert_configs(request):
     return alert_configs
 
 
+@alert_config_router.get('/expanded/', response=list[AlertConfigExpandedSchema])
+@decorate_view(collection_etag(ALERT_CONFIGS, LOCATIONS))
+async def list_alert_configs_expanded(request):
+    """
+    Lista as configurações de alerta com o nome e as coordenadas da
+    localização, obtidos na mesma query.
+
+    Returns:
+        list[AlertConfigExpandedSchema]: Lista de configurações de alerta.
+    """
+    logger.info('Listando configurações de alerta com localizações')
+    queryset = AlertConfig.objects.select_related('location').order_by('id')
+    alert_configs = [config async for config in queryset]
+    logger.info(f'{len(alert_configs)} configurações de alerta encontradas')
+    return alert_configs
+
+
 @alert_config_router.get(
     '/{id}/', response={200: AlertConfigSchema, 404: MessageSchema}
 )
@@ -173,16 +257,30 @@ async def delete_alert_config(request, id: int):
 # Alert Endpoints
 
 
-@alert_router.get('/', response=list[AlertSchema])
-async def list_alerts(request, location_id: int = None):
+@alert_router.get('/', response={200: list[AlertSchema], 400: MessageSchema})
+@decorate_view(collection_etag(ALERTS, LOCATIONS))
+async def list_alerts(
+    request,
+    response: HttpResponse,
+    location_id: int = None,
+    limit: int = Query(
+        default=settings.API_PAGE_SIZE, ge=1, le=settings.API_MAX_PAGE_SIZE
+    ),
+    cursor: str = None,
+):
     """
-    Lista todos os alertas, podendo ser filtrados por localidade.
+    Lista os alertas, do mais recente ao mais antigo, podendo ser filtrados
+    por localidade, com paginação por cursor. O cursor da próxima página vem
+    nos cabeçalhos `X-Next-Cursor` e `Link`.
 
     Args:
         location_id (int, opcional): Filtrar alertas por ID da localidade.
+        limit (int, opcional): Quantidade máxima de alertas na página.
+        cursor (str, opcional): Cursor `X-Next-Cursor` da página anterior.
 
     Returns:
-        list[AlertSchema]: Lista de alertas.
+        200: Lista de alertas da página.
+        400: Se o cursor for inválido.
     """
     if location_id:
         logger.info(f'Listando alertas para localidade ID {location_id}')
@@ -191,8 +289,16 @@ async def list_alerts(request, location_id: int = None):
         logger.info('Listando todos os alertas')
         queryset = Alert.objects.select_related('location').all()
 
-    alerts = [alert async for alert in queryset]
+    try:
+        alerts, next_cursor = await paginate_by_timestamp(
+            queryset, limit, cursor
+        )
+    except InvalidCursor:
+        logger.warning(f'Cursor inválido: {cursor}')
+        return 400, MessageSchema(message='Cursor inválido')
+
     logger.info(f'{len(alerts)} alertas encontrados')
+    set_next_page_headers(request, response, next_cursor)
 
     return [
         AlertSchema(
@@ -208,6 +314,30 @@ async def list_alerts(request, location_id: int = None):
     ]
 
 
+@alert_router.get('/stream/', include_in_schema=False)
+async def stream_alerts(request, last_event_id: int = None):
+    """
+    Transmite os alertas novos por Server-Sent Events (`text/event-stream`),
+    um evento `alert` por alerta criado, no mesmo formato da listagem.
+
+    Args:
+        last_event_id (int, opcional): ID do último alerta já exibido; os
+            alertas posteriores a ele são enviados primeiro. Ao reconectar, o
+            cabeçalho `Last-Event-ID` enviado pelo navegador tem precedência.
+    """
+    try:
+        last_event_id = int(request.headers['Last-Event-ID'])
+    except (KeyError, ValueError):
+        pass
+
+    logger.info('Cliente conectado ao stream de alertas')
+    return StreamingHttpResponse(
+        event_stream(last_event_id),
+        content_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache'},
+    )
+
+
 @alert_router.get('/{id}/', response={200: AlertSchema, 404: MessageSchema})
 async def get_alert(request, id: int):
     """
@@ -261,6 +391,7 @@ async def mark_alert_as_notified(request, alert_id: int):
         alert = await Alert.objects.aget(id=alert_id)
         alert.notified = True
         await alert.asave()
+        await abump_versions(ALERTS)
         logger.success(
             f'Alerta ID {alert_id} marcado como notificado com sucesso'
         )
@@ -1,5 +1,16 @@
 from django.contrib import admin
 
+from weather_alert.api.etags import (
+    ALERT_CONFIGS,
+    ALERTS,
+    LOCATIONS,
+    VersionedModelAdmin,
+)
+
 from .models import Location
 
-admin.site.register(Location)
+
+@admin.register(Location)
+class LocationAdmin(VersionedModelAdmin):
+    # alert configs and alerts are removed in cascade
+    collections = (LOCATIONS, ALERT_CONFIGS, ALERTS)
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from weather_alert.apps.location.models import Location
+from weather_alert.integrations.openmeteo import snap_coordinate
+from weather_alert.integrations.temperature_cache import (
+    get_cache_stats,
+    get_coalescing_stats,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Mostra quantas consultas ao Open-Meteo são economizadas pelo '
+        'agrupamento de coordenadas na grade e pelo cache de temperaturas.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--resolution',
+            type=float,
+            help=(
+                'Tamanho da célula, em graus, para a estimativa sobre as '
+                'localidades cadastradas. Padrão: OPENMETEO_GRID_RESOLUTION.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        resolution = options['resolution']
+        if resolution is None:
+            resolution = settings.OPENMETEO_GRID_RESOLUTION
+
+        coordinates = set(
+            Location.objects.values_list('latitude', 'longitude')
+        )
+        cells = {
+            snap_coordinate(latitude, longitude, resolution)
+            for latitude, longitude in coordinates
+        }
+        self.stdout.write(f'Resolução da grade: {resolution}°')
+        self.stdout.write(
+            f'Localidades: {len(coordinates)} coordenadas distintas em '
+            f'{len(cells)} células '
+            f'({len(coordinates) - len(cells)} consultas economizadas por ciclo)'
+        )
+
+        coalescing = get_coalescing_stats()
+        self.stdout.write(
+            f"Agrupamento: {coalescing['coordinates']} coordenadas consultadas "
+            f"em {coalescing['cells']} células "
+            f"({coalescing['saved']} consultas economizadas)"
+        )
+
+        cache = get_cache_stats()
+        self.stdout.write(
+            f"Cache: {cache['hits']} acertos e {cache['misses']} falhas"
+        )
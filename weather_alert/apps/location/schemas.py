@@ -1,4 +1,8 @@
 from ninja import ModelSchema, Schema
+from pydantic import field_validator
+from pydantic_core import PydanticCustomError
+
+from weather_alert.api.schemas import BulkErrorSchema
 
 from .models import Location
 
@@ -21,14 +25,53 @@ class LocationSchema(ModelSchema):
 
 class CreateLocationSchema(Schema):
     """
-    Schema de entrada para cadastrar uma nova localização.
+    Schema de entrada para cadastrar uma nova localização, usado tanto na
+    criação individual quanto em lote.
 
     Attributes:
-        name (str): Nome da localização.
-        latitude (float): Latitude geográfica.
-        longitude (float): Longitude geográfica.
+        name (str): Nome da localização, não vazio.
+        latitude (float): Latitude geográfica, entre -90 e 90.
+        longitude (float): Longitude geográfica, entre -180 e 180.
     """
 
     name: str
     latitude: float
     longitude: float
+
+    @field_validator('name')
+    @classmethod
+    def validate_name(cls, value: str) -> str:
+        if not value.strip():
+            raise PydanticCustomError('blank_name', 'Nome obrigatório')
+        return value
+
+    @field_validator('latitude')
+    @classmethod
+    def validate_latitude(cls, value: float) -> float:
+        if not -90 <= value <= 90:
+            raise PydanticCustomError(
+                'latitude_range', 'Latitude deve estar entre -90 e 90'
+            )
+        return value
+
+    @field_validator('longitude')
+    @classmethod
+    def validate_longitude(cls, value: float) -> float:
+        if not -180 <= value <= 180:
+            raise PydanticCustomError(
+                'longitude_range', 'Longitude deve estar entre -180 e 180'
+            )
+        return value
+
+
+class BulkLocationResultSchema(Schema):
+    """
+    Resultado da criação de localizações em lote.
+
+    Attributes:
+        created (list[LocationSchema]): Localizações criadas, na ordem do lote.
+        errors (list[BulkErrorSchema]): Itens recusados e o motivo.
+    """
+
+    created: list[LocationSchema]
+    errors: list[BulkErrorSchema]
@@ -1,10 +1,28 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from loguru import logger
 from ninja import Router
-
+from ninja.decorators import decorate_view
+
+from weather_alert.api.bulk import validate_items
+from weather_alert.api.etags import (
+    ALERT_CONFIGS,
+    ALERTS,
+    LOCATIONS,
+    abump_versions,
+    collection_etag,
+)
 from weather_alert.api.schemas import MessageSchema
+from weather_alert.apps.alerts.services.alert_config_service import (
+    schedule_locations,
+)
 
 from .models import Location
-from .schemas import CreateLocationSchema, LocationSchema
+from .schemas import (
+    BulkLocationResultSchema,
+    CreateLocationSchema,
+    LocationSchema,
+)
 
 location_router = Router(tags=['Locations'])
 
@@ -22,13 +40,53 @@ async def create_location(request, payload: CreateLocationSchema):
     """
     logger.info(f'Criando nova localização: {payload.name}')
     location = await Location.objects.acreate(**payload.model_dump())
+    await abump_versions(LOCATIONS)
     logger.success(
         f"Localização criada com sucesso: '{location.name}' (ID: {location.id})"
     )
     return location
 
 
+@location_router.post(
+    '/bulk/', response={200: BulkLocationResultSchema, 400: MessageSchema}
+)
+async def bulk_create_locations(request, payload: list[dict]):
+    """
+    Salva várias localizações em uma única inserção.
+
+    Itens inválidos são reportados em `errors`, com sua posição no lote, sem
+    impedir a criação dos demais.
+
+    Args:
+        payload (list[dict]): Localizações a serem criadas, no formato de
+            `CreateLocationSchema`.
+
+    Returns:
+        200: Localizações criadas e erros por item.
+        400: Se o lote exceder `API_BULK_MAX_ITEMS`.
+    """
+    if len(payload) > settings.API_BULK_MAX_ITEMS:
+        logger.warning(f'Lote de {len(payload)} localizações recusado')
+        return 400, MessageSchema(
+            message=f'O lote deve ter no máximo {settings.API_BULK_MAX_ITEMS} itens'
+        )
+
+    logger.info(f'Criando {len(payload)} localizações em lote')
+    items, errors = validate_items(CreateLocationSchema, payload)
+    locations = [Location(**item.model_dump()) for _, item in items]
+
+    if locations:
+        locations = await Location.objects.abulk_create(locations)
+        await abump_versions(LOCATIONS)
+
+    logger.success(
+        f'{len(locations)} localizações criadas em lote, {len(errors)} recusadas'
+    )
+    return {'created': locations, 'errors': errors}
+
+
 @location_router.get('/', response=list[LocationSchema])
+@decorate_view(collection_etag(LOCATIONS))
 async def list_locations(request):
     """
     Lista todas as localizações cadastradas.
@@ -84,6 +142,9 @@ async def delete_location(request, id: int):
     try:
         location = await Location.objects.aget(id=id)
         await location.adelete()
+        # alert configs and alerts are removed in cascade
+        await abump_versions(LOCATIONS, ALERT_CONFIGS, ALERTS)
+        await sync_to_async(schedule_locations)([id])
         logger.success(f'Localização ID {id} deletada com sucesso')
         return 204, None
     except Location.DoesNotExist:
@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from .models import TemperatureLog
+from .models import TemperatureLog, TemperatureRollup
 
 admin.site.register(TemperatureLog)
+admin.site.register(TemperatureRollup)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TemperatureConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'weather_alert.apps.temperature'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from weather_alert.apps.temperature.models import (
+    TemperatureLog,
+    TemperatureRollup,
+)
+from weather_alert.apps.temperature.services.rollup_service import (
+    bucket_start,
+    rebuild_rollups,
+    rebuildable_since,
+)
+
+
+def _datetime(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula os agregados de temperatura por hora e por dia a partir '
+        'dos logs, em janelas de alguns dias.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start',
+            type=_datetime,
+            help=(
+                'Início do período (ISO 8601), limitado ao prazo de retenção '
+                'dos logs. Padrão: primeiro log.'
+            ),
+        )
+        parser.add_argument(
+            '--end',
+            type=_datetime,
+            help='Fim do período (ISO 8601). Padrão: último log.',
+        )
+        parser.add_argument(
+            '--location',
+            type=int,
+            action='append',
+            dest='location_ids',
+            help='ID da localidade a recalcular. Pode ser repetido.',
+        )
+        parser.add_argument(
+            '--window-days',
+            type=int,
+            default=7,
+            help='Dias recalculados por transação.',
+        )
+
+    def handle(self, *args, **options):
+        if options['window_days'] < 1:
+            raise CommandError('--window-days deve ser maior que zero')
+
+        bounds = TemperatureLog.objects.aggregate(
+            first=Min('timestamp'), last=Max('timestamp')
+        )
+        start = options['start'] or bounds['first']
+        end = options['end'] or (
+            bounds['last'] and bounds['last'] + timedelta(microseconds=1)
+        )
+        if start is None or end is None:
+            self.stdout.write('Nenhum log de temperatura para agregar.')
+            return
+        if start >= end:
+            raise CommandError('Período inválido')
+
+        # janelas em dias inteiros, para que nenhum dia seja recalculado duas vezes
+        start = bucket_start(start, TemperatureRollup.Period.DAY)
+        since = rebuildable_since()
+        if since and start < since:
+            if options['start']:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f'Logs anteriores a {since:%Y-%m-%d} já foram '
+                        'apagados; os agregados desse período são mantidos.'
+                    )
+                )
+            start = since
+        if start >= end:
+            self.stdout.write('Nenhum log de temperatura para agregar.')
+            return
+        window = timedelta(days=options['window_days'])
+        total = 0
+        while start < end:
+            until = min(start + window, end)
+            created = rebuild_rollups(start, until, options['location_ids'])
+            total += created
+            self.stdout.write(
+                f'{start:%Y-%m-%d} a {until:%Y-%m-%d}: {created} agregados'
+            )
+            start = until
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{total} agregados de temperatura recalculados'
+            )
+        )
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:08
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('temperature', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='temperaturelog',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0001_initial'),
+        ('temperature', '0002_alter_temperaturelog_timestamp'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='temperaturelog',
+            index=models.Index(
+                fields=['location', '-timestamp', '-id'],
+                name='templog_location_ts_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='temperaturelog',
+            index=models.Index(
+                fields=['-timestamp', '-id'], name='templog_ts_idx'
+            ),
+        ),
+    ]
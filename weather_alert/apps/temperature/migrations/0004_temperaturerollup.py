@@ -0,0 +1,93 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+
+def populate_rollups(apps, schema_editor):
+    TemperatureLog = apps.get_model('temperature', 'TemperatureLog')
+    TemperatureRollup = apps.get_model('temperature', 'TemperatureRollup')
+
+    for period in ('hour', 'day'):
+        rows = (
+            TemperatureLog.objects.annotate(
+                bucket=Trunc(
+                    'timestamp', period, tzinfo=timezone.get_current_timezone()
+                )
+            )
+            .values('location_id', 'bucket')
+            .annotate(
+                count=Count('id'),
+                min=Min('temperature'),
+                max=Max('temperature'),
+                sum=Sum('temperature'),
+            )
+            .order_by()
+        )
+        TemperatureRollup.objects.bulk_create(
+            [TemperatureRollup(period=period, **row) for row in rows],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0001_initial'),
+        ('temperature', '0003_timestamp_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TemperatureRollup',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'period',
+                    models.CharField(
+                        choices=[('hour', 'Hour'), ('day', 'Day')],
+                        max_length=4,
+                    ),
+                ),
+                ('bucket', models.DateTimeField()),
+                ('count', models.PositiveIntegerField()),
+                ('min', models.FloatField()),
+                ('max', models.FloatField()),
+                ('sum', models.FloatField()),
+                (
+                    'location',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='temperature_rollups',
+                        to='location.location',
+                    ),
+                ),
+            ],
+            options={
+                'indexes': [
+                    models.Index(
+                        fields=['period', 'bucket'],
+                        name='temprollup_bucket_idx',
+                    )
+                ],
+                'constraints': [
+                    models.UniqueConstraint(
+                        fields=('location', 'period', 'bucket'),
+                        name='temprollup_location_period_bucket_uniq',
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 from weather_alert.apps.location.models import Location
 
@@ -17,9 +18,66 @@ class TemperatureLog(models.Model):
         Location, on_delete=models.CASCADE, related_name='temperature_logs'
     )
     temperature = models.FloatField()
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # default instead of auto_now_add so buffered writes keep the reading time
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        # keyset pagination on (timestamp, id), with and without location filter
+        indexes = [
+            models.Index(
+                fields=['location', '-timestamp', '-id'],
+                name='templog_location_ts_idx',
+            ),
+            models.Index(fields=['-timestamp', '-id'], name='templog_ts_idx'),
+        ]
 
     def __str__(self):
         return (
             f'{self.location.name} - {self.temperature}°C at {self.timestamp}'
         )
+
+
+class TemperatureRollup(models.Model):
+    """
+    Estatísticas agregadas dos logs de temperatura de uma localização em uma
+    hora ou um dia, mantidas à medida que as leituras são gravadas.
+
+    Attributes:
+        location (ForeignKey): Localização das leituras agregadas.
+        period (CharField): Granularidade do agregado (`hour` ou `day`).
+        bucket (DateTimeField): Início do intervalo, no fuso horário `TIME_ZONE`.
+        count (PositiveIntegerField): Quantidade de leituras.
+        min (FloatField): Temperatura mínima.
+        max (FloatField): Temperatura máxima.
+        sum (FloatField): Soma das temperaturas, para o cálculo da média.
+    """
+
+    class Period(models.TextChoices):
+        HOUR = 'hour'
+        DAY = 'day'
+
+    location = models.ForeignKey(
+        Location, on_delete=models.CASCADE, related_name='temperature_rollups'
+    )
+    period = models.CharField(max_length=4, choices=Period.choices)
+    bucket = models.DateTimeField()
+    count = models.PositiveIntegerField()
+    min = models.FloatField()
+    max = models.FloatField()
+    sum = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['location', 'period', 'bucket'],
+                name='temprollup_location_period_bucket_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['period', 'bucket'], name='temprollup_bucket_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.location.name} - {self.period} {self.bucket}'
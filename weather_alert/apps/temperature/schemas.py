@@ -1,6 +1,9 @@
-from ninja import ModelSchema
+from datetime import datetime
+
+from ninja import ModelSchema, Schema
 
 from .models import TemperatureLog
+from .services.aggregation_service import Bucket
 
 
 class TemperatureLogSchema(ModelSchema):
@@ -17,3 +20,41 @@ class TemperatureLogSchema(ModelSchema):
     class Meta:
         model = TemperatureLog
         fields = ['id', 'location', 'temperature', 'timestamp']
+
+
+class TemperatureSeriesSchema(Schema):
+    """
+    Série agregada de temperaturas de uma localização, em listas paralelas.
+
+    Attributes:
+        location_id (int): ID da localização.
+        timestamps (list[datetime]): Início de cada intervalo.
+        min (list[float]): Temperatura mínima de cada intervalo.
+        max (list[float]): Temperatura máxima de cada intervalo.
+        avg (list[float]): Temperatura média de cada intervalo.
+        count (list[int]): Quantidade de registros de cada intervalo.
+    """
+
+    location_id: int
+    timestamps: list[datetime]
+    min: list[float]
+    max: list[float]
+    avg: list[float]
+    count: list[int]
+
+
+class TemperatureAggregateSchema(Schema):
+    """
+    Resultado da agregação de temperaturas por intervalo de tempo.
+
+    Attributes:
+        bucket (str): Tamanho do intervalo usado na agregação.
+        start (datetime): Início do período agregado.
+        end (datetime): Fim do período agregado.
+        series (list[TemperatureSeriesSchema]): Uma série por localização.
+    """
+
+    bucket: Bucket
+    start: datetime
+    end: datetime
+    series: list[TemperatureSeriesSchema]
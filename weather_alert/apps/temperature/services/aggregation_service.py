@@ -0,0 +1,117 @@
+from datetime import datetime
+from typing import Literal
+
+from django.conf import settings
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from weather_alert.apps.temperature.models import (
+    TemperatureLog,
+    TemperatureRollup,
+)
+from weather_alert.apps.temperature.services.rollup_service import is_aligned
+
+# interval sizes accepted by the aggregate endpoint
+Bucket = Literal['hour', 'day', 'week', 'month']
+
+
+def rollup_period(
+    bucket: Bucket, start: datetime, end: datetime = None
+) -> str | None:
+    """
+    Escolhe o agregado mais grosso que responde à consulta sem perda: o
+    período precisa dividir o intervalo pedido e os limites da consulta
+    precisam cair no início de um período.
+
+    Returns:
+        str | None: `day`, `hour` ou `None` quando os logs brutos são
+        necessários.
+    """
+    periods = ('hour',) if bucket == 'hour' else ('day', 'hour')
+    for period in periods:
+        if is_aligned(start, period) and (
+            end is None or is_aligned(end, period)
+        ):
+            return period
+    return None
+
+
+async def aggregate_temperatures(
+    bucket: Bucket,
+    start: datetime,
+    end: datetime = None,
+    location_ids: list[int] = None,
+) -> list[dict]:
+    """
+    Agrega os logs de temperatura por localidade e intervalo de tempo no banco.
+
+    Os intervalos são truncados no fuso horário atual (`TIME_ZONE`). Quando os
+    limites do período permitem, a consulta é feita sobre os agregados por
+    hora ou por dia (`TemperatureRollup`) em vez dos logs brutos.
+
+    Args:
+        bucket (str): Tamanho do intervalo (`hour`, `day`, `week` ou `month`).
+        start (datetime): Início do período (inclusivo).
+        end (datetime, optional): Fim do período (exclusivo). Padrão: sem limite.
+        location_ids (list[int], optional): Localidades a considerar. Padrão: todas.
+
+    Returns:
+        list[dict]: Uma série por localidade, com listas paralelas
+        `timestamps`, `min`, `max`, `avg` e `count`.
+    """
+    period = (
+        rollup_period(bucket, start, end)
+        if settings.TEMPERATURE_AGGREGATE_FROM_ROLLUPS
+        else None
+    )
+    if period:
+        queryset = TemperatureRollup.objects.filter(
+            period=period, bucket__gte=start
+        )
+        field, count, min_, max_, sum_ = 'bucket', 'count', 'min', 'max', 'sum'
+        if end:
+            queryset = queryset.filter(bucket__lt=end)
+    else:
+        queryset = TemperatureLog.objects.filter(timestamp__gte=start)
+        field, count = 'timestamp', 'id'
+        min_ = max_ = sum_ = 'temperature'
+        if end:
+            queryset = queryset.filter(timestamp__lt=end)
+
+    if location_ids:
+        queryset = queryset.filter(location_id__in=location_ids)
+
+    rows = (
+        queryset.annotate(
+            trunc=Trunc(field, bucket, tzinfo=timezone.get_current_timezone())
+        )
+        .values('location_id', 'trunc')
+        .annotate(
+            min=Min(min_),
+            max=Max(max_),
+            sum=Sum(sum_),
+            count=Sum(count) if period else Count(count),
+        )
+        .order_by('location_id', 'trunc')
+    )
+
+    series = {}
+    async for row in rows:
+        serie = series.get(row['location_id'])
+        if serie is None:
+            serie = series[row['location_id']] = {
+                'location_id': row['location_id'],
+                'timestamps': [],
+                'min': [],
+                'max': [],
+                'avg': [],
+                'count': [],
+            }
+        serie['timestamps'].append(row['trunc'])
+        serie['min'].append(row['min'])
+        serie['max'].append(row['max'])
+        serie['avg'].append(row['sum'] / row['count'])
+        serie['count'].append(row['count'])
+
+    return list(series.values())
@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from django.conf import settings
+
+from weather_alert.apps.temperature.models import TemperatureLog
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+FIELDS = ('id', 'location_id', 'temperature', 'timestamp')
+
+
+async def stream_temperature_logs(
+    format: str,
+    start: datetime = None,
+    end: datetime = None,
+    location_ids: list[int] = None,
+) -> AsyncIterator[str]:
+    """
+    Gera os logs de temperatura em NDJSON ou CSV, em ordem cronológica.
+
+    As linhas são lidas do banco em blocos de `API_EXPORT_CHUNK_SIZE` (com
+    cursor do lado do servidor no PostgreSQL) e cada bloco é emitido assim que
+    formatado, de modo que a memória usada não depende do total exportado.
+
+    Args:
+        format (str): Formato de saída (`ndjson` ou `csv`).
+        start (datetime, optional): Início do período (inclusivo).
+        end (datetime, optional): Fim do período (exclusivo).
+        location_ids (list[int], optional): Localidades a considerar. Padrão: todas.
+
+    Yields:
+        str: Blocos de linhas já formatadas.
+    """
+    queryset = TemperatureLog.objects.all()
+    if start:
+        queryset = queryset.filter(timestamp__gte=start)
+    if end:
+        queryset = queryset.filter(timestamp__lt=end)
+    if location_ids:
+        queryset = queryset.filter(location_id__in=location_ids)
+
+    chunk_size = settings.API_EXPORT_CHUNK_SIZE
+    # values() em vez de values_list(): o iterável de values_list() executa a
+    # consulta fora do sync_to_async do aiterator()
+    rows = queryset.order_by('timestamp', 'id').values(*FIELDS)
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, FIELDS, lineterminator='\n')
+    if format == 'csv':
+        writer.writeheader()
+
+    pending = 0
+    async for row in rows.aiterator(chunk_size=chunk_size):
+        row['timestamp'] = row['timestamp'].isoformat()
+        if format == 'csv':
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(row) + '\n')
+
+        pending += 1
+        if pending == chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
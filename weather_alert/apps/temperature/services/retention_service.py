@@ -0,0 +1,111 @@
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+from loguru import logger
+
+from weather_alert.apps.temperature.models import (
+    TemperatureLog,
+    TemperatureRollup,
+)
+
+
+def delete_in_chunks(
+    queryset: QuerySet, chunk_size: int, max_chunks: int = None
+) -> int:
+    """
+    Apaga as linhas do queryset em blocos de até `chunk_size` chaves
+    primárias, em ordem crescente de id.
+
+    Cada bloco é um `DELETE ... WHERE id IN (...)` próprio, de modo que
+    nenhuma transação segura locks sobre muitas linhas por muito tempo.
+
+    Args:
+        queryset (QuerySet): Linhas a apagar.
+        chunk_size (int): Máximo de linhas por bloco.
+        max_chunks (int, optional): Máximo de blocos nesta chamada. Padrão: sem limite.
+
+    Returns:
+        int: Quantidade de linhas apagadas.
+    """
+    model = queryset.model
+    deleted = 0
+    chunks = 0
+    last_id = 0
+
+    while max_chunks is None or chunks < max_chunks:
+        ids = list(
+            queryset.filter(id__gt=last_id)
+            .order_by('id')
+            .values_list('id', flat=True)[:chunk_size]
+        )
+        if not ids:
+            break
+
+        count, _ = model.objects.filter(id__in=ids).delete()
+        deleted += count
+        chunks += 1
+        last_id = ids[-1]
+        if len(ids) < chunk_size:
+            break
+
+    return deleted
+
+
+def purge_expired_data(now: datetime = None) -> dict:
+    """
+    Aplica a política de retenção aos logs de temperatura e aos agregados.
+
+    Os logs brutos são mantidos por `TEMPERATURE_LOG_RETENTION_DAYS` dias e os
+    agregados por hora e por dia por `TEMPERATURE_HOURLY_ROLLUP_RETENTION_DAYS`
+    e `TEMPERATURE_DAILY_ROLLUP_RETENTION_DAYS` dias (0 mantém para sempre).
+
+    Args:
+        now (datetime, optional): Referência para o cálculo dos prazos. Padrão: agora.
+
+    Returns:
+        dict: Linhas apagadas por tabela e o tempo gasto, em segundos.
+    """
+    now = now or timezone.now()
+    started = time.perf_counter()
+    policies = {
+        'temperature_logs': (
+            settings.TEMPERATURE_LOG_RETENTION_DAYS,
+            lambda cutoff: TemperatureLog.objects.filter(timestamp__lt=cutoff),
+        ),
+        'hourly_rollups': (
+            settings.TEMPERATURE_HOURLY_ROLLUP_RETENTION_DAYS,
+            lambda cutoff: TemperatureRollup.objects.filter(
+                period=TemperatureRollup.Period.HOUR, bucket__lt=cutoff
+            ),
+        ),
+        'daily_rollups': (
+            settings.TEMPERATURE_DAILY_ROLLUP_RETENTION_DAYS,
+            lambda cutoff: TemperatureRollup.objects.filter(
+                period=TemperatureRollup.Period.DAY, bucket__lt=cutoff
+            ),
+        ),
+    }
+
+    result = {}
+    for name, (days, expired) in policies.items():
+        result[name] = (
+            delete_in_chunks(
+                expired(now - timedelta(days=days)),
+                settings.TEMPERATURE_RETENTION_CHUNK_SIZE,
+                settings.TEMPERATURE_RETENTION_MAX_CHUNKS,
+            )
+            if days > 0
+            else 0
+        )
+    result['seconds'] = round(time.perf_counter() - started, 3)
+
+    logger.info(
+        f"Retenção de temperatura: {result['temperature_logs']} logs, "
+        f"{result['hourly_rollups']} agregados por hora e "
+        f"{result['daily_rollups']} agregados por dia removidos em "
+        f"{result['seconds']}s"
+    )
+    return result
@@ -0,0 +1,210 @@
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from weather_alert.apps.temperature.models import (
+    TemperatureLog,
+    TemperatureRollup,
+)
+
+PERIODS = tuple(TemperatureRollup.Period.values)
+
+# linhas por INSERT; mantém os parâmetros abaixo do limite do SQLite
+UPSERT_BATCH_SIZE = 500
+
+
+def bucket_start(timestamp: datetime, period: str) -> datetime:
+    """
+    Início da hora ou do dia que contém `timestamp`, no fuso horário atual.
+    """
+    local = timezone.localtime(timestamp)
+    if period == TemperatureRollup.Period.DAY:
+        return local.replace(hour=0, minute=0, second=0, microsecond=0)
+    return local.replace(minute=0, second=0, microsecond=0)
+
+
+def is_aligned(timestamp: datetime, period: str) -> bool:
+    """
+    Indica se `timestamp` cai exatamente no início de uma hora ou de um dia.
+    """
+    return bucket_start(timestamp, period) == timestamp
+
+
+def rebuildable_since(now: datetime = None) -> datetime | None:
+    """
+    Primeiro dia cujos logs brutos ainda estão todos guardados.
+
+    É o prazo de `TEMPERATURE_LOG_RETENTION_DAYS` arredondado para o início do
+    dia seguinte: o dia em que o prazo cai já pode ter perdido parte dos logs,
+    e seus agregados não podem ser recalculados a partir deles.
+
+    Args:
+        now (datetime, optional): Referência para o cálculo do prazo. Padrão: agora.
+
+    Returns:
+        datetime | None: Início do dia, ou `None` se os logs são mantidos para sempre.
+    """
+    days = settings.TEMPERATURE_LOG_RETENTION_DAYS
+    if days <= 0:
+        return None
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    if is_aligned(cutoff, TemperatureRollup.Period.DAY):
+        return timezone.localtime(cutoff)
+    return bucket_start(
+        cutoff + timedelta(days=1), TemperatureRollup.Period.DAY
+    )
+
+
+def apply_readings(readings: Iterable[tuple[int, float, datetime]]) -> int:
+    """
+    Acrescenta leituras `(location_id, temperature, timestamp)` aos agregados
+    por hora e por dia.
+
+    As leituras são somadas em memória e gravadas com um único upsert
+    (`INSERT ... ON CONFLICT DO UPDATE`) por lote, que combina contagem,
+    mínima, máxima e soma com os valores já existentes no banco.
+
+    Returns:
+        int: Quantidade de agregados criados ou atualizados.
+    """
+    totals = {}
+    for location_id, temperature, timestamp in readings:
+        for period in PERIODS:
+            key = (location_id, period, bucket_start(timestamp, period))
+            total = totals.get(key)
+            if total is None:
+                totals[key] = [1, temperature, temperature, temperature]
+            else:
+                total[0] += 1
+                total[1] = min(total[1], temperature)
+                total[2] = max(total[2], temperature)
+                total[3] += temperature
+
+    # ordem fixa das chaves evita deadlocks entre descargas concorrentes
+    rows = [
+        (
+            location_id,
+            period,
+            connection.ops.adapt_datetimefield_value(bucket),
+            *total,
+        )
+        for (location_id, period, bucket), total in sorted(totals.items())
+    ]
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        _upsert(rows[i : i + UPSERT_BATCH_SIZE])
+
+    return len(rows)
+
+
+def _upsert(rows: list[tuple]):
+    qn = connection.ops.quote_name
+    table = qn(TemperatureRollup._meta.db_table)
+    count, min_, max_, sum_ = (qn(c) for c in ('count', 'min', 'max', 'sum'))
+    least, greatest = (
+        ('MIN', 'MAX')
+        if connection.vendor == 'sqlite'
+        else ('LEAST', 'GREATEST')
+    )
+    values = ', '.join(['(%s, %s, %s, %s, %s, %s, %s)'] * len(rows))
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} '
+            f'(location_id, period, bucket, {count}, {min_}, {max_}, {sum_}) '
+            f'VALUES {values} '
+            f'ON CONFLICT (location_id, period, bucket) DO UPDATE SET '
+            f'{count} = {table}.{count} + excluded.{count}, '
+            f'{min_} = {least}({table}.{min_}, excluded.{min_}), '
+            f'{max_} = {greatest}({table}.{max_}, excluded.{max_}), '
+            f'{sum_} = {table}.{sum_} + excluded.{sum_}',
+            [value for row in rows for value in row],
+        )
+
+
+def rebuild_rollups(
+    start: datetime = None,
+    end: datetime = None,
+    location_ids: list[int] = None,
+) -> int:
+    """
+    Recalcula os agregados a partir dos logs de temperatura.
+
+    O período é ampliado para dias inteiros, de modo que os agregados por hora
+    e por dia fiquem completos. Os agregados existentes no período são
+    substituídos na mesma transação.
+
+    O início nunca é anterior a `rebuildable_since()`: além do prazo de
+    retenção os logs brutos já foram apagados e os agregados são a única cópia
+    dos dados. Um período sem nenhum log não é alterado.
+
+    Args:
+        start (datetime, optional): Início do período. Padrão: desde o primeiro
+            dia com todos os logs guardados.
+        end (datetime, optional): Fim do período. Padrão: até o último log.
+        location_ids (list[int], optional): Localidades a recalcular. Padrão: todas.
+
+    Returns:
+        int: Quantidade de agregados gravados.
+    """
+    logs = TemperatureLog.objects.all()
+    rollups = TemperatureRollup.objects.all()
+
+    if start:
+        start = bucket_start(start, TemperatureRollup.Period.DAY)
+    since = rebuildable_since()
+    if since and (start is None or start < since):
+        start = since
+    if start:
+        logs = logs.filter(timestamp__gte=start)
+        rollups = rollups.filter(bucket__gte=start)
+    if end:
+        if not is_aligned(end, TemperatureRollup.Period.DAY):
+            end = bucket_start(
+                end + timedelta(days=1), TemperatureRollup.Period.DAY
+            )
+        logs = logs.filter(timestamp__lt=end)
+        rollups = rollups.filter(bucket__lt=end)
+    if location_ids:
+        logs = logs.filter(location_id__in=location_ids)
+        rollups = rollups.filter(location_id__in=location_ids)
+
+    if start and end and start >= end:
+        return 0
+
+    created = 0
+    with transaction.atomic():
+        # never wipe aggregates that cannot be recomputed
+        if not logs.exists():
+            return 0
+        rollups.delete()
+        for period in PERIODS:
+            rows = (
+                logs.annotate(
+                    bucket=Trunc(
+                        'timestamp',
+                        period,
+                        tzinfo=timezone.get_current_timezone(),
+                    )
+                )
+                .values('location_id', 'bucket')
+                .annotate(
+                    count=Count('id'),
+                    min=Min('temperature'),
+                    max=Max('temperature'),
+                    sum=Sum('temperature'),
+                )
+                .order_by()
+            )
+            created += len(
+                TemperatureRollup.objects.bulk_create(
+                    [TemperatureRollup(period=period, **row) for row in rows],
+                    batch_size=UPSERT_BATCH_SIZE,
+                )
+            )
+
+    return created
@@ -0,0 +1,218 @@
+import threading
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.utils import timezone
+from loguru import logger
+
+from weather_alert.apps.temperature.models import TemperatureLog
+from weather_alert.apps.temperature.services.rollup_service import (
+    apply_readings,
+)
+from weather_alert.metrics import (
+    TEMPERATURE_LOG_FLUSH_SIZE,
+    TEMPERATURE_LOGS_FLUSHED,
+)
+
+
+class TemperatureLogBuffer:
+    """
+    Buffer por processo que agrupa leituras de temperatura e as grava em lote.
+
+    O buffer é descarregado quando atinge `TEMPERATURE_LOG_BUFFER_SIZE`
+    leituras ou quando a leitura mais antiga passa de
+    `TEMPERATURE_LOG_BUFFER_MAX_AGE_SECONDS` segundos. O limite de tempo é
+    garantido por um timer iniciado quando o buffer deixa de estar vazio, de
+    modo que um processo que parou de receber tasks não retém leituras. A
+    gravação usa `bulk_create` ou, no PostgreSQL, `COPY`
+    (`TEMPERATURE_LOG_FLUSH_METHOD`), e atualiza os agregados por hora e por
+    dia na mesma transação.
+
+    O tamanho de cada descarga também é exportado nas métricas
+    `weather_alert_temperature_log_flush_size` e
+    `weather_alert_temperature_logs_flushed_total`.
+
+    Attributes:
+        flushes (int): Quantidade de descargas realizadas.
+        flushed_rows (int): Total de leituras gravadas.
+        last_flush_size (int): Quantidade de leituras da última descarga.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows: list[tuple[int, float, datetime]] = []
+        self._oldest_at: float = None
+        self._timer: threading.Timer = None
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.last_flush_size = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(
+        self, location_id: int, temperature: float, timestamp: datetime = None
+    ) -> int:
+        """
+        Adiciona uma leitura ao buffer, descarregando-o se necessário.
+
+        Args:
+            location_id (int): ID da localização da leitura.
+            temperature (float): Temperatura registrada.
+            timestamp (datetime, optional): Momento da leitura. Padrão: agora.
+
+        Returns:
+            int: Quantidade de leituras gravadas por esta chamada (0 se nenhuma).
+        """
+        return self.add_many([(location_id, temperature, timestamp)])
+
+    def add_many(
+        self, readings: list[tuple[int, float, datetime | None]]
+    ) -> int:
+        """
+        Adiciona várias leituras `(location_id, temperature, timestamp)` ao buffer.
+
+        Uma falha na descarga não é propagada: as leituras, que podem vir de
+        verificações anteriores, ficam no buffer para o timer ou a próxima
+        descarga, e a verificação que as adicionou segue para a avaliação
+        dos alertas.
+
+        Returns:
+            int: Quantidade de leituras gravadas por esta chamada (0 se nenhuma).
+        """
+        now = timezone.now()
+        with self._lock:
+            if not self._rows:
+                self._oldest_at = time.monotonic()
+            self._rows.extend(
+                (location_id, temperature, timestamp or now)
+                for location_id, temperature, timestamp in readings
+            )
+
+        if self._is_due():
+            try:
+                return self.flush()
+            except Exception:
+                # logged by flush(), which keeps the rows and re-arms the timer
+                return 0
+        self._start_timer()
+        return 0
+
+    def _start_timer(self):
+        with self._lock:
+            if self._timer is not None or not self._rows:
+                return
+            self._timer = threading.Timer(
+                settings.TEMPERATURE_LOG_BUFFER_MAX_AGE_SECONDS,
+                self._flush_on_timer,
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _flush_on_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            # already logged by flush(), which keeps the rows and re-arms the timer
+            pass
+        finally:
+            # the timer thread owns its own database connection
+            connections.close_all()
+
+    def flush_if_due(self) -> int:
+        """
+        Descarrega o buffer apenas se o limite de tamanho ou de tempo foi atingido.
+        """
+        if self._is_due():
+            return self.flush()
+        return 0
+
+    def flush(self) -> int:
+        """
+        Grava todas as leituras pendentes.
+
+        Se a gravação falhar, as leituras voltam para o buffer e o erro é propagado.
+
+        Returns:
+            int: Quantidade de leituras gravadas.
+        """
+        with self._lock:
+            rows, self._rows = self._rows, []
+            oldest_at, self._oldest_at = self._oldest_at, None
+            self._cancel_timer()
+
+        if not rows:
+            return 0
+
+        try:
+            with transaction.atomic():
+                if (
+                    settings.TEMPERATURE_LOG_FLUSH_METHOD == 'copy'
+                    and connection.vendor == 'postgresql'
+                ):
+                    self._copy(rows)
+                else:
+                    TemperatureLog.objects.bulk_create(
+                        [
+                            TemperatureLog(
+                                location_id=location_id,
+                                temperature=temperature,
+                                timestamp=timestamp,
+                            )
+                            for location_id, temperature, timestamp in rows
+                        ]
+                    )
+                apply_readings(rows)
+        except Exception:
+            with self._lock:
+                self._rows[:0] = rows
+                self._oldest_at = oldest_at
+            self._start_timer()
+            logger.exception(
+                f'Falha ao gravar {len(rows)} logs de temperatura, mantidos no buffer'
+            )
+            raise
+
+        with self._lock:
+            self.flushes += 1
+            self.flushed_rows += len(rows)
+            self.last_flush_size = len(rows)
+        TEMPERATURE_LOG_FLUSH_SIZE.observe(len(rows))
+        TEMPERATURE_LOGS_FLUSHED.inc(len(rows))
+        logger.info(f'{len(rows)} logs de temperatura gravados em lote')
+        return len(rows)
+
+    def _is_due(self) -> bool:
+        with self._lock:
+            if not self._rows:
+                return False
+            return (
+                len(self._rows) >= settings.TEMPERATURE_LOG_BUFFER_SIZE
+                or time.monotonic() - self._oldest_at
+                >= settings.TEMPERATURE_LOG_BUFFER_MAX_AGE_SECONDS
+            )
+
+    @staticmethod
+    def _copy(rows: list[tuple[int, float, datetime]]):
+        """
+        Grava as leituras com `COPY ... FROM STDIN` (psycopg 3).
+        """
+        table = connection.ops.quote_name(TemperatureLog._meta.db_table)
+        with connection.cursor() as cursor:
+            with cursor.copy(
+                f'COPY {table} (location_id, temperature, timestamp) FROM STDIN'
+            ) as copy:
+                for row in rows:
+                    copy.write_row(row)
+
+
+temperature_log_buffer = TemperatureLogBuffer()
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from weather_alert.apps.temperature.models import TemperatureLog
+from weather_alert.apps.temperature.services.rollup_service import (
+    apply_readings,
+)
+
+
+@receiver(post_save, sender=TemperatureLog)
+def update_rollups(sender, instance: TemperatureLog, created: bool, **kwargs):
+    """
+    Mantém os agregados atualizados para logs gravados individualmente. As
+    gravações em lote do buffer atualizam os agregados diretamente.
+    """
+    if created and not kwargs.get('raw'):
+        apply_readings(
+            [(instance.location_id, instance.temperature, instance.timestamp)]
+        )
@@ -0,0 +1,17 @@
+from celery import shared_task
+
+from weather_alert.apps.temperature.services.retention_service import (
+    purge_expired_data,
+)
+
+
+@shared_task
+def purge_expired_temperature_data() -> dict:
+    """
+    Remove os logs de temperatura e agregados fora do prazo de retenção, em
+    blocos limitados de chaves primárias.
+
+    Returns:
+        dict: Linhas removidas por tabela e o tempo gasto, em segundos.
+    """
+    return purge_expired_data()
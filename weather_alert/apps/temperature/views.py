@@ -1,26 +1,52 @@
+from datetime import datetime
+from typing import Literal
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
 from loguru import logger
 from ninja import Query, Router
 
+from weather_alert.api.pagination import (
+    InvalidCursor,
+    paginate_by_timestamp,
+    set_next_page_headers,
+)
 from weather_alert.api.schemas import MessageSchema
 
 from .models import TemperatureLog
-from .schemas import TemperatureLogSchema
+from .schemas import TemperatureAggregateSchema, TemperatureLogSchema
+from .services.aggregation_service import Bucket, aggregate_temperatures
+from .services.export_service import FORMATS, stream_temperature_logs
 
 temperature_router = Router(tags=['Temperature Logs'])
 
 
-@temperature_router.get('/', response=list[TemperatureLogSchema])
+@temperature_router.get(
+    '/', response={200: list[TemperatureLogSchema], 400: MessageSchema}
+)
 async def list_temperature_logs(
-    request, location_id: int = Query(default=None)
+    request,
+    response: HttpResponse,
+    location_id: int = Query(default=None),
+    limit: int = Query(
+        default=settings.API_PAGE_SIZE, ge=1, le=settings.API_MAX_PAGE_SIZE
+    ),
+    cursor: str = Query(default=None),
 ):
     """
-    Lista todos os registros de temperatura, com opção de filtro por localização.
+    Lista os registros de temperatura, do mais recente ao mais antigo, com
+    opção de filtro por localização e paginação por cursor. O cursor da
+    próxima página vem nos cabeçalhos `X-Next-Cursor` e `Link`.
 
     Args:
         location_id (int, optional): ID da localização para filtrar os registros.
+        limit (int, optional): Quantidade máxima de registros na página.
+        cursor (str, optional): Cursor `X-Next-Cursor` da página anterior.
 
     Returns:
-        list[TemperatureLogSchema]: Lista de registros de temperatura.
+        200: Lista de registros de temperatura da página.
+        400: Se o cursor for inválido.
     """
     if location_id is not None:
         logger.info(
@@ -31,11 +57,109 @@ async def list_temperature_logs(
         logger.info('Listando todos os logs de temperatura')
         queryset = TemperatureLog.objects.all()
 
-    logs = [log async for log in queryset.order_by('-timestamp')]
+    try:
+        logs, next_cursor = await paginate_by_timestamp(
+            queryset, limit, cursor
+        )
+    except InvalidCursor:
+        logger.warning(f'Cursor inválido: {cursor}')
+        return 400, MessageSchema(message='Cursor inválido')
+
     logger.info(f'{len(logs)} registros de temperatura encontrados')
+    set_next_page_headers(request, response, next_cursor)
     return logs
 
 
+@temperature_router.get(
+    '/aggregate/',
+    response={200: TemperatureAggregateSchema, 400: MessageSchema},
+)
+async def aggregate_temperature_logs(
+    request,
+    start: datetime,
+    bucket: Bucket = 'hour',
+    end: datetime = Query(default=None),
+    location_ids: list[int] = Query(default=None),
+):
+    """
+    Agrega os registros de temperatura (mínima, máxima, média e quantidade)
+    por localização e intervalo de tempo, calculados no banco de dados.
+
+    Args:
+        start (datetime): Início do período (inclusivo).
+        bucket (str, optional): Tamanho do intervalo: hour, day, week ou month.
+        end (datetime, optional): Fim do período (exclusivo). Padrão: agora.
+        location_ids (list[int], optional): Localizações a considerar. Padrão: todas.
+
+    Returns:
+        200: Séries agregadas por localização.
+        400: Se o período for inválido.
+    """
+    start, end = (
+        timezone.make_aware(value)
+        if value and timezone.is_naive(value)
+        else value
+        for value in (start, end)
+    )
+    # sem `end` a consulta não tem limite superior, o que permite usar os
+    # agregados mesmo quando agora não cai no início de uma hora
+    until = end or timezone.now()
+    if start >= until:
+        logger.warning(f'Período inválido para agregação: {start} - {until}')
+        return 400, MessageSchema(message='Período inválido')
+
+    logger.info(
+        f'Agregando logs de temperatura por {bucket} entre {start} e {until}'
+    )
+    series = await aggregate_temperatures(bucket, start, end, location_ids)
+    logger.info(f'{len(series)} séries de temperatura agregadas')
+
+    return {'bucket': bucket, 'start': start, 'end': until, 'series': series}
+
+
+@temperature_router.get('/export/', response={400: MessageSchema})
+async def export_temperature_logs(
+    request,
+    format: Literal['ndjson', 'csv'] = 'ndjson',
+    start: datetime = Query(default=None),
+    end: datetime = Query(default=None),
+    location_ids: list[int] = Query(default=None),
+):
+    """
+    Exporta os registros de temperatura em NDJSON ou CSV, em ordem
+    cronológica, enviando as linhas à medida que são lidas do banco.
+
+    Args:
+        format (str, optional): Formato do arquivo: ndjson ou csv.
+        start (datetime, optional): Início do período (inclusivo).
+        end (datetime, optional): Fim do período (exclusivo).
+        location_ids (list[int], optional): Localizações a considerar. Padrão: todas.
+
+    Returns:
+        200: Arquivo transmitido em partes.
+        400: Se o período for inválido.
+    """
+    start, end = (
+        timezone.make_aware(value)
+        if value and timezone.is_naive(value)
+        else value
+        for value in (start, end)
+    )
+    if start and end and start >= end:
+        logger.warning(f'Período inválido para exportação: {start} - {end}')
+        return 400, MessageSchema(message='Período inválido')
+
+    logger.info(f'Exportando logs de temperatura em {format}')
+    response = StreamingHttpResponse(
+        stream_temperature_logs(format, start, end, location_ids),
+        content_type=FORMATS[format],
+    )
+    response[
+        'Content-Disposition'
+    ] = f'attachment; filename="temperature_logs.{format}"'
+    return response
+
+
 @temperature_router.get(
     '/{id}/', response={200: TemperatureLogSchema, 404: MessageSchema}
 )
@@ -0,0 +1,266 @@
+"""
+Benchmark do pipeline de verificação de temperatura.
+
+Cria localidades e configurações de alerta, aponta o Open-Meteo e o N8N para
+servidores locais com latência configurável e mede vazão, latência
+(p50/p95/p99) e quantidade de queries de cada etapa. Tudo roda dentro de uma
+transação desfeita ao final, sem deixar dados no banco, e com caches em
+memória próprios e sem `REDIS_URL`, de modo que leituras, contadores e o
+limitador de requisições compartilhados pelos workers não são tocados.
+"""
+
+import random
+import statistics
+import time
+import tomllib
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from itertools import repeat
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from weather_alert.apps.alerts.models import AlertConfig
+from weather_alert.apps.alerts.services.alert_service import (
+    create_alert_and_notify,
+    dispatch_pending_notifications,
+)
+from weather_alert.apps.alerts.tasks import (
+    check_location_temperature,
+    check_temperature_batch,
+)
+from weather_alert.apps.location.models import Location
+from weather_alert.apps.temperature.services.temperature_log_buffer import (
+    temperature_log_buffer,
+)
+from weather_alert.benchmarks.standin import StandInServer
+
+
+class _Rollback(Exception):
+    pass
+
+
+# the rollback does not undo cache writes, so the run gets its own caches
+_ISOLATED_CACHES = {
+    alias: {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': f'benchmark-{alias}',
+    }
+    for alias in ('default', 'local')
+}
+
+
+def project_version() -> str:
+    """
+    Versão do projeto declarada no `pyproject.toml`.
+    """
+    with open(settings.BASE_DIR / 'pyproject.toml', 'rb') as f:
+        return tomllib.load(f)['project']['version']
+
+
+def summarize(
+    latencies: list[float], seconds: float, operations: int, queries: int
+) -> dict:
+    """
+    Resume as medições de um cenário.
+
+    Args:
+        latencies (list[float]): Duração, em segundos, de cada chamada.
+        seconds (float): Duração total do cenário.
+        operations (int): Quantidade de operações (verificações, envios...).
+        queries (int): Quantidade de queries executadas.
+
+    Returns:
+        dict: Vazão, percentis de latência em milissegundos e queries.
+    """
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    if len(latencies_ms) >= 2:
+        cuts = statistics.quantiles(latencies_ms, n=100, method='inclusive')
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies_ms[0] if latencies_ms else 0.0
+
+    return {
+        'operations': operations,
+        'calls': len(latencies_ms),
+        'seconds': round(seconds, 4),
+        'throughput_per_second': (
+            round(operations / seconds, 2) if seconds else 0.0
+        ),
+        'latency_ms': {
+            'p50': round(p50, 3),
+            'p95': round(p95, 3),
+            'p99': round(p99, 3),
+            'max': round(latencies_ms[-1], 3) if latencies_ms else 0.0,
+        },
+        'queries': queries,
+        'queries_per_operation': (
+            round(queries / operations, 2) if operations else 0.0
+        ),
+    }
+
+
+def _measure(calls: Iterable[Callable], stop_on_zero: bool = False) -> dict:
+    """
+    Executa as chamadas em sequência, medindo cada uma e as queries geradas.
+
+    Cada chamada pode retornar a quantidade de operações que realizou; caso
+    contrário conta como uma operação. Com `stop_on_zero`, a execução para na
+    primeira chamada que não realizar nenhuma operação.
+    """
+    latencies = []
+    operations = 0
+
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        for call in calls:
+            call_started = time.perf_counter()
+            result = call()
+            elapsed = time.perf_counter() - call_started
+            if stop_on_zero and result == 0:
+                break
+            latencies.append(elapsed)
+            operations += result if isinstance(result, int) else 1
+        temperature_log_buffer.flush()
+        seconds = time.perf_counter() - started
+
+    return summarize(latencies, seconds, operations, len(queries))
+
+
+def _seed(locations: int, configs_per_location: int, seed: int) -> list[int]:
+    """
+    Cria localidades e configurações de alerta com limites entre 20 °C e 40 °C.
+    """
+    rng = random.Random(seed)
+    created = Location.objects.bulk_create(
+        [
+            Location(
+                name=f'Benchmark {i}',
+                latitude=round(rng.uniform(-33.0, 5.0), 4),
+                longitude=round(rng.uniform(-73.0, -35.0), 4),
+            )
+            for i in range(locations)
+        ]
+    )
+    configs = AlertConfig.objects.bulk_create(
+        [
+            AlertConfig(
+                location=location,
+                temperature_threshold=round(rng.uniform(20.0, 40.0), 1),
+            )
+            for location in created
+            for _ in range(configs_per_location)
+        ]
+    )
+    return [config.id for config in configs]
+
+
+def run_check_pipeline_benchmark(
+    locations: int = 100,
+    configs_per_location: int = 1,
+    batch_size: int = 100,
+    temperature: float = 30.0,
+    forecast_latency: float = 0.0,
+    webhook_latency: float = 0.0,
+    use_cache: bool = False,
+    seed: int = 0,
+) -> dict:
+    """
+    Mede `check_location_temperature`, `check_temperature_batch`,
+    `create_alert_and_notify` e o envio do outbox contra servidores locais.
+
+    Args:
+        locations (int): Quantidade de localidades criadas.
+        configs_per_location (int): Configurações de alerta por localidade.
+        batch_size (int): Configurações por chamada de `check_temperature_batch`.
+        temperature (float): Temperatura devolvida pelo Open-Meteo simulado.
+        forecast_latency (float): Latência, em segundos, do Open-Meteo simulado.
+        webhook_latency (float): Latência, em segundos, do N8N simulado.
+        use_cache (bool): Mantém o cache de temperaturas ativo.
+        seed (int): Semente dos dados gerados.
+
+    Returns:
+        dict: Registro do benchmark com parâmetros, ambiente e resultados por cenário.
+    """
+    parameters = {
+        'locations': locations,
+        'configs_per_location': configs_per_location,
+        'batch_size': batch_size,
+        'temperature': temperature,
+        'forecast_latency': forecast_latency,
+        'webhook_latency': webhook_latency,
+        'use_cache': use_cache,
+        'seed': seed,
+    }
+    results = {}
+
+    with StandInServer(
+        temperature, forecast_latency, webhook_latency
+    ) as standin, override_settings(
+        OPENMETEO_URL=standin.forecast_url,
+        N8N_WEBHOOK_URL=standin.webhook_url,
+        FAKE_WEBHOOK=False,
+        N8N_OUTBOX_DISPATCH_ON_COMMIT=False,
+        OPENMETEO_CACHE_TTL=(settings.OPENMETEO_CACHE_TTL if use_cache else 0),
+        CACHES=_ISOLATED_CACHES,
+        REDIS_URL='',
+    ):
+        try:
+            with transaction.atomic():
+                ids = _seed(locations, configs_per_location, seed)
+                configs = list(
+                    AlertConfig.objects.select_related('location').filter(
+                        id__in=ids
+                    )
+                )
+
+                location_ids = {config.location_id for config in configs}
+                results['check_location_temperature'] = _measure(
+                    [
+                        lambda id=id: check_location_temperature(id)
+                        for id in location_ids
+                    ]
+                )
+                # cada cenário parte do estado ok, para que todos criem alertas
+                AlertConfig.objects.filter(id__in=ids).update(
+                    state=AlertConfig.State.OK
+                )
+                results['check_temperature_batch'] = _measure(
+                    [
+                        lambda chunk=ids[i : i + batch_size]: (
+                            check_temperature_batch(chunk)
+                        )
+                        for i in range(0, len(ids), batch_size)
+                    ]
+                )
+                results['create_alert_and_notify'] = _measure(
+                    [
+                        lambda config=config: create_alert_and_notify(
+                            location=config.location,
+                            temperature=config.temperature_threshold + 1,
+                            alert_config=config,
+                        )
+                        for config in configs
+                    ]
+                )
+                results['dispatch_notifications'] = _measure(
+                    repeat(lambda: dispatch_pending_notifications()['sent']),
+                    stop_on_zero=True,
+                )
+                results['upstream_requests'] = {
+                    'open_meteo': standin.forecast_requests,
+                    'n8n': standin.webhook_requests,
+                }
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    return {
+        'benchmark': 'check_pipeline',
+        'version': project_version(),
+        'recorded_at': datetime.now(timezone.utc).isoformat(),
+        'database': connection.vendor,
+        'parameters': parameters,
+        'results': results,
+    }
@@ -0,0 +1,116 @@
+"""
+Benchmark da serialização das listagens da API.
+
+Monta páginas de logs de temperatura e de alertas com os schemas de resposta,
+no mesmo formato que o Ninja entrega ao renderizador, e mede a vazão
+(itens serializados por segundo) e a latência de cada renderizador. Não usa o
+banco: as instâncias dos modelos são criadas apenas em memória.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from ninja.renderers import JSONRenderer
+
+from weather_alert.api.renderers import ORJSONRenderer
+from weather_alert.apps.alerts.schemas import AlertSchema
+from weather_alert.apps.temperature.models import TemperatureLog
+from weather_alert.apps.temperature.schemas import TemperatureLogSchema
+from weather_alert.benchmarks.check_pipeline import project_version, summarize
+
+RENDERERS = {
+    'json': JSONRenderer(),
+    'orjson': ORJSONRenderer(),
+}
+
+
+def _temperature_log_page(items: int, rng: random.Random) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    logs = [
+        TemperatureLog(
+            id=i,
+            location_id=rng.randint(1, 500),
+            temperature=round(rng.uniform(-10.0, 45.0), 2),
+            timestamp=now - timedelta(seconds=i * 37, microseconds=i),
+        )
+        for i in range(items, 0, -1)
+    ]
+    return [TemperatureLogSchema.from_orm(log).model_dump() for log in logs]
+
+
+def _alert_page(items: int, rng: random.Random) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    alerts = [
+        {
+            'id': i,
+            'location_id': rng.randint(1, 500),
+            'location_name': f'Localidade {rng.randint(1, 500)}',
+            'temperature': round(rng.uniform(30.0, 45.0), 2),
+            'threshold': round(rng.uniform(20.0, 40.0), 1),
+            'timestamp': now - timedelta(minutes=i, microseconds=i),
+            'notified': rng.random() < 0.5,
+        }
+        for i in range(items, 0, -1)
+    ]
+    return [AlertSchema(**alert).model_dump() for alert in alerts]
+
+
+def run_json_renderer_benchmark(
+    items: int = 1000, repeat: int = 50, seed: int = 0
+) -> dict:
+    """
+    Mede cada renderizador em `RENDERERS` sobre uma página de logs de
+    temperatura e uma de alertas.
+
+    Args:
+        items (int): Itens por página.
+        repeat (int): Quantas vezes cada página é serializada.
+        seed (int): Semente dos dados gerados.
+
+    Returns:
+        dict: Registro do benchmark com parâmetros e, por página, o resultado
+        de cada renderizador, o tamanho da resposta e o ganho do `orjson`.
+    """
+    rng = random.Random(seed)
+    pages = {
+        'list_temperature_logs': _temperature_log_page(items, rng),
+        'list_alerts': _alert_page(items, rng),
+    }
+
+    results = {}
+    for page_name, data in pages.items():
+        page_results = {}
+        for renderer_name, renderer in RENDERERS.items():
+            latencies = []
+            started = time.perf_counter()
+            for _ in range(repeat):
+                call_started = time.perf_counter()
+                body = renderer.render(None, data, response_status=200)
+                latencies.append(time.perf_counter() - call_started)
+            seconds = time.perf_counter() - started
+
+            page_results[renderer_name] = summarize(
+                latencies, seconds, items * repeat, 0
+            )
+            page_results[renderer_name]['bytes'] = len(
+                body if isinstance(body, bytes) else body.encode()
+            )
+
+        baseline = page_results['json']['throughput_per_second']
+        page_results['speedup'] = (
+            round(
+                page_results['orjson']['throughput_per_second'] / baseline, 2
+            )
+            if baseline
+            else 0.0
+        )
+        results[page_name] = page_results
+
+    return {
+        'benchmark': 'json_renderer',
+        'version': project_version(),
+        'recorded_at': datetime.now(timezone.utc).isoformat(),
+        'parameters': {'items': items, 'repeat': repeat, 'seed': seed},
+        'results': results,
+    }
@@ -0,0 +1,112 @@
+"""
+Servidores HTTP locais que simulam o Open-Meteo e o webhook do N8N.
+
+Usados pelos benchmarks para medir o pipeline de verificação sem acesso à
+rede, com latência configurável em cada resposta.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class StandInServer:
+    """
+    Servidor local com as rotas `/v1/forecast` (Open-Meteo, inclusive a
+    consulta multi-localização) e `/webhook` (N8N).
+
+    Attributes:
+        forecast_url (str): URL a ser usada em `OPENMETEO_URL`.
+        webhook_url (str): URL a ser usada em `N8N_WEBHOOK_URL`.
+        forecast_requests (int): Requisições recebidas pelo Open-Meteo simulado.
+        webhook_requests (int): Requisições recebidas pelo N8N simulado.
+    """
+
+    def __init__(
+        self,
+        temperature: float = 30.0,
+        forecast_latency: float = 0.0,
+        webhook_latency: float = 0.0,
+    ):
+        """
+        Args:
+            temperature (float): Temperatura devolvida para toda coordenada.
+            forecast_latency (float): Atraso, em segundos, das respostas do Open-Meteo.
+            webhook_latency (float): Atraso, em segundos, das respostas do N8N.
+        """
+        self.temperature = temperature
+        self.forecast_latency = forecast_latency
+        self.webhook_latency = webhook_latency
+        self.forecast_requests = 0
+        self.webhook_requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_port}'
+
+    @property
+    def forecast_url(self) -> str:
+        return f'{self.base_url}/v1/forecast'
+
+    @property
+    def webhook_url(self) -> str:
+        return f'{self.base_url}/webhook'
+
+    def __enter__(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                latitudes = query.get('latitude', [''])[0].split(',')
+
+                with standin._lock:
+                    standin.forecast_requests += 1
+                time.sleep(standin.forecast_latency)
+
+                results = [
+                    {'current_weather': {'temperature': standin.temperature}}
+                    for _ in latitudes
+                ]
+                self._reply(results[0] if len(results) == 1 else results)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+                with standin._lock:
+                    standin.webhook_requests += 1
+                time.sleep(standin.webhook_latency)
+
+                self._reply({'ok': True})
+
+            def _reply(self, data):
+                body = json.dumps(data).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
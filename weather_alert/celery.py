@@ -1,9 +1,128 @@
 import os
+import time
 
 from celery import Celery
+from celery.signals import (
+    beat_init,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'weather_alert.settings')
 
 app = Celery('weather_alert')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
+
+
+@beat_init.connect
+def reconcile_alert_schedules(**kwargs):
+    """
+    Ajusta os PeriodicTasks das verificações ao `ALERT_SCHEDULER_MODE` ao
+    iniciar o beat, de modo que trocar de modo não deixe localidades
+    verificadas duas vezes (ou nenhuma).
+    """
+    from weather_alert.apps.alerts.services.alert_config_service import (
+        reconcile_schedules,
+    )
+
+    reconcile_schedules()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_http_clients(**kwargs):
+    """
+    Fecha os pools de conexão HTTP do processo ao encerrar o worker,
+    inclusive os clientes assíncronos do event loop de `run_async`.
+
+    `worker_process_shutdown` cobre os processos filhos do pool prefork e
+    `worker_shutdown` cobre o processo principal (pools solo/threads).
+    """
+    from weather_alert.integrations.http_client import (
+        close_clients,
+        close_event_loop,
+    )
+
+    close_clients()
+    close_event_loop()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def flush_temperature_logs(**kwargs):
+    """
+    Grava os logs de temperatura ainda pendentes no buffer ao encerrar o worker.
+    """
+    from weather_alert.apps.temperature.services.temperature_log_buffer import (
+        temperature_log_buffer,
+    )
+
+    temperature_log_buffer.flush()
+
+
+@task_postrun.connect
+def flush_due_temperature_logs(**kwargs):
+    """
+    Grava o buffer de logs de temperatura se a janela de tempo tiver expirado.
+    """
+    from weather_alert.apps.temperature.services.temperature_log_buffer import (
+        temperature_log_buffer,
+    )
+
+    temperature_log_buffer.flush_if_due()
+
+
+_task_started_at: dict[str, float] = {}
+
+
+@task_prerun.connect
+def start_task_timer(task_id=None, **kwargs):
+    _task_started_at[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def observe_task_duration(task_id=None, task=None, state=None, **kwargs):
+    """
+    Registra a duração da task no histograma `weather_alert_task_seconds`.
+    """
+    from weather_alert.metrics import TASK_SECONDS
+
+    started_at = _task_started_at.pop(task_id, None)
+    if started_at is not None:
+        TASK_SECONDS.labels(task=task.name, state=state or 'UNKNOWN').observe(
+            time.perf_counter() - started_at
+        )
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs):
+    """
+    Inicia o servidor de métricas do worker em `METRICS_WORKER_PORT`.
+
+    Com `PROMETHEUS_MULTIPROC_DIR` o servidor, no processo principal, exporta
+    as métricas somadas de todos os processos filhos do pool.
+    """
+    from django.conf import settings
+    from prometheus_client import start_http_server
+
+    from weather_alert.metrics import get_registry
+
+    if settings.METRICS_WORKER_PORT:
+        start_http_server(
+            settings.METRICS_WORKER_PORT, registry=get_registry()
+        )
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    """
+    Descarta as métricas de gauge do processo filho encerrado.
+    """
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid or os.getpid())
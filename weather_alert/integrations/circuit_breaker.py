@@ -0,0 +1,205 @@
+"""
+Circuit breaker das integrações HTTP.
+
+Depois de `<PREFIXO>_CIRCUIT_FAILURE_THRESHOLD` falhas seguidas (erros de
+transporte, 429 ou 5xx; 0 desativa o circuito) o circuito abre e as chamadas falham imediatamente
+com `CircuitOpen`, sem ocupar o worker com novas tentativas. Passados
+`<PREFIXO>_CIRCUIT_RESET_SECONDS` segundos, uma única chamada de teste é
+liberada (meio-aberto): se tiver sucesso o circuito fecha, senão volta a abrir.
+
+O estado é mantido por processo, assim como os clientes HTTP.
+"""
+
+import threading
+import time
+
+import httpx
+from django.conf import settings
+from loguru import logger
+
+from weather_alert.metrics import (
+    CIRCUIT_FAILURES,
+    CIRCUIT_OPENED,
+    CIRCUIT_REJECTED,
+    CIRCUIT_STATE,
+)
+
+_lock = threading.Lock()
+_breakers: dict[str, 'CircuitBreaker'] = {}
+
+
+class CircuitOpen(Exception):
+    """
+    O circuito da integração está aberto e a chamada não foi feita.
+    """
+
+
+def is_failure(error: BaseException) -> bool:
+    """
+    Indica se o erro conta como falha da integração (e não da requisição).
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de uma integração, usado como gerenciador de contexto em
+    volta de cada tentativa de chamada.
+
+    O estado e os contadores também são exportados como métricas Prometheus
+    `weather_alert_circuit_*`, rotuladas pela integração.
+
+    Attributes:
+        state (str): `closed`, `open` ou `half_open`.
+        failures (int): Falhas seguidas desde o último sucesso.
+        opened (int): Quantidade de vezes que o circuito abriu neste processo.
+        rejected (int): Chamadas recusadas com o circuito aberto.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    # values of the weather_alert_circuit_state gauge
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str):
+        self.name = name
+        self._prefix = name.upper()
+        self._lock = threading.Lock()
+        self._opened_at: float = None
+        self._probing = False
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._export_state()
+
+    @property
+    def failure_threshold(self) -> int:
+        return getattr(settings, f'{self._prefix}_CIRCUIT_FAILURE_THRESHOLD')
+
+    @property
+    def reset_seconds(self) -> float:
+        return getattr(settings, f'{self._prefix}_CIRCUIT_RESET_SECONDS')
+
+    def __enter__(self):
+        self.before_call()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc is None:
+            self.record_success()
+        elif is_failure(exc):
+            self.record_failure()
+        else:
+            self._release_probe()
+        return False
+
+    def before_call(self):
+        """
+        Libera a chamada ou a recusa se o circuito estiver aberto.
+
+        Raises:
+            CircuitOpen: Se o circuito estiver aberto ou já houver uma chamada
+                de teste em andamento.
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_seconds:
+                    self._reject()
+                self.state = self.HALF_OPEN
+                self._export_state()
+                logger.info(f'Circuito de {self.name} meio-aberto, testando')
+
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    self._reject()
+                self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.success(f'Circuito de {self.name} fechado')
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+            self._export_state()
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            CIRCUIT_FAILURES.labels(integration=self.name).inc()
+            threshold = self.failure_threshold
+            if self.state == self.HALF_OPEN or (
+                threshold and self.failures >= threshold
+            ):
+                if self.state != self.OPEN:
+                    self.opened += 1
+                    CIRCUIT_OPENED.labels(integration=self.name).inc()
+                    logger.error(
+                        f'Circuito de {self.name} aberto após {self.failures} falhas seguidas'
+                    )
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._export_state()
+            self._probing = False
+
+    def _reject(self):
+        self.rejected += 1
+        CIRCUIT_REJECTED.labels(integration=self.name).inc()
+        raise CircuitOpen(self.name)
+
+    def _export_state(self):
+        CIRCUIT_STATE.labels(integration=self.name).set(
+            self._STATE_VALUES[self.state]
+        )
+
+    def _release_probe(self):
+        with self._lock:
+            self._probing = False
+
+    def reset(self):
+        """
+        Fecha o circuito e zera os contadores.
+        """
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = self.opened = self.rejected = 0
+            self._opened_at = None
+            self._probing = False
+            self._export_state()
+
+    def stats(self) -> dict:
+        """
+        Estado e contadores deste processo.
+        """
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'opened': self.opened,
+            'rejected': self.rejected,
+        }
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    Retorna o circuit breaker da integração `name`, criando-o na primeira chamada.
+    """
+    with _lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def reset_circuit_breakers():
+    """
+    Fecha todos os circuitos deste processo.
+    """
+    with _lock:
+        breakers = list(_breakers.values())
+    for breaker in breakers:
+        breaker.reset()
@@ -0,0 +1,193 @@
+"""
+Registro de clientes HTTP compartilhados por processo.
+
+Cada processo (worker do Celery, uvicorn) mantém um `httpx.Client` por nome
+de integração, com pool de conexões keep-alive e HTTP/2, para que verificações
+repetidas reaproveitem conexões já abertas. Clientes assíncronos são mantidos
+por event loop, já que suas conexões não podem ser compartilhadas entre loops.
+
+O código síncrono (tasks do Celery) executa corrotinas com `run_async`, que
+reaproveita um event loop por thread em vez de criar um novo a cada chamada
+como `asyncio.run`. Assim os clientes assíncronos, e suas conexões, duram o
+processo inteiro e não apenas uma task.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+
+import httpx
+from django.conf import settings
+from loguru import logger
+
+_lock = threading.Lock()
+_pid = os.getpid()
+_clients: dict[str, httpx.Client] = {}
+_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]
+] = weakref.WeakKeyDictionary()
+# persistent event loop of each thread, see run_async
+_loops = threading.local()
+
+
+def _client_options() -> dict:
+    """
+    Monta os limites de pool e timeouts a partir das configurações.
+    """
+    return {
+        'http2': True,
+        'limits': httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        ),
+        'timeout': httpx.Timeout(
+            settings.HTTP_CLIENT_TIMEOUT,
+            connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+        ),
+    }
+
+
+def _reset_after_fork():
+    """
+    Descarta os clientes herdados do processo pai após um fork.
+
+    Os sockets herdados pertencem ao processo pai, por isso os clientes são
+    apenas esquecidos, sem serem fechados.
+    """
+    global _pid
+
+    if os.getpid() != _pid:
+        _pid = os.getpid()
+        _clients.clear()
+        _async_clients.clear()
+
+
+def get_client(name: str = 'default') -> httpx.Client:
+    """
+    Retorna o cliente HTTP síncrono compartilhado do processo atual.
+
+    Args:
+        name (str): Nome da integração dona do pool de conexões.
+
+    Returns:
+        httpx.Client: Cliente com pool de conexões keep-alive.
+    """
+    with _lock:
+        _reset_after_fork()
+        client = _clients.get(name)
+        if client is None or client.is_closed:
+            client = httpx.Client(**_client_options())
+            _clients[name] = client
+            logger.info(f"Cliente HTTP '{name}' criado (pid={_pid})")
+        return client
+
+
+def get_async_client(name: str = 'default') -> httpx.AsyncClient:
+    """
+    Retorna o cliente HTTP assíncrono compartilhado do event loop atual.
+
+    Args:
+        name (str): Nome da integração dona do pool de conexões.
+
+    Returns:
+        httpx.AsyncClient: Cliente com pool de conexões keep-alive.
+
+    Raises:
+        RuntimeError: Se chamado fora de um event loop em execução.
+    """
+    loop = asyncio.get_running_loop()
+
+    with _lock:
+        _reset_after_fork()
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(name)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(**_client_options())
+            clients[name] = client
+            logger.info(
+                f"Cliente HTTP assíncrono '{name}' criado (pid={_pid})"
+            )
+        return client
+
+
+def _thread_loop() -> asyncio.AbstractEventLoop | None:
+    """
+    Event loop persistente da thread atual, se ainda utilizável.
+
+    Um loop herdado do processo pai após um fork é descartado sem ser
+    fechado, como os clientes.
+    """
+    loop = getattr(_loops, 'loop', None)
+    if loop is None or loop.is_closed() or _loops.pid != os.getpid():
+        return None
+    return loop
+
+
+def run_async(coro):
+    """
+    Executa a corrotina no event loop persistente da thread atual.
+
+    Substitui `asyncio.run` no código síncrono: o loop não é fechado ao final,
+    de modo que os clientes de `get_async_client` mantêm as conexões abertas
+    entre as chamadas. Não pode ser chamada de dentro de um event loop em
+    execução.
+
+    Args:
+        coro: Corrotina a ser executada.
+
+    Returns:
+        O resultado da corrotina.
+    """
+    loop = _thread_loop()
+    if loop is None:
+        loop = asyncio.new_event_loop()
+        _loops.loop, _loops.pid = loop, os.getpid()
+    return loop.run_until_complete(coro)
+
+
+def close_event_loop():
+    """
+    Fecha os clientes assíncronos e o event loop persistente da thread atual.
+    """
+    loop = _thread_loop()
+    if loop is None:
+        return
+
+    loop.run_until_complete(aclose_async_clients())
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+
+
+def close_clients():
+    """
+    Fecha todos os clientes síncronos do processo atual.
+    """
+    with _lock:
+        _reset_after_fork()
+        clients = list(_clients.values())
+        _clients.clear()
+
+    for client in clients:
+        client.close()
+
+    if clients:
+        logger.info(f'{len(clients)} clientes HTTP fechados (pid={_pid})')
+
+
+async def aclose_async_clients():
+    """
+    Fecha os clientes assíncronos do event loop atual.
+
+    Deve ser aguardada antes de o loop terminar (por exemplo, ao final da
+    corrotina passada para `asyncio.run`). O loop de `run_async` é fechado
+    por `close_event_loop`.
+    """
+    loop = asyncio.get_running_loop()
+
+    with _lock:
+        clients = list(_async_clients.pop(loop, {}).values())
+
+    for client in clients:
+        await client.aclose()
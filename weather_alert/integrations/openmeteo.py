@@ -1,13 +1,87 @@
+import asyncio
+import time
+from collections.abc import Iterable, Iterator
+
 import httpx
 import stamina
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from loguru import logger
 
+from weather_alert.integrations.circuit_breaker import get_circuit_breaker
+from weather_alert.integrations.http_client import get_async_client, get_client
+from weather_alert.integrations.rate_limiter import get_rate_limiter
+from weather_alert.integrations.temperature_cache import (
+    get_cached_temperatures,
+    get_last_known_temperature,
+    record_coalescing,
+    set_cached_temperatures,
+)
+from weather_alert.metrics import OPENMETEO_REQUEST_SECONDS, observe_latency
+
+Coordinate = tuple[float, float]
+
+
+def snap_coordinate(
+    latitude: float, longitude: float, resolution: float = None
+) -> Coordinate:
+    """
+    Ajusta a coordenada ao centro da célula da grade que a contém.
+
+    O Open-Meteo resolve cada coordenada para o ponto mais próximo da grade do
+    modelo, então localidades na mesma célula recebem a mesma leitura.
+
+    Args:
+        latitude (float): Latitude da localização.
+        longitude (float): Longitude da localização.
+        resolution (float, optional): Tamanho da célula em graus.
+            Padrão: `OPENMETEO_GRID_RESOLUTION` (0 desativa o ajuste).
+
+    Returns:
+        tuple[float, float]: Coordenada ajustada à grade.
+    """
+    if resolution is None:
+        resolution = settings.OPENMETEO_GRID_RESOLUTION
+    if not resolution:
+        return (float(latitude), float(longitude))
+    return (
+        round(round(latitude / resolution) * resolution, 6),
+        round(round(longitude / resolution) * resolution, 6),
+    )
+
+
+def _group_by_cell(
+    coordinates: Iterable[Coordinate],
+) -> tuple[dict[Coordinate, Coordinate], list[Coordinate]]:
+    """
+    Associa cada coordenada distinta à sua célula da grade.
+
+    Returns:
+        tuple: A célula de cada coordenada e a lista de células distintas.
+    """
+    cells = {}
+    for latitude, longitude in coordinates:
+        coordinate = (float(latitude), float(longitude))
+        if coordinate not in cells:
+            cells[coordinate] = snap_coordinate(*coordinate)
+
+    unique_cells = list(dict.fromkeys(cells.values()))
+    record_coalescing(len(cells), len(unique_cells))
+    if len(unique_cells) < len(cells):
+        logger.info(
+            f'{len(cells)} coordenadas agrupadas em {len(unique_cells)} células da grade'
+        )
+    return cells, unique_cells
+
 
-@stamina.retry(on=httpx.HTTPStatusError, attempts=5, wait_initial=1)
 def get_current_temperature(latitude: float, longitude: float) -> float:
     """
     Obtém a temperatura atual para uma localização específica usando a API Open-Meteo.
 
+    A coordenada é ajustada à grade de `OPENMETEO_GRID_RESOLUTION` e leituras
+    recentes de coordenadas próximas são servidas pelo cache de temperaturas,
+    sem nova chamada à API.
+
     Args:
         latitude (float): Latitude da localização.
         longitude (float): Longitude da localização.
@@ -17,6 +91,65 @@ def get_current_temperature(latitude: float, longitude: float) -> float:
 
     Raises:
         httpx.HTTPStatusError: Se a requisição falhar ou retornar um status de erro.
+        RateLimited: Se o limite de requisições ao Open-Meteo não liberar a chamada a tempo.
+        CircuitOpen: Se o circuito do Open-Meteo estiver aberto.
+    """
+    coordinate = snap_coordinate(latitude, longitude)
+    cached = get_cached_temperatures([coordinate])
+    if coordinate in cached:
+        logger.info(
+            f'Temperatura em cache para lat={latitude}, lon={longitude}: {cached[coordinate]}°C'
+        )
+        return cached[coordinate]
+
+    temp = _fetch_current_temperature(*coordinate)
+    set_cached_temperatures({coordinate: temp})
+    return temp
+
+
+def get_stale_temperature(
+    latitude: float, longitude: float
+) -> tuple[float, float] | None:
+    """
+    Obtém a última leitura conhecida de uma localização, para ser usada quando
+    o Open-Meteo estiver indisponível.
+
+    Args:
+        latitude (float): Latitude da localização.
+        longitude (float): Longitude da localização.
+
+    Returns:
+        tuple[float, float] | None: Temperatura em graus Celsius e idade da
+        leitura em segundos, ou `None` se não houver leitura dentro de
+        `OPENMETEO_STALE_MAX_AGE`.
+    """
+    last_known = get_last_known_temperature(
+        snap_coordinate(latitude, longitude)
+    )
+    if last_known is None:
+        return None
+    temperature, observed_at = last_known
+    return temperature, max(0.0, time.time() - observed_at)
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """
+    Indica se a falha de uma requisição ao Open-Meteo deve ser repetida.
+
+    Apenas erros 5xx são repetidos. Um 429 (ou outro 4xx) não melhora com
+    novas tentativas em poucos segundos, que só consumiriam a cota: a leitura
+    falha e a verificação recorre à última leitura conhecida.
+    """
+    return (
+        isinstance(exc, httpx.HTTPStatusError)
+        and exc.response.status_code >= 500
+    )
+
+
+@stamina.retry(on=_is_retryable, attempts=5, wait_initial=1)
+def _fetch_current_temperature(latitude: float, longitude: float) -> float:
+    """
+    Requisita a temperatura atual de uma coordenada à API Open-Meteo.
     """
     params = {
         'latitude': latitude,
@@ -27,16 +160,228 @@ def get_current_temperature(latitude: float, longitude: float) -> float:
         f'Requisitando temperatura para lat={latitude}, lon={longitude}'
     )
 
-    try:
-        with httpx.Client(http2=True) as client:
-            response = client.get(
-                'https://api.open-meteo.com/v1/forecast', params=params
-            )
-            response.raise_for_status()
+    with get_circuit_breaker('openmeteo'):
+        get_rate_limiter('openmeteo').acquire()
+        try:
+            with observe_latency(OPENMETEO_REQUEST_SECONDS, mode='single'):
+                response = get_client('openmeteo').get(
+                    settings.OPENMETEO_URL, params=params
+                )
+                response.raise_for_status()
             data = response.json()
             temp = data['current_weather']['temperature']
             logger.success(f'Temperatura encontrada: {temp}°C')
             return temp
-    except httpx.HTTPStatusError as e:
-        logger.error(f'Erro HTTP {e.response.status_code}: {e.response.text}')
-        raise e
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f'Erro HTTP {e.response.status_code}: {e.response.text}'
+            )
+            raise e
+
+
+def get_current_temperatures(
+    coordinates: Iterable[Coordinate],
+) -> dict[Coordinate, float]:
+    """
+    Obtém a temperatura atual de várias localizações usando a consulta
+    multi-localização da API Open-Meteo.
+
+    As coordenadas são agrupadas por célula da grade (`snap_coordinate`), as
+    leituras em cache são reaproveitadas e as células restantes são divididas
+    em lotes que respeitam
+    `OPENMETEO_MAX_COORDINATES_PER_REQUEST` e `OPENMETEO_MAX_QUERY_LENGTH`,
+    de modo que cada requisição atende várias localizações.
+
+    Args:
+        coordinates (Iterable[tuple[float, float]]): Pares (latitude, longitude).
+
+    Returns:
+        dict[tuple[float, float], float]: Temperatura atual em graus Celsius
+        para cada par (latitude, longitude) informado.
+
+    Raises:
+        httpx.HTTPStatusError: Se alguma requisição falhar ou retornar um status de erro.
+        RateLimited: Se o limite de requisições ao Open-Meteo não liberar a chamada a tempo.
+        CircuitOpen: Se o circuito do Open-Meteo estiver aberto.
+    """
+    cells, unique_cells = _group_by_cell(coordinates)
+    temperatures = get_cached_temperatures(unique_cells)
+    missing = [c for c in unique_cells if c not in temperatures]
+
+    for chunk in _chunk_coordinates(
+        missing,
+        max_size=settings.OPENMETEO_MAX_COORDINATES_PER_REQUEST,
+        max_query_length=settings.OPENMETEO_MAX_QUERY_LENGTH,
+    ):
+        fetched = dict(zip(chunk, _fetch_temperatures_chunk(chunk)))
+        set_cached_temperatures(fetched)
+        temperatures.update(fetched)
+
+    return {
+        coordinate: temperatures[cell] for coordinate, cell in cells.items()
+    }
+
+
+async def aget_current_temperatures(
+    coordinates: Iterable[Coordinate], concurrency: int = None
+) -> dict[Coordinate, float]:
+    """
+    Obtém a temperatura atual de várias localizações com requisições
+    concorrentes, limitadas por um semáforo.
+
+    Coordenadas na mesma célula da grade compartilham uma requisição e
+    leituras em cache são reaproveitadas. Uma coordenada cuja requisição
+    falhe é registrada no log e omitida do resultado, sem interromper as demais.
+
+    Args:
+        coordinates (Iterable[tuple[float, float]]): Pares (latitude, longitude).
+        concurrency (int, optional): Máximo de requisições simultâneas.
+            Padrão: `OPENMETEO_CONCURRENCY`.
+
+    Returns:
+        dict[tuple[float, float], float]: Temperatura atual em graus Celsius
+        para cada coordenada obtida com sucesso.
+    """
+    cells, unique_cells = await sync_to_async(_group_by_cell)(coordinates)
+    temperatures = await sync_to_async(get_cached_temperatures)(unique_cells)
+    missing = [c for c in unique_cells if c not in temperatures]
+    semaphore = asyncio.Semaphore(
+        concurrency or settings.OPENMETEO_CONCURRENCY
+    )
+
+    async def fetch(coordinate: Coordinate) -> float:
+        async with semaphore:
+            return await _afetch_current_temperature(*coordinate)
+
+    results = await asyncio.gather(
+        *(fetch(coordinate) for coordinate in missing), return_exceptions=True
+    )
+
+    fetched = {}
+    for coordinate, result in zip(missing, results):
+        if isinstance(result, Exception):
+            logger.error(
+                f'Falha ao obter temperatura para lat={coordinate[0]}, lon={coordinate[1]}: {result!r}'
+            )
+            continue
+        fetched[coordinate] = result
+
+    await sync_to_async(set_cached_temperatures)(fetched)
+    temperatures.update(fetched)
+    return {
+        coordinate: temperatures[cell]
+        for coordinate, cell in cells.items()
+        if cell in temperatures
+    }
+
+
+@stamina.retry(on=_is_retryable, attempts=5, wait_initial=1)
+async def _afetch_current_temperature(
+    latitude: float, longitude: float
+) -> float:
+    """
+    Requisita a temperatura atual de uma coordenada usando o cliente assíncrono.
+    """
+    params = {
+        'latitude': latitude,
+        'longitude': longitude,
+        'current_weather': True,
+    }
+
+    with get_circuit_breaker('openmeteo'):
+        await get_rate_limiter('openmeteo').aacquire()
+        try:
+            with observe_latency(OPENMETEO_REQUEST_SECONDS, mode='async'):
+                response = await get_async_client('openmeteo').get(
+                    settings.OPENMETEO_URL, params=params
+                )
+                response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f'Erro HTTP {e.response.status_code}: {e.response.text}'
+            )
+            raise e
+
+    return response.json()['current_weather']['temperature']
+
+
+@stamina.retry(on=_is_retryable, attempts=5, wait_initial=1)
+def _fetch_temperatures_chunk(chunk: list[Coordinate]) -> list[float]:
+    """
+    Requisita a temperatura atual de um lote de coordenadas em uma única chamada.
+
+    Args:
+        chunk (list[tuple[float, float]]): Lote de pares (latitude, longitude).
+
+    Returns:
+        list[float]: Temperaturas na mesma ordem das coordenadas do lote.
+
+    Raises:
+        httpx.HTTPStatusError: Se a requisição falhar ou retornar um status de erro.
+        ValueError: Se a resposta não tiver uma leitura para cada coordenada.
+        RateLimited: Se o limite de requisições ao Open-Meteo não liberar a chamada a tempo.
+        CircuitOpen: Se o circuito do Open-Meteo estiver aberto.
+    """
+    params = {
+        'latitude': ','.join(str(latitude) for latitude, _ in chunk),
+        'longitude': ','.join(str(longitude) for _, longitude in chunk),
+        'current_weather': True,
+    }
+    logger.info(f'Requisitando temperatura para {len(chunk)} localidades')
+
+    with get_circuit_breaker('openmeteo'):
+        get_rate_limiter('openmeteo').acquire(len(chunk))
+        try:
+            with observe_latency(OPENMETEO_REQUEST_SECONDS, mode='batch'):
+                response = get_client('openmeteo').get(
+                    settings.OPENMETEO_URL, params=params
+                )
+                response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f'Erro HTTP {e.response.status_code}: {e.response.text}'
+            )
+            raise e
+
+    # a API retorna um objeto para uma coordenada e uma lista para várias
+    if isinstance(data, dict):
+        data = [data]
+
+    if len(data) != len(chunk):
+        raise ValueError(
+            f'Open-Meteo retornou {len(data)} leituras para {len(chunk)} coordenadas'
+        )
+
+    temperatures = [item['current_weather']['temperature'] for item in data]
+    logger.success(f'{len(temperatures)} temperaturas encontradas')
+    return temperatures
+
+
+def _chunk_coordinates(
+    coordinates: list[Coordinate], max_size: int, max_query_length: int
+) -> Iterator[list[Coordinate]]:
+    """
+    Divide as coordenadas em lotes limitados pela quantidade de pares e pelo
+    tamanho dos parâmetros `latitude`/`longitude` na URL.
+    """
+    chunk = []
+    query_length = 0
+
+    for latitude, longitude in coordinates:
+        # valores + vírgula separadora em cada um dos dois parâmetros
+        pair_length = len(str(latitude)) + len(str(longitude)) + 2
+
+        if chunk and (
+            len(chunk) >= max_size
+            or query_length + pair_length > max_query_length
+        ):
+            yield chunk
+            chunk = []
+            query_length = 0
+
+        chunk.append((latitude, longitude))
+        query_length += pair_length
+
+    if chunk:
+        yield chunk
@@ -0,0 +1,258 @@
+"""
+Limitador de requisições (token bucket) compartilhado entre os workers.
+
+Com `REDIS_URL` configurada, o balde de fichas fica no Redis e é atualizado
+por um script Lua atômico, de modo que todos os processos respeitam o mesmo
+limite. Sem Redis (ou se ele estiver indisponível) cada processo usa um balde
+em memória com os mesmos parâmetros.
+"""
+
+import asyncio
+import math
+import threading
+import time
+
+import redis
+from django.conf import settings
+from loguru import logger
+
+from weather_alert.metrics import (
+    RATE_LIMIT_ACQUIRED,
+    RATE_LIMIT_SHED,
+    RATE_LIMIT_THROTTLED,
+    RATE_LIMIT_WAIT_SECONDS,
+)
+
+# devolve 0 quando as fichas foram reservadas ou quantos segundos faltam para
+# que estejam disponíveis (nesse caso nada é consumido)
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or burst
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+_lock = threading.Lock()
+_scripts: dict[str, redis.commands.core.Script] = {}
+_limiters: dict[str, 'RateLimiter'] = {}
+
+
+class RateLimited(Exception):
+    """
+    A espera por fichas excederia o tempo máximo configurado.
+    """
+
+
+class RateLimiter:
+    """
+    Token bucket de uma integração, configurado por
+    `<PREFIXO>_RATE_LIMIT_PER_SECOND` (0 desativa), `<PREFIXO>_RATE_LIMIT_BURST`
+    e `<PREFIXO>_RATE_LIMIT_MAX_WAIT`.
+
+    Os contadores também são exportados como métricas Prometheus
+    `weather_alert_rate_limit_*`, rotuladas pela integração.
+
+    Attributes:
+        acquired (int): Reservas concedidas neste processo.
+        throttled (int): Reservas que precisaram esperar.
+        shed (int): Reservas recusadas por exceder a espera máxima.
+        waited_seconds (float): Tempo total de espera neste processo.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._prefix = name.upper()
+        self._lock = threading.Lock()
+        self._tokens: float = None
+        self._updated_at: float = None
+        self.acquired = 0
+        self.throttled = 0
+        self.shed = 0
+        self.waited_seconds = 0.0
+
+    @property
+    def rate(self) -> float:
+        return getattr(settings, f'{self._prefix}_RATE_LIMIT_PER_SECOND')
+
+    @property
+    def burst(self) -> int:
+        return getattr(settings, f'{self._prefix}_RATE_LIMIT_BURST')
+
+    @property
+    def max_wait(self) -> float:
+        return getattr(settings, f'{self._prefix}_RATE_LIMIT_MAX_WAIT')
+
+    def acquire(self, tokens: int = 1):
+        """
+        Reserva fichas, aguardando com `time.sleep` até que estejam disponíveis.
+
+        Pedidos maiores que o balde são reservados em partes de até `burst`
+        fichas, de modo que todas as fichas são cobradas.
+
+        Raises:
+            RateLimited: Se a espera total exceder `max_wait`.
+        """
+        waited = 0.0
+        for chunk in self._chunks(tokens):
+            while (wait := self._wait_time(chunk, waited)) is not None:
+                time.sleep(wait)
+                waited += wait
+        self._record(waited)
+
+    async def aacquire(self, tokens: int = 1):
+        """
+        Versão assíncrona de `acquire`: a consulta ao Redis roda em uma thread
+        e a espera usa `asyncio.sleep`, sem bloquear o event loop.
+
+        Raises:
+            RateLimited: Se a espera total exceder `max_wait`.
+        """
+        waited = 0.0
+        for chunk in self._chunks(tokens):
+            while (
+                wait := await asyncio.to_thread(self._wait_time, chunk, waited)
+            ) is not None:
+                await asyncio.sleep(wait)
+                waited += wait
+        self._record(waited)
+
+    def _chunks(self, tokens: int) -> list[int]:
+        """
+        Divide o pedido em `ceil(tokens / burst)` reservas de até `burst`
+        fichas.
+
+        Raises:
+            RateLimited: Se só reabastecer as fichas além do balde já
+                exceder `max_wait`, antes de reservar qualquer uma.
+        """
+        burst = self.burst
+        rate = self.rate
+        if rate <= 0 or tokens <= burst:
+            return [tokens]
+
+        if (tokens - burst) / rate > self.max_wait:
+            self._shed(0.0)
+        count = math.ceil(tokens / burst)
+        return [burst] * (count - 1) + [tokens - burst * (count - 1)]
+
+    def _shed(self, waited: float):
+        with self._lock:
+            self.shed += 1
+        RATE_LIMIT_SHED.labels(integration=self.name).inc()
+        logger.warning(
+            f'Limite de requisições de {self.name} atingido, chamada descartada após {waited:.2f}s'
+        )
+        raise RateLimited(self.name)
+
+    def _wait_time(self, tokens: int, waited: float) -> float | None:
+        """
+        Tenta reservar as fichas e devolve quanto esperar antes de tentar de
+        novo, ou `None` se a reserva foi feita.
+        """
+        rate = self.rate
+        if rate <= 0:
+            return None
+
+        wait = self._reserve(tokens, rate)
+        if not wait:
+            return None
+
+        if waited + wait > self.max_wait:
+            self._shed(waited)
+        return wait
+
+    def _reserve(self, tokens: int, rate: float) -> float:
+        if settings.REDIS_URL:
+            try:
+                return float(
+                    _token_bucket_script()(
+                        keys=[f'ratelimit:{self.name}'],
+                        args=[rate, self.burst, tokens],
+                    )
+                )
+            except redis.RedisError as e:
+                logger.warning(
+                    f'Redis indisponível para o limitador de {self.name}, usando limite local: {e}'
+                )
+        return self._reserve_local(tokens, rate)
+
+    def _reserve_local(self, tokens: int, rate: float) -> float:
+        burst = self.burst
+        now = time.monotonic()
+        with self._lock:
+            if self._tokens is None:
+                self._tokens, self._updated_at = burst, now
+            self._tokens = min(
+                burst, self._tokens + (now - self._updated_at) * rate
+            )
+            self._updated_at = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / rate
+
+    def _record(self, waited: float):
+        with self._lock:
+            self.acquired += 1
+            if waited:
+                self.throttled += 1
+                self.waited_seconds += waited
+        RATE_LIMIT_ACQUIRED.labels(integration=self.name).inc()
+        if waited:
+            RATE_LIMIT_THROTTLED.labels(integration=self.name).inc()
+            RATE_LIMIT_WAIT_SECONDS.labels(integration=self.name).inc(waited)
+
+    def stats(self) -> dict:
+        """
+        Contadores deste processo.
+        """
+        return {
+            'acquired': self.acquired,
+            'throttled': self.throttled,
+            'shed': self.shed,
+            'waited_seconds': round(self.waited_seconds, 3),
+        }
+
+
+def _token_bucket_script() -> redis.commands.core.Script:
+    """
+    Script do token bucket registrado no Redis de `REDIS_URL` (um por processo).
+    """
+    with _lock:
+        script = _scripts.get(settings.REDIS_URL)
+        if script is None:
+            client = redis.Redis.from_url(
+                settings.REDIS_URL, socket_timeout=1, socket_connect_timeout=1
+            )
+            script = _scripts[settings.REDIS_URL] = client.register_script(
+                _TOKEN_BUCKET_SCRIPT
+            )
+        return script
+
+
+def get_rate_limiter(name: str) -> RateLimiter:
+    """
+    Retorna o limitador da integração `name`, criando-o na primeira chamada.
+    """
+    with _lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = _limiters[name] = RateLimiter(name)
+        return limiter
@@ -0,0 +1,207 @@
+"""
+Cache compartilhado de leituras de temperatura atual.
+
+As leituras são indexadas por coordenadas arredondadas, de modo que várias
+configurações de alerta na mesma localidade (ou em localidades muito
+próximas) custem uma única chamada ao Open-Meteo por intervalo de TTL.
+
+O cache `default` usa Redis quando `REDIS_URL` está configurada; se o Redis
+estiver indisponível, as operações caem para o cache em memória `local`.
+
+Com `OPENMETEO_STALE_MAX_AGE` a última leitura de cada coordenada também é
+guardada por esse tempo, para ser servida como desatualizada quando o
+Open-Meteo estiver indisponível.
+"""
+
+import time
+from collections.abc import Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+from loguru import logger
+
+from weather_alert.metrics import TEMPERATURE_CACHE_LOOKUPS, get_registry
+
+Coordinate = tuple[float, float]
+
+COORDINATES_KEY = 'openmeteo:grid:coordinates'
+CELLS_KEY = 'openmeteo:grid:cells'
+
+
+def cache_key(latitude: float, longitude: float) -> str:
+    """
+    Monta a chave de cache de uma coordenada arredondada.
+    """
+    precision = settings.OPENMETEO_CACHE_COORDINATE_PRECISION
+    return (
+        f'openmeteo:temperature:'
+        f'{round(latitude, precision):.{precision}f}:'
+        f'{round(longitude, precision):.{precision}f}'
+    )
+
+
+def last_known_key(latitude: float, longitude: float) -> str:
+    """
+    Monta a chave da última leitura conhecida de uma coordenada arredondada.
+    """
+    return cache_key(latitude, longitude).replace(
+        'openmeteo:temperature:', 'openmeteo:last:', 1
+    )
+
+
+def _call(operation: Callable):
+    """
+    Executa a operação no cache `default`, caindo para o cache `local` se o
+    backend compartilhado falhar.
+    """
+    try:
+        return operation(caches['default'])
+    except Exception as e:
+        logger.warning(
+            f'Cache compartilhado indisponível, usando cache local: {e}'
+        )
+        return operation(caches['local'])
+
+
+def _incr(key: str, delta: int):
+    if not delta:
+        return
+
+    def operation(cache):
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            cache.set(key, delta, timeout=None)
+
+    _call(operation)
+
+
+def get_cached_temperatures(
+    coordinates: Iterable[Coordinate],
+) -> dict[Coordinate, float]:
+    """
+    Busca no cache as leituras das coordenadas informadas.
+
+    Args:
+        coordinates (Iterable[tuple[float, float]]): Pares (latitude, longitude).
+
+    Returns:
+        dict[tuple[float, float], float]: Leituras encontradas, indexadas pela
+        coordenada original. Coordenadas ausentes não aparecem no resultado.
+    """
+    if not settings.OPENMETEO_CACHE_TTL:
+        return {}
+
+    keys = {coordinate: cache_key(*coordinate) for coordinate in coordinates}
+    cached = _call(lambda cache: cache.get_many(set(keys.values())))
+    found = {
+        coordinate: cached[key]
+        for coordinate, key in keys.items()
+        if key in cached
+    }
+
+    # in-process counters, no extra round trips to the shared cache
+    TEMPERATURE_CACHE_LOOKUPS.labels(result='hit').inc(len(found))
+    TEMPERATURE_CACHE_LOOKUPS.labels(result='miss').inc(len(keys) - len(found))
+    return found
+
+
+def set_cached_temperatures(temperatures: dict[Coordinate, float]):
+    """
+    Armazena leituras no cache pelo TTL de `OPENMETEO_CACHE_TTL` segundos e,
+    com `OPENMETEO_STALE_MAX_AGE`, guarda também a última leitura conhecida.
+
+    Args:
+        temperatures (dict[tuple[float, float], float]): Leituras por coordenada.
+    """
+    if not temperatures:
+        return
+
+    if settings.OPENMETEO_CACHE_TTL:
+        values = {
+            cache_key(*coordinate): temperature
+            for coordinate, temperature in temperatures.items()
+        }
+        _call(
+            lambda cache: cache.set_many(
+                values, timeout=settings.OPENMETEO_CACHE_TTL
+            )
+        )
+
+    if settings.OPENMETEO_STALE_MAX_AGE:
+        now = time.time()
+        last_known = {
+            last_known_key(*coordinate): (temperature, now)
+            for coordinate, temperature in temperatures.items()
+        }
+        _call(
+            lambda cache: cache.set_many(
+                last_known, timeout=settings.OPENMETEO_STALE_MAX_AGE
+            )
+        )
+
+
+def get_last_known_temperature(
+    coordinate: Coordinate,
+) -> tuple[float, float] | None:
+    """
+    Busca a última leitura conhecida de uma coordenada.
+
+    Returns:
+        tuple[float, float] | None: Temperatura e momento da leitura (epoch),
+        ou `None` se não houver leitura dentro de `OPENMETEO_STALE_MAX_AGE`.
+    """
+    if not settings.OPENMETEO_STALE_MAX_AGE:
+        return None
+    return _call(lambda cache: cache.get(last_known_key(*coordinate)))
+
+
+def get_cache_stats() -> dict[str, int]:
+    """
+    Retorna os contadores de acertos e falhas do cache de temperaturas, lidos
+    da métrica `weather_alert_temperature_cache_lookups_total`.
+
+    Os contadores são do processo atual ou, com `PROMETHEUS_MULTIPROC_DIR`,
+    a soma dos processos que gravam nesse diretório.
+
+    Returns:
+        dict[str, int]: Quantidade de `hits` e `misses` acumulados.
+    """
+    registry = get_registry()
+    return {
+        key: int(
+            registry.get_sample_value(
+                'weather_alert_temperature_cache_lookups_total',
+                {'result': result},
+            )
+            or 0
+        )
+        for key, result in (('hits', 'hit'), ('misses', 'miss'))
+    }
+
+
+def record_coalescing(coordinates: int, cells: int):
+    """
+    Acumula quantas coordenadas foram consultadas e em quantas células da
+    grade elas foram agrupadas.
+    """
+    _incr(COORDINATES_KEY, coordinates)
+    _incr(CELLS_KEY, cells)
+
+
+def get_coalescing_stats() -> dict[str, int]:
+    """
+    Retorna os contadores do agrupamento de coordenadas por célula da grade.
+
+    Returns:
+        dict[str, int]: Quantidade de `coordinates` consultadas, de `cells`
+        distintas e de consultas ao Open-Meteo economizadas (`saved`).
+    """
+    values = _call(lambda cache: cache.get_many([COORDINATES_KEY, CELLS_KEY]))
+    coordinates = values.get(COORDINATES_KEY, 0)
+    cells = values.get(CELLS_KEY, 0)
+    return {
+        'coordinates': coordinates,
+        'cells': cells,
+        'saved': coordinates - cells,
+    }
@@ -0,0 +1,211 @@
+"""
+Métricas Prometheus da aplicação.
+
+As métricas são expostas em `/metrics` pelo processo web, quando
+`METRICS_ENABLED` está ativo, e, nos workers do Celery, pelo servidor HTTP
+iniciado em `METRICS_WORKER_PORT`.
+
+Em implantações com vários processos (pool prefork do Celery, uvicorn com
+`--workers`) defina a variável de ambiente `PROMETHEUS_MULTIPROC_DIR` com um
+diretório vazio antes de iniciar os processos: cada processo grava suas
+métricas nesse diretório e a coleta soma os valores de todos eles. O
+`entrypoint.sh` esvazia o diretório antes de iniciar o servidor web ou o
+comando recebido (como o worker do Celery).
+"""
+
+import hmac
+import os
+import time
+from contextlib import contextmanager
+from inspect import iscoroutinefunction
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# metrics write to the directory as soon as they are created; it is only
+# emptied by entrypoint.sh, since every process imports this module
+if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+OPENMETEO_REQUEST_SECONDS = Histogram(
+    'weather_alert_openmeteo_request_seconds',
+    'Latência das requisições ao Open-Meteo.',
+    ['mode', 'outcome'],
+)
+N8N_WEBHOOK_SECONDS = Histogram(
+    'weather_alert_n8n_webhook_seconds',
+    'Latência dos envios ao webhook do N8N.',
+    ['outcome'],
+)
+TASK_SECONDS = Histogram(
+    'weather_alert_task_seconds',
+    'Duração das tasks do Celery.',
+    ['task', 'state'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+API_REQUEST_SECONDS = Histogram(
+    'weather_alert_http_request_seconds',
+    'Latência das requisições HTTP por rota.',
+    ['method', 'route', 'status'],
+)
+ALERTS_CREATED = Counter(
+    'weather_alert_alerts_created_total', 'Alertas criados.'
+)
+NOTIFICATIONS = Counter(
+    'weather_alert_notifications_total',
+    'Envios do outbox ao N8N por resultado (sent, retried, failed).',
+    ['result'],
+)
+TEMPERATURE_LOG_FLUSH_SIZE = Histogram(
+    'weather_alert_temperature_log_flush_size',
+    'Leituras gravadas por descarga do buffer de logs de temperatura.',
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+TEMPERATURE_LOGS_FLUSHED = Counter(
+    'weather_alert_temperature_logs_flushed_total',
+    'Leituras gravadas pelo buffer de logs de temperatura.',
+)
+TEMPERATURE_CACHE_LOOKUPS = Counter(
+    'weather_alert_temperature_cache_lookups_total',
+    'Consultas ao cache de temperaturas por resultado (hit, miss).',
+    ['result'],
+)
+RATE_LIMIT_ACQUIRED = Counter(
+    'weather_alert_rate_limit_acquired_total',
+    'Reservas concedidas pelo limitador de requisições.',
+    ['integration'],
+)
+RATE_LIMIT_THROTTLED = Counter(
+    'weather_alert_rate_limit_throttled_total',
+    'Reservas do limitador de requisições que precisaram esperar.',
+    ['integration'],
+)
+RATE_LIMIT_SHED = Counter(
+    'weather_alert_rate_limit_shed_total',
+    'Chamadas descartadas por exceder a espera máxima do limitador.',
+    ['integration'],
+)
+RATE_LIMIT_WAIT_SECONDS = Counter(
+    'weather_alert_rate_limit_wait_seconds_total',
+    'Tempo total de espera pelo limitador de requisições.',
+    ['integration'],
+)
+CIRCUIT_FAILURES = Counter(
+    'weather_alert_circuit_failures_total',
+    'Falhas registradas pelo circuit breaker.',
+    ['integration'],
+)
+CIRCUIT_OPENED = Counter(
+    'weather_alert_circuit_opened_total',
+    'Vezes que o circuito abriu.',
+    ['integration'],
+)
+CIRCUIT_REJECTED = Counter(
+    'weather_alert_circuit_rejected_total',
+    'Chamadas recusadas com o circuito aberto.',
+    ['integration'],
+)
+CIRCUIT_STATE = Gauge(
+    'weather_alert_circuit_state',
+    'Estado do circuito (0 fechado, 1 meio-aberto, 2 aberto); com vários '
+    'processos, o maior entre os processos vivos.',
+    ['integration'],
+    multiprocess_mode='livemax',
+)
+
+
+@contextmanager
+def observe_latency(histogram: Histogram, **labels):
+    """
+    Mede o bloco no histograma, com o rótulo `outcome` igual a `success` ou
+    `error` conforme o bloco levante ou não uma exceção.
+    """
+    start = time.perf_counter()
+    outcome = 'success'
+    try:
+        yield
+    except BaseException:
+        outcome = 'error'
+        raise
+    finally:
+        histogram.labels(outcome=outcome, **labels).observe(
+            time.perf_counter() - start
+        )
+
+
+def get_registry() -> CollectorRegistry:
+    """
+    Registro a ser coletado: o agregado de todos os processos quando
+    `PROMETHEUS_MULTIPROC_DIR` está definida, ou o do processo atual.
+    """
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    """
+    Exporta as métricas no formato de texto do Prometheus.
+
+    Responde 404 sem `METRICS_ENABLED` e, com `METRICS_TOKEN`, exige o
+    cabeçalho `Authorization: Bearer <token>`.
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404
+
+    if settings.METRICS_TOKEN and not hmac.compare_digest(
+        request.headers.get('Authorization', ''),
+        f'Bearer {settings.METRICS_TOKEN}',
+    ):
+        return HttpResponse(status=401)
+
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
+
+
+def _observe_request(request, response, start: float):
+    match = request.resolver_match
+    API_REQUEST_SECONDS.labels(
+        method=request.method,
+        # the route pattern keeps the label cardinality bounded
+        route=match.route if match else '<unmatched>',
+        status=response.status_code,
+    ).observe(time.perf_counter() - start)
+
+
+@sync_and_async_middleware
+def request_metrics_middleware(get_response):
+    """
+    Mede a latência de cada requisição, rotulada pelo padrão da rota.
+    """
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            start = time.perf_counter()
+            response = await get_response(request)
+            _observe_request(request, response, start)
+            return response
+
+    else:
+
+        def middleware(request):
+            start = time.perf_counter()
+            response = get_response(request)
+            _observe_request(request, response, start)
+            return response
+
+    return middleware
@@ -61,6 +61,15 @@ MIDDLEWARE = [
 if PROD:
     MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
 
+# serve /metrics and time every request (off by default: /metrics is
+# served on the public port)
+METRICS_ENABLED = config('METRICS_ENABLED', cast=bool, default=False)
+# when set, /metrics requires "Authorization: Bearer <token>"
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'weather_alert.metrics.request_metrics_middleware')
+
 ROOT_URLCONF = 'weather_alert.urls'
 
 TEMPLATES = [
@@ -155,6 +164,9 @@ CELERY_BROKER_URL = config(
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# port of the Prometheus metrics server started by each Celery worker
+# (0 disables it); the web process serves /metrics itself
+METRICS_WORKER_PORT = config('METRICS_WORKER_PORT', cast=int, default=0)
 
 # N8N
 FAKE_WEBHOOK = config('FAKE_WEBHOOK', cast=bool, default=False)
@@ -165,4 +177,227 @@ else:
     N8N_WEBHOOK_URL = 'https://example.com/webhook'
     N8N_WEBHOOK_HEADER_KEY = 'test-header-key'
 
+# N8N notification outbox
+N8N_OUTBOX_BATCH_SIZE = config('N8N_OUTBOX_BATCH_SIZE', cast=int, default=100)
+N8N_OUTBOX_MAX_BATCHES = config('N8N_OUTBOX_MAX_BATCHES', cast=int, default=10)
+N8N_OUTBOX_CONCURRENCY = config('N8N_OUTBOX_CONCURRENCY', cast=int, default=10)
+N8N_OUTBOX_MAX_ATTEMPTS = config('N8N_OUTBOX_MAX_ATTEMPTS', cast=int, default=8)
+N8N_OUTBOX_RETRY_BASE_SECONDS = config(
+    'N8N_OUTBOX_RETRY_BASE_SECONDS', cast=int, default=30
+)
+N8N_OUTBOX_RETRY_MAX_SECONDS = config(
+    'N8N_OUTBOX_RETRY_MAX_SECONDS', cast=int, default=3600
+)
+# how long a claimed entry stays hidden from other dispatchers
+N8N_OUTBOX_LEASE_SECONDS = config(
+    'N8N_OUTBOX_LEASE_SECONDS', cast=int, default=120
+)
+N8N_OUTBOX_DISPATCH_INTERVAL_SECONDS = config(
+    'N8N_OUTBOX_DISPATCH_INTERVAL_SECONDS', cast=int, default=30
+)
+# also dispatch right after the alert transaction commits
+N8N_OUTBOX_DISPATCH_ON_COMMIT = config(
+    'N8N_OUTBOX_DISPATCH_ON_COMMIT', cast=bool, default=True
+)
+
 API_BASE_URL = config('API_BASE_URL', 'http://127.0.0.1:8000/api')
+
+# cursor pagination of list endpoints
+API_PAGE_SIZE = config('API_PAGE_SIZE', cast=int, default=100)
+API_MAX_PAGE_SIZE = config('API_MAX_PAGE_SIZE', cast=int, default=1000)
+# rows fetched per round trip by the streaming exports
+API_EXPORT_CHUNK_SIZE = config('API_EXPORT_CHUNK_SIZE', cast=int, default=2000)
+# fraction of API requests profiled with Server-Timing headers (0 disables
+# the middleware); profiled requests slower than API_PROFILING_SLOW_MS are logged
+API_PROFILING_SAMPLE_RATE = config(
+    'API_PROFILING_SAMPLE_RATE', cast=float, default=0.0
+)
+API_PROFILING_SLOW_MS = config(
+    'API_PROFILING_SLOW_MS', cast=float, default=500.0
+)
+# largest array accepted by the bulk create endpoints
+API_BULK_MAX_ITEMS = config('API_BULK_MAX_ITEMS', cast=int, default=1000)
+# seconds the serialized body of a list endpoint is cached by its ETag
+# (0 disables it; the ETag / If-None-Match check follows API_ETAGS_ENABLED)
+API_ETAG_BODY_CACHE_TTL = config(
+    'API_ETAG_BODY_CACHE_TTL', cast=int, default=0
+)
+# seconds between keep-alive comments on the alert event stream
+ALERT_STREAM_HEARTBEAT_SECONDS = config(
+    'ALERT_STREAM_HEARTBEAT_SECONDS', cast=float, default=15.0
+)
+if API_PROFILING_SAMPLE_RATE:
+    MIDDLEWARE.insert(1, 'weather_alert.api.profiling.profiling_middleware')
+
+# Open-Meteo
+OPENMETEO_URL = config(
+    'OPENMETEO_URL', default='https://api.open-meteo.com/v1/forecast'
+)
+# limits for multi-location requests (comma-separated coordinates)
+OPENMETEO_MAX_COORDINATES_PER_REQUEST = config(
+    'OPENMETEO_MAX_COORDINATES_PER_REQUEST', cast=int, default=100
+)
+OPENMETEO_MAX_QUERY_LENGTH = config(
+    'OPENMETEO_MAX_QUERY_LENGTH', cast=int, default=4000
+)
+# simultaneous requests per check_temperature_batch task
+OPENMETEO_CONCURRENCY = config('OPENMETEO_CONCURRENCY', cast=int, default=50)
+# grid cell size in degrees; coordinates in the same cell share one upstream
+# lookup (0 disables snapping)
+OPENMETEO_GRID_RESOLUTION = config(
+    'OPENMETEO_GRID_RESOLUTION', cast=float, default=0.0
+)
+# token bucket shared by all workers through Redis (per process without it);
+# each coordinate of a request costs one token. 0 disables the limit
+OPENMETEO_RATE_LIMIT_PER_SECOND = config(
+    'OPENMETEO_RATE_LIMIT_PER_SECOND', cast=float, default=0.0
+)
+OPENMETEO_RATE_LIMIT_BURST = config(
+    'OPENMETEO_RATE_LIMIT_BURST', cast=int, default=100
+)
+# longest wait for a token before the call is shed with RateLimited
+OPENMETEO_RATE_LIMIT_MAX_WAIT = config(
+    'OPENMETEO_RATE_LIMIT_MAX_WAIT', cast=float, default=30.0
+)
+# consecutive failures (transport errors, 429, 5xx) that open the circuit;
+# while open, calls fail fast with CircuitOpen (0 disables the breaker)
+OPENMETEO_CIRCUIT_FAILURE_THRESHOLD = config(
+    'OPENMETEO_CIRCUIT_FAILURE_THRESHOLD', cast=int, default=5
+)
+# seconds the circuit stays open before a single half-open probe
+OPENMETEO_CIRCUIT_RESET_SECONDS = config(
+    'OPENMETEO_CIRCUIT_RESET_SECONDS', cast=float, default=30.0
+)
+
+# Shared HTTP clients (one keep-alive pool per integration and process)
+HTTP_CLIENT_TIMEOUT = config('HTTP_CLIENT_TIMEOUT', cast=float, default=10.0)
+HTTP_CLIENT_CONNECT_TIMEOUT = config(
+    'HTTP_CLIENT_CONNECT_TIMEOUT', cast=float, default=5.0
+)
+HTTP_CLIENT_MAX_CONNECTIONS = config(
+    'HTTP_CLIENT_MAX_CONNECTIONS', cast=int, default=100
+)
+HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS = config(
+    'HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS', cast=int, default=20
+)
+HTTP_CLIENT_KEEPALIVE_EXPIRY = config(
+    'HTTP_CLIENT_KEEPALIVE_EXPIRY', cast=float, default=30.0
+)
+
+# Cache (Redis when REDIS_URL is set, in-process otherwise)
+REDIS_URL = config('REDIS_URL', default='')
+LOCAL_CACHE = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'weather-alert-local',
+}
+CACHES = {
+    'default': (
+        {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+        if REDIS_URL
+        else LOCAL_CACHE
+    ),
+    # fallback used when the shared cache is unreachable
+    'local': LOCAL_CACHE,
+}
+# ETags of the list endpoints; collection versions must be shared by every
+# web and Celery process, so they are only enabled with a Redis cache
+API_ETAGS_ENABLED = config(
+    'API_ETAGS_ENABLED', cast=bool, default=bool(REDIS_URL)
+)
+
+# Open-Meteo refreshes current conditions every 15 minutes
+OPENMETEO_CACHE_TTL = config('OPENMETEO_CACHE_TTL', cast=int, default=900)
+# 2 decimal places ~ 1.1 km, finer than the weather model grid
+OPENMETEO_CACHE_COORDINATE_PRECISION = config(
+    'OPENMETEO_CACHE_COORDINATE_PRECISION', cast=int, default=2
+)
+# how long the last known reading of a coordinate may be served, flagged as
+# stale, when Open-Meteo is unavailable (0 disables the fallback)
+OPENMETEO_STALE_MAX_AGE = config(
+    'OPENMETEO_STALE_MAX_AGE', cast=int, default=0
+)
+
+# Alert scheduling: 'periodic_task' keeps one django_celery_beat PeriodicTask
+# per location, at the shortest interval of its AlertConfigs; 'sweep' runs a
+# single periodic task that dispatches the configs whose next_check_at is due
+ALERT_SCHEDULER_MODE = config('ALERT_SCHEDULER_MODE', default='periodic_task')
+ALERT_SWEEP_INTERVAL_SECONDS = config(
+    'ALERT_SWEEP_INTERVAL_SECONDS', cast=int, default=60
+)
+# configs per dispatched Celery message
+ALERT_SWEEP_BATCH_SIZE = config('ALERT_SWEEP_BATCH_SIZE', cast=int, default=100)
+# upper bound of configs dispatched by a single sweep
+ALERT_SWEEP_MAX_CONFIGS = config(
+    'ALERT_SWEEP_MAX_CONFIGS', cast=int, default=10000
+)
+
+# a firing config returns to ok only once the temperature drops to
+# threshold - ALERT_HYSTERESIS; while firing, a new alert is created every
+# ALERT_RENOTIFY_MINUTES (0 notifies only on the ok -> firing transition)
+ALERT_HYSTERESIS = config('ALERT_HYSTERESIS', cast=float, default=1.0)
+ALERT_RENOTIFY_MINUTES = config('ALERT_RENOTIFY_MINUTES', cast=int, default=0)
+
+CELERY_BEAT_SCHEDULE = {
+    'dispatch-notification-outbox': {
+        'task': 'weather_alert.apps.alerts.tasks.dispatch_notifications',
+        'schedule': N8N_OUTBOX_DISPATCH_INTERVAL_SECONDS,
+    },
+}
+if ALERT_SCHEDULER_MODE == 'sweep':
+    CELERY_BEAT_SCHEDULE['sweep-due-alert-configs'] = {
+        'task': 'weather_alert.apps.alerts.tasks.sweep_due_alert_configs',
+        'schedule': ALERT_SWEEP_INTERVAL_SECONDS,
+    }
+
+# TemperatureLog write buffer (per worker process). The default size of 1
+# writes every reading immediately; raise it to batch inserts. Buffered rows
+# are written at most MAX_AGE_SECONDS later, by a timer in each process
+TEMPERATURE_LOG_BUFFER_SIZE = config(
+    'TEMPERATURE_LOG_BUFFER_SIZE', cast=int, default=1
+)
+TEMPERATURE_LOG_BUFFER_MAX_AGE_SECONDS = config(
+    'TEMPERATURE_LOG_BUFFER_MAX_AGE_SECONDS', cast=float, default=5.0
+)
+# 'bulk_create' or 'copy' (PostgreSQL only, falls back to bulk_create)
+TEMPERATURE_LOG_FLUSH_METHOD = config(
+    'TEMPERATURE_LOG_FLUSH_METHOD', default='bulk_create'
+)
+# answer aggregate queries from the hourly/daily rollups when possible
+TEMPERATURE_AGGREGATE_FROM_ROLLUPS = config(
+    'TEMPERATURE_AGGREGATE_FROM_ROLLUPS', cast=bool, default=True
+)
+
+# retention in days of raw logs and of the hourly/daily rollups (0, the
+# default, keeps forever); expired rows are deleted in id-ordered chunks by a
+# periodic task, registered only when some retention is set
+TEMPERATURE_LOG_RETENTION_DAYS = config(
+    'TEMPERATURE_LOG_RETENTION_DAYS', cast=int, default=0
+)
+TEMPERATURE_HOURLY_ROLLUP_RETENTION_DAYS = config(
+    'TEMPERATURE_HOURLY_ROLLUP_RETENTION_DAYS', cast=int, default=0
+)
+TEMPERATURE_DAILY_ROLLUP_RETENTION_DAYS = config(
+    'TEMPERATURE_DAILY_ROLLUP_RETENTION_DAYS', cast=int, default=0
+)
+TEMPERATURE_RETENTION_CHUNK_SIZE = config(
+    'TEMPERATURE_RETENTION_CHUNK_SIZE', cast=int, default=5000
+)
+# upper bound of chunks deleted per table by a single run
+TEMPERATURE_RETENTION_MAX_CHUNKS = config(
+    'TEMPERATURE_RETENTION_MAX_CHUNKS', cast=int, default=200
+)
+TEMPERATURE_RETENTION_INTERVAL_SECONDS = config(
+    'TEMPERATURE_RETENTION_INTERVAL_SECONDS', cast=int, default=3600
+)
+if (
+    TEMPERATURE_LOG_RETENTION_DAYS > 0
+    or TEMPERATURE_HOURLY_ROLLUP_RETENTION_DAYS > 0
+    or TEMPERATURE_DAILY_ROLLUP_RETENTION_DAYS > 0
+):
+    CELERY_BEAT_SCHEDULE['purge-expired-temperature-data'] = {
+        'task': 'weather_alert.apps.temperature.tasks.purge_expired_temperature_data',
+        'schedule': TEMPERATURE_RETENTION_INTERVAL_SECONDS,
+    }
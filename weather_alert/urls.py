@@ -19,9 +19,11 @@ from django.contrib import admin
 from django.urls import path, include
 
 from .api.app import api
+from .metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', api.urls),
+    path('metrics', metrics_view, name='metrics'),
     path('', include('weather_alert.apps.frontend.urls'))
 ]